@@ -1,7 +1,8 @@
 """Anthropic Claude API integration for plan generation."""
 
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import httpx
 from anthropic import AsyncAnthropic
 from app.ai.prompts import PLAN_GENERATION_PROMPT
 
@@ -9,9 +10,9 @@ from app.ai.prompts import PLAN_GENERATION_PROMPT
 class AnthropicClient:
     """Anthropic Claude API client for generating cleanup plans."""
 
-    def __init__(self, api_key: str):
-        """Initialize Anthropic client."""
-        self.client = AsyncAnthropic(api_key=api_key)
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize Anthropic client, optionally on a shared HTTP connection pool."""
+        self.client = AsyncAnthropic(api_key=api_key, http_client=http_client)
         self.model = "claude-3-sonnet-20240229"
         self.max_tokens = 4000
 
@@ -56,3 +57,7 @@ class AnthropicClient:
         except Exception as e:
             print(f"Anthropic API error: {e}")
             return None
+
+    async def close(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
@@ -2,6 +2,7 @@
 
 import json
 from typing import List, Dict, Any, Optional
+import httpx
 from openai import AsyncOpenAI
 from app.ai.prompts import PLAN_GENERATION_PROMPT
 
@@ -9,9 +10,9 @@ from app.ai.prompts import PLAN_GENERATION_PROMPT
 class OpenAIClient:
     """OpenAI API client for generating cleanup plans."""
 
-    def __init__(self, api_key: str):
-        """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize OpenAI client, optionally on a shared HTTP connection pool."""
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
         self.model = "gpt-4-turbo-preview"
         self.temperature = 0.7
         self.max_tokens = 2000
@@ -62,3 +63,7 @@ class OpenAIClient:
         except Exception as e:
             print(f"OpenAI API error: {e}")
             return None
+
+    async def close(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
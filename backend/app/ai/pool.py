@@ -0,0 +1,114 @@
+"""Long-lived AI client pool shared across requests."""
+
+from typing import Optional, Tuple, Callable, Any, List, Dict, AsyncIterator
+from contextlib import asynccontextmanager
+import asyncio
+import httpx
+from app.ai.openai_client import OpenAIClient
+from app.ai.anthropic_client import AnthropicClient
+from app.config import Settings
+
+
+class AIClientPool:
+    """Holds one AI client per provider for the lifetime of the application.
+
+    Each client owns a keep-alive HTTP connection pool, so repeated plan
+    generations reuse warm TLS connections. Callers lease a client for
+    the duration of a request. A client is rebuilt only when the API key
+    for its provider changes; the old one is closed as soon as its last
+    lease is released.
+    """
+
+    def __init__(self, settings: Settings):
+        """Initialize an empty pool bound to settings."""
+        self.settings = settings
+        self._openai: Optional[Tuple[str, OpenAIClient]] = None
+        self._anthropic: Optional[Tuple[str, AnthropicClient]] = None
+        # Clients replaced after a key change, kept open for in-flight requests
+        self._retired: List[Any] = []
+        # Open leases per client id
+        self._leases: Dict[int, int] = {}
+        self._lock = asyncio.Lock()
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create an HTTP client with the configured pool limits."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.settings.ai_max_connections,
+                max_keepalive_connections=self.settings.ai_max_keepalive_connections,
+                keepalive_expiry=self.settings.ai_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.settings.ai_request_timeout),
+            follow_redirects=True
+        )
+
+    async def _get(
+        self,
+        current: Optional[Tuple[str, Any]],
+        api_key: str,
+        factory: Callable[[str, httpx.AsyncClient], Any]
+    ) -> Tuple[Optional[Tuple[str, Any]], Any]:
+        """Return a cached client for api_key, rebuilding it if the key changed."""
+        if current and current[0] == api_key:
+            return current, current[1]
+
+        if current:
+            if self._leases.get(id(current[1])):
+                self._retired.append(current[1])
+            else:
+                await current[1].close()
+
+        if not api_key:
+            return None, None
+
+        client = factory(api_key, self._build_http_client())
+        return (api_key, client), client
+
+    @asynccontextmanager
+    async def _lease(self, provider: str, factory: Callable[[str, httpx.AsyncClient], Any]) -> AsyncIterator[Any]:
+        """Lend the provider's client until the block exits, closing it then if retired."""
+        async with self._lock:
+            entry, client = await self._get(
+                getattr(self, f"_{provider}"), getattr(self.settings, f"{provider}_api_key"), factory
+            )
+            setattr(self, f"_{provider}", entry)
+            if client:
+                self._leases[id(client)] = self._leases.get(id(client), 0) + 1
+        try:
+            yield client
+        finally:
+            if client:
+                await self._release(client)
+
+    async def _release(self, client: Any):
+        """Drop one lease; close a retired client once nothing uses it."""
+        async with self._lock:
+            remaining = self._leases.get(id(client), 0) - 1
+            if remaining > 0:
+                self._leases[id(client)] = remaining
+                return
+            self._leases.pop(id(client), None)
+            if client in self._retired:
+                self._retired.remove(client)
+                await client.close()
+
+    def openai_client(self):
+        """Lease the shared OpenAI client (None if no key is configured) for an ``async with`` block."""
+        return self._lease("openai", OpenAIClient)
+
+    def anthropic_client(self):
+        """Lease the shared Anthropic client (None if no key is configured) for an ``async with`` block."""
+        return self._lease("anthropic", AnthropicClient)
+
+    async def aclose(self):
+        """Close all pooled clients and their connections."""
+        async with self._lock:
+            for entry in (self._openai, self._anthropic):
+                if entry:
+                    await entry[1].close()
+            for client in self._retired:
+                await client.close()
+            self._openai = None
+            self._anthropic = None
+            self._retired = []
+            self._leases = {}
@@ -0,0 +1,76 @@
+"""Archive browsing and restore API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Query
+from pathlib import Path
+from typing import List, Dict, Any
+import asyncio
+from app.config import settings
+from app.models import ArchiveRestoreRequest
+from app.storage.archiver import ArchiveEngine, INDEX_SUFFIX, index_path_for
+
+router = APIRouter()
+
+
+def _load_index(archive: str):
+    """Load an archive's index or raise 404."""
+    archive_path = Path(archive)
+    if not archive_path.exists() or not index_path_for(archive_path).exists():
+        raise HTTPException(status_code=404, detail=f"Archive '{archive}' or its index not found")
+    return archive_path, ArchiveEngine.read_index(index_path_for(archive_path))
+
+
+@router.get("/archives")
+async def list_archives() -> List[Dict[str, Any]]:
+    """
+    List archives in the backup location.
+    """
+    root = Path(settings.backup_location)
+    if not root.exists():
+        return []
+
+    archives = []
+    for index_path in sorted(root.glob(f"*{INDEX_SUFFIX}")):
+        archive_path = index_path.with_name(index_path.name[:-len(INDEX_SUFFIX)])
+        if not archive_path.exists():
+            continue
+        header, _, files = await asyncio.to_thread(ArchiveEngine.read_index, index_path)
+        archives.append({
+            "archive": str(archive_path),
+            "source": header.get("source"),
+            "files": len(files),
+            "bytes": sum(f["size"] for f in files.values()),
+            "compressed_bytes": archive_path.stat().st_size
+        })
+    return archives
+
+
+@router.get("/archives/files")
+async def list_archive_files(
+    archive: str = Query(..., description="Archive path")
+) -> List[Dict[str, Any]]:
+    """
+    List the files in an archive from its index, without decompressing it.
+    """
+    _, (_, _, files) = await asyncio.to_thread(_load_index, archive)
+    return [
+        {"file": name, "size": entry["size"], "mtime": entry["mtime"]}
+        for name, entry in files.items()
+    ]
+
+
+@router.post("/archives/restore")
+async def restore_archive_file(request: ArchiveRestoreRequest) -> Dict[str, Any]:
+    """
+    Restore one file from an archive.
+
+    Only the compressed blocks holding the file are decompressed.
+    """
+    archive_path, _ = await asyncio.to_thread(_load_index, request.archive)
+    try:
+        restored = await asyncio.to_thread(
+            ArchiveEngine.restore_file, archive_path, request.file, Path(request.destination)
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {"file": request.file, "restored_to": str(restored)}
@@ -1,11 +1,18 @@
 """Execution API endpoints."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query
 from datetime import datetime
-import uuid
-from app.models import ExecuteRequest, ExecuteResponse
-from app.services.executor import ExecutionEngine
-from app.api.plans import _cached_plans
+from typing import List, Dict, Any, Optional
+from app.models import ExecuteRequest, ExecuteResponse, IOLimitsRequest
+from app.services.executor import ExecutionEngine, is_execution_active, get_active_execution
+from app.services.checkpoint import CheckpointStore
+from app.services.rollback import RollbackManager, is_rollback_active
+from app.services.rollback_journal import recover_unfinished
+from app.services.job_queue import JobQueue
+from app.services.progress_events import ProgressEventStore
+from app.dependencies import get_job_queue, get_progress_events
+import asyncio
+import app.api.plans as plans_api
 
 router = APIRouter()
 
@@ -13,25 +20,29 @@ router = APIRouter()
 @router.post("/execute", response_model=ExecuteResponse)
 async def execute_plan(
     request: ExecuteRequest,
-    background_tasks: BackgroundTasks
+    queue: Optional[JobQueue] = Depends(get_job_queue)
 ):
     """
-    Start execution of a cleanup plan.
+    Queue execution of a cleanup plan.
 
-    The execution runs in the background. Use the WebSocket endpoint
-    to monitor progress in real-time.
+    The execution starts once the concurrency limit allows and no running
+    execution uses the same drives. Use GET /jobs/{execution_id} for its
+    queue state and the WebSocket endpoint to monitor progress in real-time.
 
     Args:
-        request: Execution request with plan_id and dry_run flag
+        request: Execution request with plan_id, dry_run flag and priority
     """
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+
     # Find the plan
-    if not _cached_plans:
+    if not plans_api._cached_plans:
         raise HTTPException(
             status_code=404,
             detail="No plans available. Call /plans first to generate plans."
         )
 
-    plan = next((p for p in _cached_plans if p["id"] == request.plan_id), None)
+    plan = next((p for p in plans_api._cached_plans if p["id"] == request.plan_id), None)
 
     if not plan:
         raise HTTPException(
@@ -39,15 +50,268 @@ async def execute_plan(
             detail=f"Plan '{request.plan_id}' not found"
         )
 
-    # Create execution
-    execution_id = str(uuid.uuid4())
-    executor = ExecutionEngine(execution_id, plan, dry_run=request.dry_run)
+    job = await queue.enqueue(plan, dry_run=request.dry_run, priority=request.priority)
+
+    return ExecuteResponse(
+        execution_id=job["id"],
+        status="queued",
+        started_at=datetime.now()
+    )
+
+
+@router.get("/executions/interrupted")
+async def list_interrupted_executions() -> List[Dict[str, Any]]:
+    """
+    List executions that stopped mid-run (e.g. backend restart).
+
+    Each can be continued with POST /execute/{execution_id}/resume.
+    """
+    return [
+        execution for execution in CheckpointStore.list_interrupted()
+        if not is_execution_active(execution["execution_id"])
+    ]
+
+
+@router.get("/executions/unfinished")
+async def list_unfinished_executions() -> List[Dict[str, Any]]:
+    """
+    List executions whose rollback journal has no end, i.e. were stopped by a crash.
 
-    # Run in background
-    background_tasks.add_task(executor.execute)
+    Each lists the operations that finished and those that were started
+    but not recorded as finished, which may need checking by hand.
+    """
+    return [
+        execution for execution in await asyncio.to_thread(recover_unfinished)
+        if not is_execution_active(execution["execution_id"])
+    ]
+
+
+def _require_events(store: Optional[ProgressEventStore]) -> ProgressEventStore:
+    """Return the progress event store or raise 503."""
+    if store is None:
+        raise HTTPException(status_code=503, detail="Progress history is not available")
+    return store
+
+
+@router.get("/executions/history")
+async def list_execution_history(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    store: Optional[ProgressEventStore] = Depends(get_progress_events)
+) -> List[Dict[str, Any]]:
+    """
+    List executions with recorded progress, most recent first.
+    """
+    store = _require_events(store)
+    return await asyncio.to_thread(store.list_executions, limit, offset)
+
+
+@router.get("/executions/{execution_id}/progress")
+async def get_execution_history(
+    execution_id: str,
+    store: Optional[ProgressEventStore] = Depends(get_progress_events)
+) -> Dict[str, Any]:
+    """
+    Last recorded progress of an execution, rebuilt from its events.
+
+    Works for finished executions and after a backend restart.
+    """
+    store = _require_events(store)
+    progress = await asyncio.to_thread(store.replay, execution_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"No progress recorded for '{execution_id}'")
+    return progress
+
+
+@router.get("/executions/{execution_id}/events")
+async def get_execution_events(
+    execution_id: str,
+    after: int = Query(0, ge=0, description="Return events after this event ID"),
+    limit: int = Query(500, ge=1, le=5000),
+    store: Optional[ProgressEventStore] = Depends(get_progress_events)
+) -> List[Dict[str, Any]]:
+    """
+    Progress events of an execution in order, for replay.
+    """
+    store = _require_events(store)
+    return await asyncio.to_thread(store.get_events, execution_id, after, limit)
+
+
+@router.get("/executions/{execution_id}/logs")
+async def get_execution_logs(
+    execution_id: str,
+    after: int = Query(0, ge=0, description="Value of 'next' from the previous page"),
+    limit: int = Query(200, ge=1, le=5000),
+    store: Optional[ProgressEventStore] = Depends(get_progress_events)
+) -> Dict[str, Any]:
+    """
+    One page of an execution's full log, oldest first.
+    """
+    store = _require_events(store)
+    return await asyncio.to_thread(store.get_logs, execution_id, after, limit)
+
+
+@router.post("/execute/{execution_id}/resume", response_model=ExecuteResponse)
+async def resume_execution(
+    execution_id: str,
+    queue: Optional[JobQueue] = Depends(get_job_queue)
+):
+    """
+    Resume a paused execution, or restart a stopped one from its checkpoint.
+
+    A paused execution continues where its workers were held. An
+    interrupted, failed or cancelled execution restarts from its last
+    checkpoint: completed actions are skipped and moves continue with the
+    files not yet copied.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+    """
+    engine = get_active_execution(execution_id)
+    if engine:
+        if not engine.io.paused:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Execution '{execution_id}' is already running"
+            )
+        await engine.unpause()
+        return ExecuteResponse(
+            execution_id=execution_id,
+            status="resumed",
+            started_at=datetime.now()
+        )
+
+    try:
+        state = CheckpointStore(execution_id).load_state()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No checkpoint found for execution '{execution_id}'"
+        )
+
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    try:
+        await queue.enqueue(state["plan"], execution_id=execution_id, resume=True)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
     return ExecuteResponse(
         execution_id=execution_id,
-        status="started",
+        status="queued",
         started_at=datetime.now()
     )
+
+
+def _get_running_engine(execution_id: str) -> ExecutionEngine:
+    """Get a running execution or raise 404."""
+    engine = get_active_execution(execution_id)
+    if not engine:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Execution '{execution_id}' is not running"
+        )
+    return engine
+
+
+@router.post("/execute/{execution_id}/pause")
+async def pause_execution(execution_id: str) -> Dict[str, Any]:
+    """
+    Pause a running execution.
+
+    Workers stop at their next safe point (within one copy chunk or
+    delete batch) and hold there until POST /execute/{execution_id}/resume.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+    """
+    engine = _get_running_engine(execution_id)
+    if engine.io.cancelled:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Execution '{execution_id}' is being cancelled"
+        )
+    await engine.pause()
+    return {"execution_id": execution_id, "status": "paused"}
+
+
+@router.post("/execute/{execution_id}/cancel")
+async def cancel_execution(execution_id: str) -> Dict[str, Any]:
+    """
+    Cancel a running or paused execution.
+
+    Running actions stop at their next safe point. Actions already
+    completed are kept; the checkpoint is saved, so the execution can
+    later be resumed from where it stopped.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+    """
+    engine = _get_running_engine(execution_id)
+    await engine.cancel()
+    return {"execution_id": execution_id, "status": "cancelling"}
+
+
+@router.get("/execute/{execution_id}/io")
+async def get_io_limits(execution_id: str) -> Dict[str, Any]:
+    """
+    Get a running execution's I/O limits and measured disk latency.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+    """
+    return _get_running_engine(execution_id).io.status()
+
+
+@router.put("/execute/{execution_id}/io")
+async def update_io_limits(execution_id: str, request: IOLimitsRequest) -> Dict[str, Any]:
+    """
+    Change a running execution's I/O limits.
+
+    Takes effect on the workers' next chunk. Omitted fields are unchanged.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+        request: New rate limit (0 = unlimited), priority and adaptive flags
+    """
+    engine = _get_running_engine(execution_id)
+    engine.io.configure(
+        rate_bytes_per_second=request.rate_limit_bytes_per_second,
+        low_priority=request.low_priority,
+        adaptive=request.adaptive
+    )
+    return engine.io.status()
+
+
+@router.post("/execute/{execution_id}/rollback")
+async def rollback_execution(execution_id: str) -> Dict[str, Any]:
+    """
+    Undo a finished, failed or cancelled execution.
+
+    Independent operations are undone in parallel, later ones first;
+    restored files are verified against the manifests recorded during
+    execution. Watch progress on the WebSocket under the returned
+    rollback_id.
+
+    Args:
+        execution_id: The execution ID from /execute endpoint
+    """
+    if is_execution_active(execution_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Execution '{execution_id}' is still running"
+        )
+    if is_rollback_active(execution_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Execution '{execution_id}' is already being rolled back"
+        )
+
+    try:
+        started = await RollbackManager(execution_id).start()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No rollback data found for execution '{execution_id}'"
+        )
+    return {**started, "status": "rolling_back"}
@@ -0,0 +1,99 @@
+"""Job queue and schedule API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Dict, Any, Optional
+from app.models import ScheduleRequest
+from app.services.job_queue import JobQueue
+from app.dependencies import get_job_queue
+
+router = APIRouter()
+
+
+def _require_queue(queue: Optional[JobQueue]) -> JobQueue:
+    """Raise 503 if the job queue has not started."""
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return queue
+
+
+@router.get("/jobs")
+async def list_jobs(
+    status: Optional[str] = Query(None, description="Filter by job status"),
+    limit: int = Query(100, ge=1, le=1000),
+    queue: Optional[JobQueue] = Depends(get_job_queue)
+) -> List[Dict[str, Any]]:
+    """
+    List executions: running first, then queued in run order, then finished.
+    """
+    return await _require_queue(queue).list_jobs(status=status, limit=limit)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, queue: Optional[JobQueue] = Depends(get_job_queue)) -> Dict[str, Any]:
+    """
+    Get a job. The job ID is the execution ID.
+
+    Args:
+        job_id: The execution ID from /execute endpoint
+    """
+    job = await _require_queue(queue).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, queue: Optional[JobQueue] = Depends(get_job_queue)) -> Dict[str, Any]:
+    """
+    Cancel a queued job, or stop a running one at its next safe point.
+
+    Args:
+        job_id: The execution ID from /execute endpoint
+    """
+    job = await _require_queue(queue).cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@router.get("/schedules")
+async def list_schedules(queue: Optional[JobQueue] = Depends(get_job_queue)) -> List[Dict[str, Any]]:
+    """
+    List daily plan schedules by next run time.
+    """
+    return await _require_queue(queue).list_schedules()
+
+
+@router.post("/schedules")
+async def create_schedule(
+    request: ScheduleRequest,
+    queue: Optional[JobQueue] = Depends(get_job_queue)
+) -> Dict[str, Any]:
+    """
+    Run a plan every day at a local time, e.g. the conservative plan at 02:00.
+
+    Plans are regenerated from a fresh analysis when the schedule fires,
+    so the job acts on the drives' current contents.
+    """
+    return await _require_queue(queue).add_schedule(
+        plan_id=request.plan_id,
+        time_of_day=request.time_of_day,
+        dry_run=request.dry_run,
+        priority=request.priority
+    )
+
+
+@router.delete("/schedules/{schedule_id}")
+async def delete_schedule(
+    schedule_id: str,
+    queue: Optional[JobQueue] = Depends(get_job_queue)
+) -> Dict[str, Any]:
+    """
+    Delete a schedule. Jobs it already queued are not affected.
+
+    Args:
+        schedule_id: Schedule ID
+    """
+    if not await _require_queue(queue).delete_schedule(schedule_id):
+        raise HTTPException(status_code=404, detail=f"Schedule '{schedule_id}' not found")
+    return {"schedule_id": schedule_id, "status": "deleted"}
@@ -4,8 +4,10 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, List, Dict, Any
 from app.services.planner import PlanGenerator
 from app.services.analyzer import DriveAnalyzer
+from app.models import PlanGoal
 from app.config import Settings
-from app.dependencies import get_settings
+from app.ai.pool import AIClientPool
+from app.dependencies import get_settings, get_ai_clients
 
 router = APIRouter()
 
@@ -16,29 +18,46 @@ _cached_plans: Optional[List[Dict[str, Any]]] = None
 @router.get("/plans")
 async def get_plans(
     use_ai: Optional[bool] = Query(None, description="Force AI or rule-based generation"),
-    settings: Settings = Depends(get_settings)
+    goal_drive: str = Query("C", pattern="^[A-Z]$", description="Drive the free-space goal applies to"),
+    reclaim_bytes: Optional[int] = Query(None, gt=0, description="Goal: bytes to free on goal_drive"),
+    max_percent_used: Optional[float] = Query(None, ge=0, le=100, description="Goal: bring goal_drive under this usage"),
+    settings: Settings = Depends(get_settings),
+    ai_clients: Optional[AIClientPool] = Depends(get_ai_clients)
 ) -> List[Dict[str, Any]]:
     """
     Generate 3 cleanup plans (Conservative, Balanced, Aggressive).
 
+    If reclaim_bytes or max_percent_used is given, instead returns the
+    Pareto-optimal plans that reach that free-space goal.
+
     Plans are cached for 5 minutes to avoid regeneration.
     """
     global _cached_plans
 
+    goal = None
+    if reclaim_bytes is not None or max_percent_used is not None:
+        goal = PlanGoal(
+            drive=goal_drive,
+            reclaim_bytes=reclaim_bytes,
+            max_percent_used=max_percent_used
+        )
+
     try:
         # Get fresh analysis
         analyzer = DriveAnalyzer()
         analysis_result = await analyzer.analyze()
 
         # Generate plans
-        planner = PlanGenerator(settings)
-        plans = await planner.generate_plans(analysis_result, force_ai=use_ai)
+        planner = PlanGenerator(settings, ai_clients=ai_clients)
+        plans = await planner.generate_plans(analysis_result, force_ai=use_ai, goal=goal)
 
         # Cache plans
         _cached_plans = plans
 
         return plans
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Plan generation failed: {str(e)}")
 
@@ -1,49 +1,111 @@
 """WebSocket progress tracking endpoint."""
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from app.services.progress import get_progress_manager
-from app.models import ExecutionStatus
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from typing import Optional
+from app.dependencies import get_websocket_job_queue
+from app.services.broadcast import get_broadcaster
+from app.services.job_queue import JobQueue
+from app.services.progress import get_progress_manager, FINAL_STATUSES
 import asyncio
+import json
 
 router = APIRouter()
 
+# Close code for an execution that is unknown or no longer held in memory
+CLOSE_UNKNOWN_EXECUTION = 4404
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Return once the client closes the connection."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
 
 @router.websocket("/progress/{execution_id}")
-async def progress_websocket(websocket: WebSocket, execution_id: str):
+async def progress_websocket(
+    websocket: WebSocket,
+    execution_id: str,
+    since: Optional[int] = None,
+    stream: Optional[str] = None,
+    job_queue: Optional[JobQueue] = Depends(get_websocket_job_queue)
+):
     """
     Real-time progress updates via WebSocket.
 
-    Sends progress updates every second until execution completes.
+    The first message is a full "snapshot"; each later message is a
+    "delta" with the summary fields, changed steps and new log lines.
+    Every message carries a sequence number "seq" and a "stream" ID. A
+    client reconnecting with ``?since=<seq>&stream=<stream>`` gets only
+    what it missed, or a new snapshot if that is no longer available.
+
+    Updates are pushed whenever progress changes, until execution
+    completes, at least progress_push_interval apart. All clients of an
+    execution share one broadcaster that encodes each update once; a
+    client that falls behind skips intermediate updates and gets a
+    catch-up delta instead.
+
+    A queued job's progress is registered when its first client
+    subscribes. Unknown executions, and finished ones evicted from
+    memory, are closed with code 4404; their history is at
+    /executions/{id}/progress.
 
     Args:
         execution_id: The execution ID from /execute endpoint
+        since: Sequence number of the last message the client applied
+        stream: Stream ID of that message
+        job_queue: Queue that registers progress of queued jobs
     """
     await websocket.accept()
-    progress_manager = get_progress_manager(execution_id)
+    if job_queue:
+        manager = await job_queue.progress_manager(execution_id)
+    else:
+        manager = get_progress_manager(execution_id)
+    if manager is None:
+        await websocket.close(code=CLOSE_UNKNOWN_EXECUTION, reason="Unknown execution")
+        return
+    broadcaster = get_broadcaster(manager)
+    # Subscribe first so no update is missed between the first message and the queue
+    subscriber = broadcaster.subscribe()
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
 
     try:
-        while True:
-            # Get current progress
-            progress = await progress_manager.get_progress()
-
-            # Send to client
-            await websocket.send_json(progress)
-
-            # Check if execution is done
-            status = progress.get("status")
-            if status in [
-                ExecutionStatus.COMPLETED.value,
-                ExecutionStatus.FAILED.value,
-                ExecutionStatus.CANCELLED.value
-            ]:
-                # Send final update and close
-                await asyncio.sleep(1)
+        message = await manager.get_update(since, stream)
+        await websocket.send_text(json.dumps(message))
+        position = message["seq"]
+        final = message["status"] in FINAL_STATUSES
+
+        while not final:
+            next_update = asyncio.create_task(subscriber.queue.get())
+            await asyncio.wait({next_update, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_update.done():
+                next_update.cancel()
                 break
+            update = next_update.result()
+
+            if update.seq <= position and update.type == "delta":
+                # Already covered by an earlier message
+                continue
+            if update.type == "delta" and update.since != position:
+                # Updates were dropped for this client; send what it missed
+                message = await manager.get_update(position, manager.stream_id)
+                await websocket.send_text(json.dumps(message))
+                position = message["seq"]
+                final = message["status"] in FINAL_STATUSES
+                continue
 
-            # Wait before next update
-            await asyncio.sleep(1)
+            await websocket.send_text(update.text)
+            position = update.seq
+            final = update.final
 
     except WebSocketDisconnect:
         pass
     finally:
-        await websocket.close()
+        disconnected.cancel()
+        broadcaster.unsubscribe(subscriber)
+        try:
+            await websocket.close()
+        except RuntimeError:
+            # Already closed by the client
+            pass
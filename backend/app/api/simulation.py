@@ -0,0 +1,54 @@
+"""What-if simulation API endpoints."""
+
+from fastapi import APIRouter, HTTPException
+from typing import List, Dict, Any
+from app.models import SimulateRequest
+from app.services.simulator import PlanSimulator
+from app.storage.scanner import DriveScanner
+import app.api.plans as plans_api
+
+router = APIRouter()
+
+
+@router.post("/simulate")
+async def simulate_plans(request: SimulateRequest) -> List[Dict[str, Any]]:
+    """
+    Project every drive's usage and status after running plans.
+
+    Simulates the requested generated plans (all of them by default)
+    plus any ad-hoc plans in the request, and flags overlapping actions
+    whose bytes would otherwise be counted twice.
+
+    Args:
+        request: Plan IDs and/or inline plans to simulate
+    """
+    plans = []
+
+    if request.plan_ids is not None or not request.plans:
+        cached = plans_api._cached_plans or []
+        if request.plan_ids is None:
+            plans.extend(cached)
+        else:
+            for plan_id in request.plan_ids:
+                plan = next((p for p in cached if p["id"] == plan_id), None)
+                if not plan:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Plan '{plan_id}' not found"
+                    )
+                plans.append(plan)
+
+    plans.extend(request.plans or [])
+
+    if not plans:
+        raise HTTPException(
+            status_code=404,
+            detail="No plans available. Call /plans first to generate plans."
+        )
+
+    try:
+        drives = [d.model_dump() for d in DriveScanner.get_all_drives()]
+        simulator = PlanSimulator(drives)
+        return simulator.simulate_plans(plans)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
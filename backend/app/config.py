@@ -24,9 +24,83 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     anthropic_api_key: str = ""
 
+    # AI HTTP connection pool
+    ai_max_connections: int = 10
+    ai_max_keepalive_connections: int = 5
+    ai_keepalive_expiry: float = 60.0  # seconds
+    ai_request_timeout: float = 120.0  # seconds
+
     # Storage Settings
     backup_location: str = "D:\\Backups"
     default_target_drive: str = "D:"
+    placement_max_percent_used: float = 80.0  # keep target drives under this usage
+
+    # Throughput Model
+    throughput_cache_file: str = "data/throughput.json"
+    throughput_probe_bytes: int = 268435456  # 256MB upper bound per probe
+    throughput_probe_seconds: float = 2.0  # time budget per drive probe
+    throughput_cache_ttl_hours: int = 168  # re-benchmark drives weekly
+
+    # Execution Concurrency
+    max_parallel_actions: int = 4  # independent actions running at once
+    max_actions_per_drive: int = 2  # concurrent actions touching one drive
+
+    # Move Engine
+    move_workers: int = 8  # parallel copy threads for cross-device moves
+    move_large_file_bytes: int = 8388608  # 8MB; smaller files are batched
+    move_buffer_bytes: int = 8388608  # 8MB copy chunk
+
+    # Delete Engine
+    delete_workers: int = 16  # parallel scan/unlink threads for cleanups
+    delete_batch_files: int = 1000  # files unlinked per task
+
+    # I/O Throttling
+    io_rate_limit_bytes_per_second: int = 0  # 0 = unlimited
+    io_low_priority: bool = False  # idle I/O class for workers (Linux)
+    io_adaptive: bool = True  # back off when disk latency rises while other processes use the disk
+    io_latency_target_ms: float = 50.0  # average disk latency considered healthy
+    io_min_rate_bytes_per_second: int = 4194304  # 4MB/s floor for adaptive backoff
+    io_foreground_min_bytes_per_second: int = 262144  # other processes' disk traffic that counts as contention
+    io_monitor_interval: float = 1.0  # seconds between latency samples
+
+    # Progress Reporting
+    progress_update_interval: float = 0.5  # seconds between byte progress updates
+    progress_rate_smoothing: float = 0.3  # EWMA weight of the newest throughput sample
+    progress_push_interval: float = 0.25  # minimum seconds between WebSocket messages
+    progress_subscriber_queue: int = 8  # pending updates per WebSocket client before dropping
+    progress_event_db: str = "data/progress_events.db"  # durable progress history
+    progress_event_flush_seconds: float = 1.0  # max delay before events reach disk
+    progress_log_capacity: int = 100  # log lines kept per execution in memory (all are in the event log)
+    progress_max_managers: int = 256  # live progress kept in memory before finished ones are evicted
+    progress_retention_seconds: float = 3600.0  # how long finished progress stays in memory
+
+    # Archives
+    archive_compression: str = "xz"  # xz (higher ratio) or gz (faster)
+    archive_compression_level: int = 6
+    archive_workers: int = 4  # compression threads
+    archive_block_bytes: int = 4194304  # 4MB independently compressed blocks
+
+    # Backup Store
+    backup_store_dir: str = "store"  # deduplicated store, relative to backup_location
+    backup_workers: int = 8  # parallel hash/copy threads
+    backup_retention_days: int = 30  # snapshots older than this are deleted (0 = keep)
+    backup_max_bytes: int = 0  # oldest snapshots are deleted above this store size (0 = unlimited)
+
+    # Verification
+    verify_hashes: bool = True  # hash copies on both sides before removing sources
+    verify_workers: int = 4  # parallel hashing threads
+    verify_hash_cache: str = "data/hash-cache.db"
+    verification_dir: str = "data/manifests"  # per-action hash manifests
+
+    # Checkpoints
+    checkpoint_dir: str = "data/checkpoints"
+    checkpoint_batch_size: int = 512  # journal entries per fsync
+    checkpoint_flush_seconds: float = 1.0  # max delay before a journal fsync
+
+    # Rollback Journal
+    rollback_dir: str = "data/rollback"
+    rollback_batch_size: int = 512  # completion records buffered per fsync
+    rollback_flush_seconds: float = 1.0  # max delay before completion records are synced
 
     # Safety Settings
     dry_run_default: bool = False
@@ -36,6 +110,10 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///data/executions.db"
 
+    # Job Queue
+    max_concurrent_executions: int = 2  # executions on disjoint drives may run together
+    scheduler_poll_seconds: float = 30.0  # how often schedules are checked
+
     # Logging
     log_file: str = "logs/app.log"
     log_max_bytes: int = 10485760  # 10MB
@@ -1,8 +1,33 @@
 """Dependency injection for FastAPI endpoints."""
 
+from typing import Optional
+from fastapi import Request, WebSocket
 from app.config import settings
+from app.ai.pool import AIClientPool
+from app.services.job_queue import JobQueue
+from app.services.progress_events import ProgressEventStore
 
 
 def get_settings():
     """Return global settings instance."""
     return settings
+
+
+def get_ai_clients(request: Request) -> Optional[AIClientPool]:
+    """Return the application-wide AI client pool, if the app has started."""
+    return getattr(request.app.state, "ai_clients", None)
+
+
+def get_job_queue(request: Request) -> Optional[JobQueue]:
+    """Return the execution job queue, if the app has started."""
+    return getattr(request.app.state, "job_queue", None)
+
+
+def get_websocket_job_queue(websocket: WebSocket) -> Optional[JobQueue]:
+    """Return the execution job queue to a WebSocket endpoint, if the app has started."""
+    return getattr(websocket.app.state, "job_queue", None)
+
+
+def get_progress_events(request: Request) -> Optional[ProgressEventStore]:
+    """Return the durable progress event store, if the app has started."""
+    return getattr(request.app.state, "progress_events", None)
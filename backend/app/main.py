@@ -1,9 +1,51 @@
 """FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.api import analysis, plans, execution, progress, settings as settings_api
+from app.ai.pool import AIClientPool
+from app.services.job_queue import JobQueue, sqlite_path
+from app.services.progress_events import ProgressEventStore, set_progress_event_store
+from app.services.rollback_journal import recover_unfinished
+from app.api import analysis, plans, simulation, execution, jobs, archives, progress, settings as settings_api
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create long-lived resources on startup and release them on shutdown."""
+    # Report executions a crash or restart stopped before the job queue resumes them
+    for execution in await asyncio.to_thread(recover_unfinished):
+        logger.warning(
+            f"Execution {execution['execution_id']} did not finish: "
+            f"{len(execution['operations'])} operations done, "
+            f"{len(execution['incomplete'])} interrupted"
+        )
+    app.state.ai_clients = AIClientPool(settings)
+    app.state.progress_events = ProgressEventStore(
+        settings.progress_event_db,
+        flush_seconds=settings.progress_event_flush_seconds
+    )
+    await asyncio.to_thread(app.state.progress_events.start)
+    set_progress_event_store(app.state.progress_events)
+    app.state.job_queue = JobQueue(
+        sqlite_path(settings.database_url),
+        max_concurrent=settings.max_concurrent_executions,
+        ai_clients=app.state.ai_clients
+    )
+    await app.state.job_queue.open()
+    dispatcher = asyncio.create_task(app.state.job_queue.run())
+    yield
+    dispatcher.cancel()
+    await app.state.job_queue.close()
+    await app.state.ai_clients.aclose()
+    set_progress_event_store(None)
+    await asyncio.to_thread(app.state.progress_events.close)
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -11,7 +53,8 @@ app = FastAPI(
     description="AI-powered Windows storage optimization API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -26,7 +69,10 @@ app.add_middleware(
 # Include routers
 app.include_router(analysis.router, tags=["Analysis"])
 app.include_router(plans.router, tags=["Plans"])
+app.include_router(simulation.router, tags=["Simulation"])
 app.include_router(execution.router, tags=["Execution"])
+app.include_router(jobs.router, tags=["Jobs"])
+app.include_router(archives.router, tags=["Archives"])
 app.include_router(progress.router, tags=["Progress"])
 app.include_router(settings_api.router, tags=["Settings"])
 
@@ -1,7 +1,7 @@
 """Pydantic models for data validation and serialization."""
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -43,6 +43,7 @@ class SpaceConsumer(BaseModel):
     name: str
     path: str
     size_bytes: int = Field(..., ge=0)
+    file_count: Optional[int] = Field(None, ge=0)  # Counted for cleanup candidates
     type: ConsumerType
     last_modified: Optional[datetime] = None
 
@@ -68,6 +69,7 @@ class ActionType(str, Enum):
     DELETE_TO_RECYCLE = "DELETE_TO_RECYCLE"
     EXPORT_IMPORT_WSL = "EXPORT_IMPORT_WSL"
     CLEANUP = "CLEANUP"
+    ARCHIVE = "ARCHIVE"
 
 
 class PlanAction(BaseModel):
@@ -81,6 +83,7 @@ class PlanAction(BaseModel):
     safety_explanation: str
     rollback_option: str
     command: Optional[str] = None
+    file_count: Optional[int] = Field(default=None, ge=0)
     estimated_seconds: int = Field(default=60, ge=0)
 
 
@@ -104,12 +107,20 @@ class Plan(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
 
 
+class PlanGoal(BaseModel):
+    """Free-space goal for optimization-based planning."""
+    drive: str = Field(default="C", pattern="^[A-Z]$")
+    reclaim_bytes: Optional[int] = Field(default=None, gt=0)
+    max_percent_used: Optional[float] = Field(default=None, ge=0, le=100)
+
+
 # ==================== Execution Models ====================
 
 class ExecutionStatus(str, Enum):
     """Execution status states."""
     PENDING = "pending"
     RUNNING = "running"
+    PAUSED = "paused"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
@@ -121,6 +132,7 @@ class StepStatus(str, Enum):
     ACTIVE = "active"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class ExecutionStep(BaseModel):
@@ -131,6 +143,13 @@ class ExecutionStep(BaseModel):
     description: str
     progress_percent: Optional[float] = None
     error_message: Optional[str] = None
+    estimated_seconds: int = Field(default=0, ge=0)
+    total_bytes: int = Field(default=0, ge=0)
+    bytes_processed: int = Field(default=0, ge=0)
+    files_processed: int = Field(default=0, ge=0)
+    bytes_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    impact: Optional[Dict[str, Any]] = None  # dry-run report
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
@@ -159,6 +178,7 @@ class ExecutionProgress(BaseModel):
     steps: List[ExecutionStep]
     logs: List[LogEntry]
     status: ExecutionStatus
+    eta_seconds: Optional[float] = None
     updated_at: datetime = Field(default_factory=datetime.now)
 
 
@@ -168,6 +188,7 @@ class ExecuteRequest(BaseModel):
     """Request to execute a plan."""
     plan_id: str
     dry_run: bool = False
+    priority: int = 0  # higher runs first when executions are queued
 
 
 class ExecuteResponse(BaseModel):
@@ -177,6 +198,34 @@ class ExecuteResponse(BaseModel):
     started_at: datetime
 
 
+class ScheduleRequest(BaseModel):
+    """Request to run a plan daily at a fixed local time."""
+    plan_id: str
+    time_of_day: str = Field(..., pattern=r"^([01]\d|2[0-3]):[0-5]\d$")  # "HH:MM"
+    dry_run: bool = False
+    priority: int = 0
+
+
+class ArchiveRestoreRequest(BaseModel):
+    """Request to restore one file from an archive."""
+    archive: str  # archive path
+    file: str  # member name as listed in the archive index
+    destination: str  # directory to restore into
+
+
+class IOLimitsRequest(BaseModel):
+    """Request to change a running execution's I/O limits."""
+    rate_limit_bytes_per_second: Optional[int] = Field(default=None, ge=0)  # 0 = unlimited
+    low_priority: Optional[bool] = None
+    adaptive: Optional[bool] = None
+
+
+class SimulateRequest(BaseModel):
+    """Request to simulate post-plan drive state."""
+    plan_ids: Optional[List[str]] = None  # defaults to all generated plans
+    plans: Optional[List[Dict[str, Any]]] = None  # ad-hoc plans to simulate
+
+
 # ==================== Settings Models ====================
 
 class UserSettings(BaseModel):
@@ -0,0 +1,80 @@
+"""Dependency graph and per-drive concurrency limits for plan actions."""
+
+from typing import List, Dict, Any, Set
+from contextlib import asynccontextmanager
+import asyncio
+from app.utils.helpers import get_drive_letter, normalize_path, is_subpath
+
+
+def action_paths(action: Dict[str, Any]) -> List[str]:
+    """Return an action's normalized source and target paths."""
+    paths = [normalize_path(action.get(key)) for key in ("source_path", "target_path")]
+    return [p for p in paths if p]
+
+
+def action_drives(action: Dict[str, Any], system_drive: str = "C") -> Set[str]:
+    """Return the drive letters an action reads from or writes to.
+
+    Actions without a drive-qualified path (e.g. a bare command) are
+    assumed to work on the system drive.
+    """
+    drives = {
+        get_drive_letter(action.get(key) or "")
+        for key in ("source_path", "target_path")
+    }
+    drives.discard(None)
+    return drives or {system_drive}
+
+
+def build_dependencies(actions: List[Dict[str, Any]]) -> List[Set[int]]:
+    """Build the dependency set of every action.
+
+    Action j depends on an earlier action i when any of their paths
+    overlap (equal, or one inside the other), so e.g. a PRUNE runs after
+    a MOVE of the same data. Actions without paths cannot be reasoned
+    about and are ordered against everything before and after them.
+    """
+    paths = [action_paths(a) for a in actions]
+    deps: List[Set[int]] = [set() for _ in actions]
+
+    for j in range(len(actions)):
+        for i in range(j):
+            if not paths[i] or not paths[j]:
+                deps[j].add(i)
+                continue
+            if any(
+                is_subpath(a, b) or is_subpath(b, a)
+                for a in paths[j] for b in paths[i]
+            ):
+                deps[j].add(i)
+
+    return deps
+
+
+class DriveLimiter:
+    """Per-drive concurrency budget shared by all running actions."""
+
+    def __init__(self, per_drive: int):
+        """Initialize limiter with the number of concurrent actions per drive."""
+        self.per_drive = per_drive
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, drive: str) -> asyncio.Semaphore:
+        """Get or create the semaphore for a drive."""
+        if drive not in self._semaphores:
+            self._semaphores[drive] = asyncio.Semaphore(self.per_drive)
+        return self._semaphores[drive]
+
+    @asynccontextmanager
+    async def acquire(self, drives: Set[str]):
+        """Hold a slot on every drive; acquired in sorted order to avoid deadlock."""
+        acquired = []
+        try:
+            for drive in sorted(drives):
+                semaphore = self._semaphore(drive)
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
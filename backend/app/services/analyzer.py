@@ -31,15 +31,22 @@ class DriveAnalyzer:
             other_drives = [d for d in drives if d.letter != "C"]
 
             if c_drive and c_drive.percent_used > 70:
-                for other in other_drives:
-                    if other.percent_used < 30:
-                        has_imbalance = True
-                        free_gb = other.free_bytes / (1024 ** 3)
-                        imbalance_message = (
-                            f"{c_drive.letter}: drive is {c_drive.percent_used}% full "
-                            f"while {other.letter}: has {free_gb:.0f}GB free"
-                        )
-                        break
+                # Report every underused drive, roomiest first
+                underused = sorted(
+                    (d for d in other_drives if d.percent_used < 30),
+                    key=lambda d: d.free_bytes,
+                    reverse=True
+                )
+                if underused:
+                    has_imbalance = True
+                    free_text = ", ".join(
+                        f"{d.letter}: has {d.free_bytes / (1024 ** 3):.0f}GB free"
+                        for d in underused
+                    )
+                    imbalance_message = (
+                        f"{c_drive.letter}: drive is {c_drive.percent_used}% full "
+                        f"while {free_text}"
+                    )
 
         result = AnalysisResult(
             drives=drives,
@@ -0,0 +1,126 @@
+"""Serialize-once fan-out of progress updates to WebSocket subscribers."""
+
+from typing import Dict, Any, Optional, Set
+import asyncio
+import json
+import logging
+from app.config import settings
+from app.services.progress import ProgressManager, FINAL_STATUSES
+
+
+logger = logging.getLogger(__name__)
+
+
+class EncodedUpdate:
+    """A progress message encoded once and shared by every subscriber."""
+
+    __slots__ = ("type", "since", "seq", "final", "text")
+
+    def __init__(self, message: Dict[str, Any]):
+        """Encode a message from ProgressManager.get_update."""
+        self.type = message["type"]
+        self.since = message.get("since")
+        self.seq = message["seq"]
+        self.final = message["status"] in FINAL_STATUSES
+        self.text = json.dumps(message)
+
+
+class Subscriber:
+    """One client's bounded queue of pending updates.
+
+    When the client falls behind and the queue is full, the oldest update
+    is dropped. The gap is noticed when the next update is sent, and the
+    client then gets one catch-up delta built just for it.
+    """
+
+    def __init__(self, queue_size: int):
+        """Initialize subscriber."""
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, update: EncodedUpdate):
+        """Queue an update without ever blocking the broadcaster."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(update)
+
+
+class ProgressBroadcaster:
+    """Publishes one execution's progress to all of its subscribers.
+
+    A single task waits for changes, builds each delta and encodes it to
+    JSON once; every subscriber's queue receives the same encoded text,
+    so the cost per update does not grow with the number of clients.
+    """
+
+    def __init__(self, manager: ProgressManager, queue_size: int = 8, interval: float = 0.25):
+        """Initialize broadcaster.
+
+        Args:
+            manager: Progress manager to publish
+            queue_size: Pending updates kept per subscriber
+            interval: Minimum seconds between updates
+        """
+        self.manager = manager
+        self.queue_size = queue_size
+        self.interval = interval
+        self._subscribers: Set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Add a subscriber, starting the publishing task if needed."""
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            # Start from the current state, which new subscribers are sent directly
+            self._task = asyncio.create_task(self._run(self.manager.seq))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a subscriber; the last one to leave stops the task."""
+        self._subscribers.discard(subscriber)
+        if not self._subscribers:
+            if self._task:
+                self._task.cancel()
+            if _broadcasters.get(self.manager.execution_id) is self:
+                del _broadcasters[self.manager.execution_id]
+
+    async def _run(self, since: int):
+        """Wait for changes after since and publish each as one encoded update."""
+        stream = self.manager.stream_id
+        try:
+            while True:
+                await self.manager.wait_for_change(since)
+                update = EncodedUpdate(await self.manager.get_update(since, stream))
+                since, stream = update.seq, self.manager.stream_id
+                for subscriber in list(self._subscribers):
+                    subscriber.offer(update)
+                if update.final:
+                    return
+                # Coalesce changes made meanwhile into the next update
+                await asyncio.sleep(self.interval)
+        except Exception:
+            logger.exception(f"Progress broadcast for {self.manager.execution_id} stopped")
+
+
+# Broadcasters of executions with connected subscribers
+_broadcasters: Dict[str, ProgressBroadcaster] = {}
+
+
+def get_broadcaster(manager: ProgressManager) -> ProgressBroadcaster:
+    """Get or create the broadcaster of an execution's progress manager."""
+    execution_id = manager.execution_id
+    broadcaster = _broadcasters.get(execution_id)
+    if broadcaster is None or broadcaster.manager is not manager:
+        _broadcasters[execution_id] = ProgressBroadcaster(
+            manager,
+            queue_size=settings.progress_subscriber_queue,
+            interval=settings.progress_push_interval
+        )
+    return _broadcasters[execution_id]
@@ -0,0 +1,199 @@
+"""Durable checkpoints for resuming interrupted executions."""
+
+from typing import Dict, Any, List, Set, Tuple
+from pathlib import Path
+from datetime import datetime
+import json
+import os
+import shutil
+import threading
+import time
+from app.config import settings
+
+
+class CheckpointJournal:
+    """Append-only journal of finished files and phases for one action.
+
+    File entries are buffered and written with a single write + fsync per
+    batch (``batch_size`` entries or ``flush_seconds``), so journaling
+    costs little next to the copy itself. A crash loses at most the last
+    unflushed batch, and those files are simply copied again. Phase
+    entries (e.g. "copied", "removed", "linked") are flushed immediately.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 512, flush_seconds: float = 1.0):
+        """Initialize journal and load any entries from a previous run."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.files: Dict[str, Tuple[int, int]] = {}
+        self.phases: Set[str] = set()
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read entries written before a restart."""
+        if not self.path.exists():
+            return
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                # A crash mid-write leaves a truncated last line; ignore it
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if "phase" in entry:
+                    self.phases.add(entry["phase"])
+                else:
+                    self.files[entry["f"]] = (entry["s"], entry["m"])
+        if self.path.stat().st_size > valid_bytes:
+            # Drop a line torn by a crash so new entries start on a fresh line
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def _write(self, lines: List[str]):
+        """Append lines durably."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @property
+    def has_progress(self) -> bool:
+        """Whether a previous run recorded anything."""
+        return bool(self.files or self.phases)
+
+    def is_done(self, rel: str, size: int, mtime_ns: int) -> bool:
+        """Check whether a file was finished with the same size and mtime."""
+        return self.files.get(rel) == (size, mtime_ns)
+
+    def record_file(self, rel: str, size: int, mtime_ns: int):
+        """Record a finished file; flushed in batches."""
+        line = json.dumps({"f": rel, "s": size, "m": mtime_ns}) + "\n"
+        with self._lock:
+            self.files[rel] = (size, mtime_ns)
+            self._buffer.append(line)
+            if (
+                len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            ):
+                self._flush_locked()
+
+    def record_phase(self, phase: str):
+        """Record a completed phase and flush immediately."""
+        with self._lock:
+            self.phases.add(phase)
+            self._buffer.append(json.dumps({"phase": phase}) + "\n")
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """Write buffered entries; caller holds the lock."""
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write any buffered entries."""
+        with self._lock:
+            self._flush_locked()
+
+
+class CheckpointStore:
+    """Per-execution checkpoint directory.
+
+    Holds ``execution.json`` (the plan and which actions finished) and one
+    journal per action. The directory is removed once the execution ends,
+    so any directory still marked running after a restart belongs to an
+    interrupted execution.
+    """
+
+    def __init__(self, execution_id: str):
+        """Initialize store for an execution."""
+        self.execution_id = execution_id
+        self.directory = Path(settings.checkpoint_dir) / execution_id
+        self.state_file = self.directory / "execution.json"
+        self._lock = threading.RLock()
+
+    def save_state(self, state: Dict[str, Any]):
+        """Atomically write the execution state."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        state["updated_at"] = datetime.now().isoformat()
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_file, "w") as f:
+                json.dump(state, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.state_file)
+
+    def load_state(self) -> Dict[str, Any]:
+        """Load the execution state."""
+        if not self.state_file.exists():
+            raise FileNotFoundError(f"No checkpoint found for {self.execution_id}")
+        with open(self.state_file, "r") as f:
+            return json.load(f)
+
+    def start(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or reopen the state for a running execution."""
+        try:
+            state = self.load_state()
+        except FileNotFoundError:
+            state = {
+                "execution_id": self.execution_id,
+                "plan": plan,
+                "completed_actions": [],
+                "started_at": datetime.now().isoformat()
+            }
+        state["status"] = "running"
+        self.save_state(state)
+        return state
+
+    def mark_action_done(self, state: Dict[str, Any], action_id: str):
+        """Record a completed action."""
+        with self._lock:
+            if action_id not in state["completed_actions"]:
+                state["completed_actions"].append(action_id)
+            self.save_state(state)
+
+    def journal(self, action_id: str) -> CheckpointJournal:
+        """Open the journal for an action."""
+        return CheckpointJournal(
+            self.directory / f"{action_id}.journal",
+            batch_size=settings.checkpoint_batch_size,
+            flush_seconds=settings.checkpoint_flush_seconds
+        )
+
+    def finish(self):
+        """Remove all checkpoint data after the execution ends."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def list_interrupted() -> List[Dict[str, Any]]:
+        """List executions whose checkpoint says they were still running."""
+        root = Path(settings.checkpoint_dir)
+        if not root.exists():
+            return []
+
+        interrupted = []
+        for directory in root.iterdir():
+            try:
+                state = CheckpointStore(directory.name).load_state()
+            except (FileNotFoundError, ValueError):
+                continue
+            if state.get("status") == "running":
+                interrupted.append({
+                    "execution_id": state["execution_id"],
+                    "plan_id": state["plan"]["id"],
+                    "completed_actions": len(state["completed_actions"]),
+                    "total_actions": len(state["plan"]["actions"]),
+                    "updated_at": state.get("updated_at")
+                })
+        return interrupted
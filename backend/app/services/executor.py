@@ -1,27 +1,83 @@
 """Execution engine for running cleanup operations."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 import asyncio
+import os
+import time
 from pathlib import Path
 from app.models import ExecutionStatus, StepStatus, LogLevel, ActionType
-from app.services.progress import get_progress_manager
+from app.services.progress import create_progress_manager, ByteCounter
+from app.services.throughput import get_throughput_model
+from app.services.action_graph import build_dependencies, action_drives, DriveLimiter
+from app.config import settings
+from app.services.checkpoint import CheckpointStore
+from app.services.rollback_journal import RollbackJournal, journal_path, read_journal
+from app.services.impact import ImpactAnalyzer, describe_impact
+from app.services.io_control import IOController, ExecutionCancelled
+from app.services.verification import Verifier, manifest_path, save_manifest
+from app.storage.mover import MoveEngine
+from app.storage.deleter import DeleteEngine
+from app.storage.archiver import ArchiveEngine
+from app.storage.backup_store import BackupStore
 import shutil
 import subprocess
 
 
+# Executions running in this process
+_active_executions: Dict[str, "ExecutionEngine"] = {}
+
+
+def is_execution_active(execution_id: str) -> bool:
+    """Check whether an execution is running in this process."""
+    return execution_id in _active_executions
+
+
+def get_active_execution(execution_id: str) -> Optional["ExecutionEngine"]:
+    """Get the engine of a running execution."""
+    return _active_executions.get(execution_id)
+
+
 class ExecutionEngine:
     """Executes cleanup plans with safety measures."""
 
-    def __init__(self, execution_id: str, plan: Dict[str, Any], dry_run: bool = False):
-        """Initialize execution engine."""
+    def __init__(
+        self,
+        execution_id: str,
+        plan: Dict[str, Any],
+        dry_run: bool = False,
+        resume: bool = False
+    ):
+        """Initialize execution engine.
+
+        Args:
+            execution_id: Execution ID
+            plan: Plan to execute
+            dry_run: Report without making changes
+            resume: Continue an interrupted execution from its checkpoint
+        """
         self.execution_id = execution_id
         self.plan = plan
         self.dry_run = dry_run
-        self.progress = get_progress_manager(execution_id)
+        self.resume = resume
+        self.progress = create_progress_manager(execution_id)
+        self.throughput = get_throughput_model()
+        self.drive_limiter = DriveLimiter(settings.max_actions_per_drive)
+        self.io = IOController.from_settings()
+        self.checkpoints = None if dry_run else CheckpointStore(execution_id)
+        self.checkpoint_state: Optional[Dict[str, Any]] = None
+        # Write-ahead record of reversible operations; opened when execution starts
+        self.rollback_journal: Optional[RollbackJournal] = None
+        # Byte counters of running actions, keyed by action ID
+        self.counters: Dict[str, ByteCounter] = {}
+        # Dry run: per-action impact report, keyed by action ID
+        self.impact_analyzer = ImpactAnalyzer() if dry_run else None
+        self.impacts: Dict[str, Dict[str, Any]] = {}
         self.rollback_data = []
 
     async def execute(self):
         """Execute the plan."""
+        _active_executions[self.execution_id] = self
+        io_monitor = None if self.dry_run else asyncio.create_task(self.io.monitor())
         try:
             # Initialize progress
             await self.progress.initialize(
@@ -40,99 +96,528 @@ class ExecutionEngine:
                     "DRY RUN MODE - No changes will be made"
                 )
 
-            # Execute each action
-            for idx, action in enumerate(self.plan["actions"]):
-                await self.progress.update_step(idx, StepStatus.ACTIVE)
-                await self.progress.add_log(
-                    LogLevel.INFO,
-                    f"Starting: {action['description']}"
-                )
-
-                try:
-                    if not self.dry_run:
-                        await self._execute_action(action)
-                    else:
-                        # Simulate execution in dry run
-                        await asyncio.sleep(1)
-
-                    await self.progress.update_step(idx, StepStatus.COMPLETED)
+            # Skip actions a previous run of this execution finished
+            completed = set()
+            if self.checkpoints:
+                self.rollback_journal = await asyncio.to_thread(RollbackJournal.for_execution, self.execution_id)
+                await asyncio.to_thread(self.rollback_journal.begin, self.plan["id"])
+                self.checkpoint_state = await asyncio.to_thread(self.checkpoints.start, self.plan)
+                if self.resume:
+                    self.rollback_data = await self._load_rollback_data()
+                    done_ids = set(self.checkpoint_state["completed_actions"])
+                    for idx, action in enumerate(self.plan["actions"]):
+                        if action["id"] in done_ids:
+                            completed.add(idx)
+                            await self.progress.update_step(idx, StepStatus.COMPLETED)
                     await self.progress.add_log(
-                        LogLevel.SUCCESS,
-                        f"Completed: {action['description']}"
+                        LogLevel.INFO,
+                        f"Resuming from checkpoint: {len(completed)} of "
+                        f"{len(self.plan['actions'])} actions already completed"
                     )
 
-                except Exception as e:
-                    await self.progress.update_step(
-                        idx,
-                        StepStatus.FAILED,
-                        error_message=str(e)
-                    )
-                    await self.progress.add_log(
-                        LogLevel.ERROR,
-                        f"Failed: {action['description']} - {str(e)}"
-                    )
-                    await self.progress.set_status(ExecutionStatus.FAILED)
-                    return
+            # Run independent actions in parallel, respecting dependencies
+            succeeded = await self._run_graph(self.plan["actions"], completed)
+            if self.io.cancelled:
+                await self._finish_checkpoint(ExecutionStatus.CANCELLED)
+                await self.progress.set_status(ExecutionStatus.CANCELLED)
+                await self.progress.add_log(
+                    LogLevel.WARNING,
+                    "Execution cancelled; completed actions were kept"
+                )
+                return
+            if not succeeded:
+                await self._finish_checkpoint(ExecutionStatus.FAILED)
+                await self.progress.set_status(ExecutionStatus.FAILED)
+                return
+
+            if self.dry_run:
+                await self._log_impact_summary()
 
             # Mark as completed
+            await self._finish_checkpoint(ExecutionStatus.COMPLETED)
             await self.progress.set_status(ExecutionStatus.COMPLETED)
             await self.progress.add_log(
                 LogLevel.SUCCESS,
                 f"Execution completed successfully! Saved {self._format_bytes(self.plan['space_saved_bytes'])}"
             )
+            if not self.dry_run and settings.create_backups:
+                await self._expire_backups()
 
         except Exception as e:
             await self.progress.add_log(
                 LogLevel.ERROR,
                 f"Execution failed: {str(e)}"
             )
+            await self._finish_checkpoint(ExecutionStatus.FAILED)
             await self.progress.set_status(ExecutionStatus.FAILED)
+        finally:
+            if io_monitor:
+                io_monitor.cancel()
+            if self.rollback_journal:
+                await asyncio.to_thread(self.rollback_journal.close)
+            _active_executions.pop(self.execution_id, None)
+
+    async def _load_rollback_data(self) -> List[Dict[str, Any]]:
+        """Rollback data of a previous run, from its journal or else its checkpoint."""
+        path = journal_path(self.execution_id)
+        if await asyncio.to_thread(path.exists):
+            return (await asyncio.to_thread(read_journal, path))["operations"]
+        return list(self.checkpoint_state.get("rollback", []))
+
+    async def _finish_checkpoint(self, status: ExecutionStatus):
+        """Drop checkpoints after success; keep them for resume after failure.
+
+        The rollback journal is kept either way, with the final status.
+        """
+        if self.rollback_journal:
+            await asyncio.to_thread(self.rollback_journal.end, status.value)
+        if not self.checkpoints or self.checkpoint_state is None:
+            return
+        if status == ExecutionStatus.COMPLETED:
+            await asyncio.to_thread(self.checkpoints.finish)
+        else:
+            self.checkpoint_state["status"] = status.value
+            self.checkpoint_state["rollback"] = self.rollback_data
+            await asyncio.to_thread(self.checkpoints.save_state, self.checkpoint_state)
+
+    async def _run_graph(
+        self,
+        actions: List[Dict[str, Any]],
+        completed: Optional[Set[int]] = None
+    ) -> bool:
+        """Run actions as a dependency graph.
+
+        An action starts once every action it depends on has completed,
+        up to max_parallel_actions at a time. After a failure no new
+        actions start; running ones are allowed to finish.
+
+        Args:
+            actions: Plan actions
+            completed: Indices of actions already done (when resuming)
+
+        Returns:
+            True if every action completed
+        """
+        deps = build_dependencies(actions)
+        completed = set(completed or ())
+        pending = set(range(len(actions))) - completed
+        running: Dict[asyncio.Task, int] = {}
+        failed = False
+
+        while pending or running:
+            if not failed and not self.io.cancelled:
+                ready = [i for i in sorted(pending) if deps[i] <= completed]
+                for idx in ready[:max(settings.max_parallel_actions - len(running), 0)]:
+                    pending.discard(idx)
+                    task = asyncio.create_task(self._run_step(idx, actions[idx]))
+                    running[task] = idx
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                idx = running.pop(task)
+                if task.result():
+                    completed.add(idx)
+                else:
+                    failed = True
+
+        return not failed and not pending
+
+    async def _run_step(self, idx: int, action: Dict[str, Any]) -> bool:
+        """Run one action as a progress step, holding its drives' budget."""
+        async with self.drive_limiter.acquire(action_drives(action)):
+            try:
+                await self.io.check_async()
+            except ExecutionCancelled:
+                return False
+
+            await self.progress.update_step(idx, StepStatus.ACTIVE)
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Starting: {action['description']}"
+            )
+
+            counter = ByteCounter()
+            self.counters[action["id"]] = counter
+            reporter = asyncio.create_task(self._report_bytes(idx, counter))
+
+            try:
+                if not self.dry_run:
+                    started = time.perf_counter()
+                    paused_before = self.io.paused_seconds
+                    waits_before = self.io.throttle_waits
+                    stats = await self._execute_action(action)
+                    # A rate-limited action measures the limit, not the disks
+                    if stats and self.io.throttle_waits == waits_before:
+                        # Learn real rates for future plan and progress ETAs
+                        await asyncio.to_thread(
+                            self.throughput.record,
+                            action,
+                            stats.get("bytes", 0),
+                            stats.get("files", 0),
+                            time.perf_counter() - started - (self.io.paused_seconds - paused_before)
+                        )
+                else:
+                    # Measure what the action would touch instead of running it
+                    impact = await asyncio.to_thread(self.impact_analyzer.analyze, action)
+                    self.impacts[action["id"]] = impact
+                    await self.progress.add_log(
+                        LogLevel.WARNING if impact["warnings"] else LogLevel.INFO,
+                        describe_impact(impact)
+                    )
+
+                if self.checkpoint_state is not None:
+                    await asyncio.to_thread(
+                        self.checkpoints.mark_action_done, self.checkpoint_state, action["id"]
+                    )
+
+                reporter.cancel()
+                bytes_done, files_done = counter.snapshot()
+                await self.progress.update_step(
+                    idx,
+                    StepStatus.COMPLETED,
+                    bytes_processed=bytes_done,
+                    files_processed=files_done,
+                    impact=self.impacts.get(action["id"])
+                )
+                await self.progress.add_log(
+                    LogLevel.SUCCESS,
+                    f"Completed: {action['description']}"
+                )
+                return True
+
+            except ExecutionCancelled:
+                reporter.cancel()
+                await self.progress.update_step(idx, StepStatus.CANCELLED)
+                await self.progress.add_log(
+                    LogLevel.WARNING,
+                    f"Stopped: {action['description']}"
+                )
+                return False
+
+            except Exception as e:
+                reporter.cancel()
+                await self.progress.update_step(
+                    idx,
+                    StepStatus.FAILED,
+                    error_message=str(e)
+                )
+                await self.progress.add_log(
+                    LogLevel.ERROR,
+                    f"Failed: {action['description']} - {str(e)}"
+                )
+                return False
+
+            finally:
+                reporter.cancel()
+                self.counters.pop(action["id"], None)
+
+    # ==================== Control ====================
+
+    async def pause(self):
+        """Hold the execution at its next safe points."""
+        self.io.pause()
+        await self.progress.set_status(ExecutionStatus.PAUSED)
+        await self.progress.add_log(LogLevel.WARNING, "Execution paused")
 
-    async def _execute_action(self, action: Dict[str, Any]):
-        """Execute a single action."""
+    async def unpause(self):
+        """Continue a paused execution."""
+        self.io.resume()
+        await self.progress.set_status(ExecutionStatus.RUNNING)
+        await self.progress.add_log(LogLevel.INFO, "Execution resumed")
+
+    async def cancel(self):
+        """Stop the execution at its next safe points.
+
+        Running copies and deletes stop within one chunk or batch; their
+        journals are flushed so a later resume continues from there.
+        """
+        self.io.cancel()
+        await self.progress.add_log(LogLevel.WARNING, "Cancelling execution...")
+
+    async def _log_impact_summary(self):
+        """Log dry-run totals across all actions."""
+        freed = sum(
+            i["bytes"] for i in self.impacts.values()
+            if i["operation"] in ("delete", "recycle", "prune")
+        )
+        relocated = sum(
+            i["bytes"] for i in self.impacts.values()
+            if i["operation"] in ("rename", "copy", "export_import")
+        )
+        problems = sum(1 for i in self.impacts.values() if i["warnings"])
+
+        await self.progress.add_log(
+            LogLevel.WARNING if problems else LogLevel.SUCCESS,
+            f"Dry run: would free {self._format_bytes(freed)} and relocate "
+            f"{self._format_bytes(relocated)}; {problems} actions with warnings"
+        )
+
+    async def _report_bytes(self, idx: int, counter: ByteCounter):
+        """Publish a step's byte counter at a fixed interval until cancelled."""
+        while True:
+            await asyncio.sleep(settings.progress_update_interval)
+            bytes_done, files_done = counter.snapshot()
+            # Unchanged totals are still published so throughput decays during stalls
+            if bytes_done or files_done:
+                await self.progress.update_step(
+                    idx,
+                    StepStatus.ACTIVE,
+                    bytes_processed=bytes_done,
+                    files_processed=files_done
+                )
+
+    async def _execute_action(self, action: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """Execute a single action.
+
+        Returns measured {"bytes", "files"} processed when the handler
+        performs real I/O, or None for simulated handlers.
+        """
         action_type = ActionType(action["type"])
 
         if action_type == ActionType.CLEANUP:
-            await self._execute_cleanup(action)
+            return await self._execute_cleanup(action)
         elif action_type == ActionType.MOVE:
-            await self._execute_move(action)
+            return await self._execute_move(action)
         elif action_type == ActionType.PRUNE:
-            await self._execute_prune(action)
+            return await self._execute_prune(action)
         elif action_type == ActionType.DELETE_TO_RECYCLE:
-            await self._execute_delete_recycle(action)
+            return await self._execute_delete_recycle(action)
         elif action_type == ActionType.EXPORT_IMPORT_WSL:
-            await self._execute_wsl_relocate(action)
+            return await self._execute_wsl_relocate(action)
+        elif action_type == ActionType.ARCHIVE:
+            return await self._execute_archive(action)
 
     async def _execute_cleanup(self, action: Dict[str, Any]):
-        """Execute cleanup operation."""
-        # Simulated cleanup - in production, implement actual cleanup
-        await asyncio.sleep(2)
-        await self.progress.add_log(
-            LogLevel.INFO,
-            f"Cleaned {self._format_bytes(action['size_bytes'])}"
+        """Execute cleanup operation by clearing the directory's contents."""
+        path = Path(action.get("source_path", ""))
+        if not path.exists():
+            await self.progress.add_log(
+                LogLevel.WARNING,
+                f"Nothing to clean: {path} does not exist"
+            )
+            return {"bytes": 0, "files": 0}
+
+        if settings.create_backups:
+            await self._backup_source(action, path)
+
+        counter = self.counters.get(action["id"])
+        engine = DeleteEngine(
+            workers=settings.delete_workers,
+            batch_files=settings.delete_batch_files,
+            on_progress=counter.add if counter else None,
+            io=self.io
         )
+        stats = await asyncio.to_thread(engine.clear, path)
+
+        message = f"Cleaned {self._format_bytes(stats['bytes'])} ({stats['files']} files)"
+        if stats["skipped"]:
+            message += f"; skipped {stats['skipped']} items in use"
+        await self.progress.add_log(LogLevel.INFO, message)
+
+        return {"bytes": stats["bytes"], "files": stats["files"]}
+
+    async def _expire_backups(self):
+        """Apply backup retention, keeping this execution's own snapshots."""
+        store = BackupStore.from_settings()
+        keep = [f"{self.execution_id}-{action['id']}" for action in self.plan["actions"]]
+        try:
+            removed = await asyncio.to_thread(
+                store.expire,
+                settings.backup_retention_days,
+                settings.backup_max_bytes,
+                keep
+            )
+        except (OSError, ValueError) as e:
+            await self.progress.add_log(LogLevel.WARNING, f"Backup retention failed: {e}")
+            return
+        if removed["snapshots"]:
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Expired {removed['snapshots']} old backups; freed {self._format_bytes(removed['bytes'])}"
+            )
+
+    async def _backup_source(self, action: Dict[str, Any], path: Path):
+        """Snapshot a path into the deduplicating backup store before it is removed.
+
+        Contents already in the store are only referenced, so repeated
+        backups of the same or overlapping folders cost only new bytes.
+        """
+        snapshot_id = f"{self.execution_id}-{action['id']}"
+        store = BackupStore.from_settings(io=self.io)
+        operation = {
+            "action_type": action["type"],
+            "source": str(path),
+            "snapshot": snapshot_id
+        }
+        op = await self._journal_intent(action, operation)
+
+        # A resumed cleanup must not replace the full snapshot with a partial tree
+        if not await asyncio.to_thread(store.has_snapshot, snapshot_id):
+            stats = await asyncio.to_thread(store.backup, path, snapshot_id)
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Backed up {stats['files']} files ({self._format_bytes(stats['bytes'])}) from {path}; "
+                f"{self._format_bytes(stats['new_bytes'])} new in the backup store"
+            )
+
+        # The cleanup deletes the source next
+        await self._record_rollback(action, op, operation, durable=True)
+
+    async def _journal_intent(self, action: Dict[str, Any], operation: Dict[str, Any]) -> Optional[int]:
+        """Durably journal an operation before it changes anything.
+
+        Returns:
+            Journal operation ID, or None without a journal (dry run)
+        """
+        if not self.rollback_journal:
+            return None
+        return await asyncio.to_thread(self.rollback_journal.intent, action["id"], operation)
+
+    async def _record_rollback(
+        self,
+        action: Dict[str, Any],
+        op: Optional[int],
+        operation: Dict[str, Any],
+        durable: bool = False
+    ):
+        """Keep a finished operation's rollback data and journal its completion.
+
+        Set durable when the caller deletes data next, so the completion
+        is on disk before anything is removed.
+        """
+        if op is not None:
+            await asyncio.to_thread(self.rollback_journal.done, op, operation, durable)
+        operation = {**operation, "action_id": action["id"]}
+        # A resumed action may finish an operation its earlier run already recorded
+        if operation not in self.rollback_data:
+            self.rollback_data.append(operation)
 
     async def _execute_move(self, action: Dict[str, Any]):
         """Execute move operation with symlink."""
         source = Path(action.get("source_path", ""))
         target = Path(action.get("target_path", ""))
 
-        if not source.exists():
-            raise FileNotFoundError(f"Source not found: {source}")
+        counter = self.counters.get(action["id"])
+        verifier = Verifier.from_settings(io=self.io) if settings.verify_hashes else None
+        engine = MoveEngine(
+            workers=settings.move_workers,
+            large_file_bytes=settings.move_large_file_bytes,
+            buffer_bytes=settings.move_buffer_bytes,
+            on_progress=counter.add if counter else None,
+            io=self.io,
+            verifier=verifier
+        )
+        # Loading replays the journal file; keep that off the event loop
+        journal = await asyncio.to_thread(self.checkpoints.journal, action["id"]) if self.checkpoints else None
+        if journal and journal.has_progress:
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Resuming move of {source}: {len(journal.files)} files already copied"
+            )
+        rollback = {
+            "action_type": "MOVE",
+            "source": str(source),
+            "target": str(target)
+        }
+        op = await self._journal_intent(action, rollback)
+        try:
+            stats = await asyncio.to_thread(engine.move, source, target, True, journal)
+        finally:
+            if verifier:
+                await asyncio.to_thread(verifier.close)
 
-        # Simulate move operation
-        await asyncio.sleep(3)
+        method = "renamed" if stats["renamed"] else "copied"
         await self.progress.add_log(
             LogLevel.INFO,
-            f"Moved {source} to {target} (symlink created)"
+            f"Moved {source} to {target} ({method} {stats['files']} files, "
+            f"{self._format_bytes(stats['bytes'])}; symlink created)"
         )
 
-        # Store rollback data
-        self.rollback_data.append({
-            "action_type": "MOVE",
+        # Store rollback data, with the manifest the restore is checked against
+        if stats["manifest"]:
+            path = manifest_path(self.execution_id, action["id"])
+            await asyncio.to_thread(save_manifest, stats["manifest"], path)
+            rollback["manifest"] = str(path)
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Verified {len(stats['manifest']['files'])} files at {target} by content hash"
+            )
+        await self._record_rollback(action, op, rollback)
+
+        return {"bytes": stats["bytes"], "files": stats["files"]}
+
+    async def _execute_archive(self, action: Dict[str, Any]):
+        """Archive a tree into a compressed tar, then remove the source.
+
+        The archive goes to the action's target_path directory, or to
+        backup_location. The source is removed only after the archive
+        has been read back and checked against its index, and is kept
+        if the action sets keep_source.
+        """
+        source = Path(action.get("source_path", ""))
+        counter = self.counters.get(action["id"])
+        engine = ArchiveEngine(
+            compression=settings.archive_compression,
+            level=settings.archive_compression_level,
+            workers=settings.archive_workers,
+            block_bytes=settings.archive_block_bytes,
+            on_progress=counter.add if counter else None,
+            io=self.io
+        )
+        directory = Path(action.get("target_path") or settings.backup_location)
+        # Named after the execution so a resumed run finds its own archive
+        archive_path = directory / engine.archive_name(source, self.execution_id[:8])
+
+        journal = await asyncio.to_thread(self.checkpoints.journal, action["id"]) if self.checkpoints else None
+        phases = journal.phases if journal else set()
+        rollback = {
+            "action_type": "ARCHIVE",
             "source": str(source),
-            "target": str(target)
-        })
+            "archive": str(archive_path)
+        }
+        if action.get("keep_source"):
+            rollback["keep_source"] = True
+        op = await self._journal_intent(action, rollback)
+
+        stats = {"bytes": 0, "files": 0}
+        if "archived" not in phases:
+            if archive_path.exists():
+                # Finished before a crash but not yet journaled
+                await asyncio.to_thread(archive_path.unlink)
+            stats = await asyncio.to_thread(engine.archive, source, archive_path)
+            await asyncio.to_thread(ArchiveEngine.verify, archive_path)
+            if journal:
+                await asyncio.to_thread(journal.record_phase, "archived")
+            ratio = stats["compressed_bytes"] / stats["bytes"] if stats["bytes"] else 1.0
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Archived {stats['files']} files ({self._format_bytes(stats['bytes'])}) to "
+                f"{archive_path} at {ratio:.0%} of original size"
+            )
+
+        # The source is removed next
+        await self._record_rollback(action, op, rollback, durable=True)
+
+        if not action.get("keep_source") and os.path.lexists(source):
+            if source.is_dir() and not source.is_symlink():
+                deleter = DeleteEngine(
+                    workers=settings.delete_workers,
+                    batch_files=settings.delete_batch_files,
+                    io=self.io
+                )
+                removed = await asyncio.to_thread(deleter.clear, source, True)
+                if removed["skipped"]:
+                    await self.progress.add_log(
+                        LogLevel.WARNING,
+                        f"Archived but kept {removed['skipped']} items in use at {source}"
+                    )
+            else:
+                await asyncio.to_thread(source.unlink)
+
+        return {"bytes": stats["bytes"], "files": stats["files"]}
 
     async def _execute_prune(self, action: Dict[str, Any]):
         """Execute prune operation (Docker, etc.)."""
@@ -161,8 +646,24 @@ class ExecutionEngine:
         source = action.get("source_path", "")
         target = action.get("target_path", "")
 
-        # Simulate WSL relocate
-        await asyncio.sleep(5)
+        # Checkpoint each phase so a restart does not export twice
+        journal = await asyncio.to_thread(self.checkpoints.journal, action["id"]) if self.checkpoints else None
+        phases = journal.phases if journal else set()
+
+        # Simulate WSL export
+        if "exported" not in phases:
+            await asyncio.sleep(3)
+            if journal:
+                await asyncio.to_thread(journal.record_phase, "exported")
+
+        # Safe point between phases
+        await self.io.check_async()
+
+        # Simulate WSL import
+        if "imported" not in phases:
+            await asyncio.sleep(2)
+            if journal:
+                await asyncio.to_thread(journal.record_phase, "imported")
         await self.progress.add_log(
             LogLevel.INFO,
             f"Relocated WSL distribution to {target}"
@@ -0,0 +1,216 @@
+"""Dry-run impact analysis of plan actions."""
+
+from typing import Dict, Any, Optional, Tuple
+from pathlib import Path
+import os
+import shutil
+import threading
+from app.config import settings
+from app.utils.helpers import format_bytes, is_link, is_link_stat
+
+
+# Operation each action type performs on its source
+OPERATIONS = {
+    "CLEANUP": "delete",
+    "DELETE_TO_RECYCLE": "recycle",
+    "PRUNE": "prune",
+    "EXPORT_IMPORT_WSL": "export_import",
+    "ARCHIVE": "archive"
+}
+
+
+def existing_ancestor(path: Path) -> Optional[Path]:
+    """Return path or its nearest ancestor that exists."""
+    for candidate in (path, *path.parents):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class ScanIndex:
+    """Per-directory file and byte totals from metadata-only scans.
+
+    Scanning a directory records the recursive totals of every directory
+    beneath it, so later lookups of the same tree or any folder inside it
+    (e.g. a PRUNE of data a MOVE already covered) are answered without
+    touching the disk again.
+    """
+
+    def __init__(self):
+        """Initialize empty index."""
+        self._totals: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        """Index key for a path."""
+        return os.path.normcase(os.path.abspath(path))
+
+    def summarize(self, path: Path) -> Tuple[int, int]:
+        """Return (files, bytes) under path, scanning only if not yet indexed."""
+        key = self._key(path)
+        with self._lock:
+            if key in self._totals:
+                return self._totals[key]
+
+        if not path.is_dir() or is_link(path):
+            return 1, path.stat(follow_symlinks=False).st_size
+
+        totals = self._scan(key)
+        with self._lock:
+            self._totals.update(totals)
+        return totals[key]
+
+    @staticmethod
+    def _scan(root: str) -> Dict[str, Tuple[int, int]]:
+        """Scan a tree and return recursive totals of each of its directories."""
+        own: Dict[str, Tuple[int, int]] = {}
+        children: Dict[str, list] = {}
+        order = []
+        stack = [root]
+
+        while stack:
+            directory = stack.pop()
+            order.append(directory)
+            files, size, subdirs = 0, 0, []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                            if entry.is_dir(follow_symlinks=False) and not is_link_stat(st):
+                                subdirs.append(entry.path)
+                            else:
+                                files += 1
+                                size += st.st_size
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            own[directory] = (files, size)
+            children[directory] = subdirs
+            stack.extend(subdirs)
+
+        # Children were visited after their parents, so fold totals up in reverse
+        totals: Dict[str, Tuple[int, int]] = {}
+        for directory in reversed(order):
+            files, size = own[directory]
+            for child in children[directory]:
+                child_files, child_size = totals[child]
+                files += child_files
+                size += child_size
+            totals[directory] = (files, size)
+        return totals
+
+
+class ImpactAnalyzer:
+    """Computes what each action would do without changing anything.
+
+    Source trees are measured through a shared ScanIndex, and free space
+    on target devices is reserved as copy actions are analyzed, so the
+    report flags a target that fits each move alone but not all of them.
+    """
+
+    def __init__(self, index: Optional[ScanIndex] = None):
+        """Initialize analyzer with an optional shared scan index."""
+        self.index = index or ScanIndex()
+        self._reserved: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        """Report the impact of one action.
+
+        Returns:
+            Dict with "operation", "files", "bytes", "estimated" (True if
+            sizes come from the plan, not a scan), "required_free_bytes",
+            "target_free_bytes", "fits" and "warnings"
+        """
+        source = Path(action["source_path"]) if action.get("source_path") else None
+        target = Path(action["target_path"]) if action.get("target_path") else None
+        impact = {
+            "action_id": action.get("id"),
+            "type": action["type"],
+            "operation": OPERATIONS.get(action["type"], "copy"),
+            "files": None,
+            "bytes": action.get("size_bytes", 0),
+            "estimated": True,
+            "required_free_bytes": 0,
+            "target_free_bytes": None,
+            "fits": True,
+            "warnings": []
+        }
+
+        if source is not None and action["type"] != "PRUNE":
+            if os.path.lexists(source):
+                impact["files"], impact["bytes"] = self.index.summarize(source)
+                impact["estimated"] = False
+            else:
+                impact["warnings"].append(f"Source not found: {source}")
+
+        if action["type"] == "MOVE" and target is not None:
+            self._analyze_target(impact, source, target)
+        elif action["type"] == "EXPORT_IMPORT_WSL" and target is not None:
+            # The export archive and the imported disk both land on the target
+            self._analyze_target(impact, None, target)
+        elif action["type"] == "ARCHIVE":
+            # Compressed size is unknown until written; reserve the worst case
+            self._analyze_target(impact, None, target or Path(settings.backup_location))
+
+        return impact
+
+    def _analyze_target(self, impact: Dict[str, Any], source: Optional[Path], target: Path):
+        """Fill in rename-vs-copy and target free space for a relocation."""
+        if target.exists() and (not target.is_dir() or any(target.iterdir())):
+            impact["warnings"].append(f"Target already exists: {target}")
+
+        ancestor = existing_ancestor(target)
+        if ancestor is None:
+            impact["warnings"].append(f"Target drive not available: {target}")
+            impact["fits"] = False
+            return
+
+        device = os.stat(ancestor).st_dev
+        if source is not None and not impact["estimated"] and os.stat(source).st_dev == device:
+            # Same filesystem: a rename needs no extra space
+            impact["operation"] = "rename"
+            return
+
+        required = impact["bytes"]
+        free = shutil.disk_usage(ancestor).free
+        with self._lock:
+            available = free - self._reserved.get(device, 0)
+            self._reserved[device] = self._reserved.get(device, 0) + required
+
+        impact["required_free_bytes"] = required
+        impact["target_free_bytes"] = max(available, 0)
+        if required > available:
+            impact["fits"] = False
+            impact["warnings"].append(
+                f"Needs {format_bytes(required)} on target but only {format_bytes(max(available, 0))} is free"
+            )
+
+
+def describe_impact(impact: Dict[str, Any]) -> str:
+    """One-line summary of an action's impact for the execution log."""
+    size = format_bytes(impact["bytes"])
+    if impact["estimated"]:
+        size = f"~{size}"
+    files = f"{impact['files']} files, " if impact["files"] is not None else ""
+    operation = impact["operation"]
+
+    if operation == "delete":
+        text = f"Would delete {files}{size}"
+    elif operation == "recycle":
+        text = f"Would move {files}{size} to the recycle bin"
+    elif operation == "prune":
+        text = f"Would prune {size}"
+    elif operation == "archive":
+        text = f"Would archive {files}{size}; needs up to {format_bytes(impact['required_free_bytes'])} in the backup location"
+    elif operation == "rename":
+        text = f"Would rename {files}{size} in place (same drive)"
+    else:
+        text = f"Would copy {files}{size}; needs {format_bytes(impact['required_free_bytes'])} free on target"
+
+    if impact["warnings"]:
+        text += " - " + "; ".join(impact["warnings"])
+    return text
@@ -0,0 +1,376 @@
+"""I/O throttling and priority control for running executions."""
+
+from typing import Dict, Any, Optional, Callable
+import asyncio
+import logging
+import sys
+import threading
+import time
+import psutil
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionCancelled(Exception):
+    """Raised at a safe point once an execution has been cancelled."""
+
+
+class TokenBucket:
+    """Thread-safe bytes-per-second rate limiter.
+
+    Callers reserve bytes up front and then wait off any debt, so a
+    chunk larger than the burst size still passes, just later. Waits are
+    sliced so a rate change applies within a fraction of a second.
+    """
+
+    def __init__(self, rate: float = 0, burst: Optional[float] = None):
+        """Initialize bucket.
+
+        Args:
+            rate: Bytes per second; 0 means unlimited
+            burst: Bytes that may pass at once after idling (default: 1s of rate)
+        """
+        self._lock = threading.Lock()
+        self.rate = 0.0
+        self.burst = 0.0
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None):
+        """Change the rate; 0 disables limiting."""
+        with self._lock:
+            self._refill()
+            self.rate = max(float(rate or 0), 0.0)
+            self.burst = float(burst) if burst else self.rate
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self):
+        """Add tokens for the time since the last refill; caller holds the lock."""
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self._tokens + (now - self._last) * self.rate, self.burst)
+        self._last = now
+
+    def consume(self, nbytes: int, check: Optional[Callable[[], None]] = None) -> bool:
+        """Take nbytes, blocking the calling thread until the rate allows it.
+
+        Args:
+            nbytes: Bytes about to be transferred
+            check: Called between wait slices; may raise to abort the wait
+
+        Returns:
+            True if the call had to wait for the rate
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return False
+            self._refill()
+            self._tokens -= nbytes
+
+        waited = False
+        while True:
+            with self._lock:
+                if self.rate <= 0:
+                    return waited
+                self._refill()
+                if self._tokens >= 0:
+                    return waited
+                wait = -self._tokens / self.rate
+            waited = True
+            time.sleep(min(wait, 0.1))
+            if check:
+                check()
+
+
+def set_thread_io_priority(low: bool) -> bool:
+    """Set the calling thread's I/O priority (Linux only).
+
+    Linux schedules I/O per thread, so this only affects copy and delete
+    workers, not the API server threads. Returns False where unsupported.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        process = psutil.Process(threading.get_native_id())
+        if low:
+            process.ionice(psutil.IOPRIO_CLASS_IDLE)
+        else:
+            process.ionice(psutil.IOPRIO_CLASS_BE, 4)
+        return True
+    except (psutil.Error, OSError, ValueError) as e:
+        logger.debug(f"Could not change I/O priority: {e}")
+        return False
+
+
+class IOController:
+    """Execution-wide I/O limits shared by all of an execution's workers.
+
+    Workers call ``throttle`` before every chunk they read or write, which
+    makes each chunk a safe point: a paused execution blocks there and a
+    cancelled one raises ExecutionCancelled, so I/O stops within one chunk.
+    The effective rate is the configured limit, lowered further by an
+    adaptive monitor that watches system disk latency: when the average
+    time per disk operation exceeds the target, the rate is halved
+    (never below a floor), and it ramps back up while latency stays low.
+    Disk latency is system-wide and includes the execution's own I/O, so
+    it only counts as contention while other processes are also moving
+    data: disk bytes not attributed to this process must exceed a floor,
+    otherwise a busy copy would back itself off.
+    """
+
+    def __init__(
+        self,
+        rate_bytes_per_second: int = 0,
+        low_priority: bool = False,
+        adaptive: bool = False,
+        latency_target_ms: float = 50.0,
+        min_rate_bytes_per_second: int = 4 * 1024 * 1024,
+        foreground_min_bytes_per_second: int = 256 * 1024
+    ):
+        """Initialize controller.
+
+        Args:
+            rate_bytes_per_second: Configured limit; 0 means unlimited
+            low_priority: Run workers at idle I/O priority
+            adaptive: Back off when disk latency rises
+            latency_target_ms: Average disk latency considered healthy
+            min_rate_bytes_per_second: Floor for adaptive backoff
+            foreground_min_bytes_per_second: Disk traffic from other processes
+                below which latency is treated as self-inflicted
+        """
+        self.rate_bytes_per_second = rate_bytes_per_second
+        self.low_priority = low_priority
+        self.adaptive = adaptive
+        self.latency_target_ms = latency_target_ms
+        self.min_rate_bytes_per_second = min_rate_bytes_per_second
+        self.foreground_min_bytes_per_second = foreground_min_bytes_per_second
+
+        self.bucket = TokenBucket(rate_bytes_per_second)
+        self.effective_rate = rate_bytes_per_second
+        self.latency_ms: Optional[float] = None
+        self.foreground_bps: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._bytes = 0
+        # Chunks that waited for rate budget, and time spent paused, so
+        # measured action durations can leave out time held back on purpose
+        self.throttle_waits = 0
+        self._paused_total = 0.0
+        self._paused_at: Optional[float] = None
+        self._priority_generation = 0
+        self._local = threading.local()
+
+        # Set while running; cleared while paused
+        self._running = threading.Event()
+        self._running.set()
+        self.cancelled = False
+
+    @classmethod
+    def from_settings(cls) -> "IOController":
+        """Create a controller from the configured defaults."""
+        return cls(
+            rate_bytes_per_second=settings.io_rate_limit_bytes_per_second,
+            low_priority=settings.io_low_priority,
+            adaptive=settings.io_adaptive,
+            latency_target_ms=settings.io_latency_target_ms,
+            min_rate_bytes_per_second=settings.io_min_rate_bytes_per_second,
+            foreground_min_bytes_per_second=settings.io_foreground_min_bytes_per_second
+        )
+
+    # ==================== Worker side ====================
+
+    def enter_thread(self):
+        """Thread pool initializer: mark the thread as a managed worker."""
+        self._local.managed = True
+        self._local.generation = None
+
+    def check(self):
+        """Safe point: block while paused, raise once cancelled."""
+        if not self._running.is_set():
+            self._running.wait()
+        if self.cancelled:
+            raise ExecutionCancelled()
+
+    async def check_async(self):
+        """Safe point for coroutines: wait while paused, raise once cancelled."""
+        while not self._running.is_set():
+            await asyncio.sleep(0.1)
+        if self.cancelled:
+            raise ExecutionCancelled()
+
+    def throttle(self, nbytes: int = 0):
+        """Apply priority changes and wait for rate budget before an I/O chunk."""
+        self.check()
+        if getattr(self._local, "managed", False) and self._local.generation != self._priority_generation:
+            self._local.generation = self._priority_generation
+            set_thread_io_priority(self.low_priority)
+
+        if nbytes:
+            with self._lock:
+                self._bytes += nbytes
+            if self.bucket.consume(nbytes, self.check):
+                with self._lock:
+                    self.throttle_waits += 1
+
+    # ==================== Control side ====================
+
+    @property
+    def paused(self) -> bool:
+        """Whether workers are held at their next safe point."""
+        return not self._running.is_set()
+
+    @property
+    def paused_seconds(self) -> float:
+        """Total time spent paused, including a pause still in progress."""
+        with self._lock:
+            total = self._paused_total
+            if self._paused_at is not None:
+                total += time.monotonic() - self._paused_at
+            return total
+
+    def pause(self):
+        """Hold all workers at their next safe point."""
+        with self._lock:
+            if self._paused_at is None:
+                self._paused_at = time.monotonic()
+        self._running.clear()
+
+    def resume(self):
+        """Release paused workers."""
+        with self._lock:
+            if self._paused_at is not None:
+                self._paused_total += time.monotonic() - self._paused_at
+                self._paused_at = None
+        self._running.set()
+
+    def cancel(self):
+        """Make every worker stop at its next safe point."""
+        self.cancelled = True
+        # Wake paused workers so they can stop
+        self._running.set()
+
+    def configure(
+        self,
+        rate_bytes_per_second: Optional[int] = None,
+        low_priority: Optional[bool] = None,
+        adaptive: Optional[bool] = None
+    ):
+        """Change limits while the execution runs."""
+        with self._lock:
+            if rate_bytes_per_second is not None:
+                self.rate_bytes_per_second = rate_bytes_per_second
+                self.effective_rate = rate_bytes_per_second
+                self.bucket.set_rate(rate_bytes_per_second)
+            if low_priority is not None and low_priority != self.low_priority:
+                self.low_priority = low_priority
+                # Workers re-apply their priority on their next chunk
+                self._priority_generation += 1
+            if adaptive is not None:
+                self.adaptive = adaptive
+                if not adaptive:
+                    self.effective_rate = self.rate_bytes_per_second
+                    self.bucket.set_rate(self.rate_bytes_per_second)
+
+    def status(self) -> Dict[str, Any]:
+        """Current limits and measurements."""
+        return {
+            "rate_bytes_per_second": self.rate_bytes_per_second,
+            "effective_rate_bytes_per_second": self.effective_rate,
+            "low_priority": self.low_priority,
+            "adaptive": self.adaptive,
+            "latency_ms": self.latency_ms,
+            "foreground_bytes_per_second": self.foreground_bps
+        }
+
+    # ==================== Adaptive backoff ====================
+
+    @staticmethod
+    def _disk_counters():
+        """System-wide disk counters, or None where unavailable."""
+        try:
+            return psutil.disk_io_counters()
+        except (RuntimeError, OSError):
+            return None
+
+    @staticmethod
+    def _own_disk_bytes() -> Optional[int]:
+        """Bytes this process has read from and written to storage, or None where unavailable."""
+        try:
+            counters = psutil.Process().io_counters()
+        except (AttributeError, psutil.Error, OSError):
+            return None
+        return counters.read_bytes + counters.write_bytes
+
+    def adjust(self, latency_ms: float, observed_bps: float, foreground_bps: Optional[float] = None):
+        """Apply one AIMD step from a latency sample.
+
+        Args:
+            latency_ms: Average disk time per operation over the interval
+            observed_bps: Bytes per second this execution moved meanwhile
+            foreground_bps: Disk bytes per second from other processes;
+                None if unknown, which treats any high latency as contention
+        """
+        with self._lock:
+            self.latency_ms = latency_ms
+            self.foreground_bps = foreground_bps
+            if not self.adaptive:
+                return
+            configured = self.rate_bytes_per_second
+            current = self.effective_rate or observed_bps
+            contended = foreground_bps is None or foreground_bps >= self.foreground_min_bytes_per_second
+
+            if contended and latency_ms > self.latency_target_ms and current > 0:
+                new_rate = max(current / 2, self.min_rate_bytes_per_second)
+                if configured:
+                    new_rate = min(new_rate, configured)
+            elif self.effective_rate:
+                new_rate = self.effective_rate * 1.25
+                if configured and new_rate >= configured:
+                    new_rate = configured
+                elif not configured and observed_bps and new_rate > observed_bps * 4:
+                    # Far above what we actually move: lift the limit again
+                    new_rate = 0
+            else:
+                return
+
+            self.effective_rate = int(new_rate)
+            self.bucket.set_rate(self.effective_rate)
+
+    async def monitor(self, interval: Optional[float] = None):
+        """Sample disk latency and adjust the rate until cancelled."""
+        interval = interval or settings.io_monitor_interval
+        previous = self._disk_counters()
+        if previous is None:
+            return
+        last_bytes = self._bytes
+        last_own = self._own_disk_bytes()
+
+        while True:
+            await asyncio.sleep(interval)
+            current = self._disk_counters()
+            if current is None:
+                return
+
+            ops = (current.read_count - previous.read_count) + (current.write_count - previous.write_count)
+            busy = (current.read_time - previous.read_time) + (current.write_time - previous.write_time)
+            disk_bytes = (current.read_bytes - previous.read_bytes) + (current.write_bytes - previous.write_bytes)
+            with self._lock:
+                moved = self._bytes - last_bytes
+                last_bytes = self._bytes
+            previous = current
+
+            # Subtract this process's own storage traffic; without process
+            # counters, fall back to the bytes the workers reported
+            own = self._own_disk_bytes()
+            if own is not None and last_own is not None:
+                own_moved = own - last_own
+            else:
+                own_moved = moved
+            last_own = own
+            foreground = max(disk_bytes - own_moved, 0)
+
+            if ops > 0:
+                self.adjust(busy / ops, moved / interval, foreground / interval)
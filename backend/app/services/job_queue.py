@@ -0,0 +1,455 @@
+"""Persistent execution queue and scheduler backed by SQLite."""
+
+from typing import Dict, Any, List, Optional, Set
+from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import json
+import logging
+import uuid
+import aiosqlite
+from app.config import settings
+from app.models import ExecutionStatus
+from app.services.action_graph import action_drives
+from app.services.analyzer import DriveAnalyzer
+from app.services.executor import ExecutionEngine, get_active_execution
+from app.services.planner import PlanGenerator
+from app.services.progress import ProgressManager, create_progress_manager, get_progress_manager
+
+
+logger = logging.getLogger(__name__)
+
+# Job states; finished jobs keep the execution's final status
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+FINISHED_STATES = {
+    ExecutionStatus.COMPLETED.value,
+    ExecutionStatus.FAILED.value,
+    ExecutionStatus.CANCELLED.value
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    plan_id TEXT NOT NULL,
+    plan_json TEXT NOT NULL,
+    drives TEXT NOT NULL,
+    dry_run INTEGER NOT NULL DEFAULT 0,
+    resume INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    schedule_id TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE TABLE IF NOT EXISTS schedules (
+    id TEXT PRIMARY KEY,
+    plan_id TEXT NOT NULL,
+    time_of_day TEXT NOT NULL,
+    dry_run INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 0,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    next_run_at TEXT NOT NULL,
+    last_run_at TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def sqlite_path(database_url: str) -> Path:
+    """Return the file path of a sqlite:/// database URL."""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite:/// database URLs are supported: {database_url}")
+    return Path(database_url[len(prefix):])
+
+
+def plan_drives(plan: Dict[str, Any]) -> Set[str]:
+    """Return every drive a plan's actions touch."""
+    drives: Set[str] = set()
+    for action in plan.get("actions", []):
+        drives |= action_drives(action)
+    return drives
+
+
+def next_daily_run(time_of_day: str, after: datetime) -> datetime:
+    """Return the first local time_of_day ("HH:MM") strictly after a moment."""
+    hour, minute = (int(part) for part in time_of_day.split(":"))
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class JobQueue:
+    """Queues executions in SQLite and runs them under concurrency limits.
+
+    Queued jobs start in priority order (then oldest first) while fewer
+    than ``max_concurrent`` are running and none of the running jobs
+    touches the same drives. A job blocked by a drive also holds back
+    lower-priority jobs on that drive, so it is not starved. Jobs that
+    were running when the process stopped are queued again on startup
+    and resume from their checkpoints. Daily schedules enqueue a freshly
+    generated plan at a fixed local time.
+    """
+
+    def __init__(self, db_path: Path, max_concurrent: int = 2, ai_clients=None):
+        """Initialize queue.
+
+        Args:
+            db_path: SQLite database file
+            max_concurrent: Executions allowed to run at once
+            ai_clients: Optional AI client pool for scheduled plan generation
+        """
+        self.db_path = Path(db_path)
+        self.max_concurrent = max_concurrent
+        self.ai_clients = ai_clients
+        self._db: Optional[aiosqlite.Connection] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_drives: Dict[str, Set[str]] = {}
+        self._wakeup = asyncio.Event()
+        self._dispatch_lock = asyncio.Lock()
+        # Orders on-demand progress registration against cancellation of queued jobs
+        self._progress_lock = asyncio.Lock()
+
+    # ==================== Lifecycle ====================
+
+    async def open(self):
+        """Open the database and requeue jobs interrupted by a restart."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.db_path)
+        self._db.row_factory = aiosqlite.Row
+        await self._db.executescript(SCHEMA)
+        # Dry runs have no checkpoint and simply start over
+        await self._db.execute(
+            "UPDATE jobs SET status = ?, resume = 1 - dry_run, started_at = NULL WHERE status = ?",
+            (JOB_QUEUED, JOB_RUNNING)
+        )
+        await self._db.commit()
+
+    async def close(self):
+        """Cancel running executions and close the database."""
+        for job_id in list(self._running):
+            engine = get_active_execution(job_id)
+            if engine:
+                await engine.cancel()
+        if self._running:
+            await asyncio.wait(list(self._running.values()), timeout=10)
+        if self._db:
+            await self._db.close()
+            self._db = None
+
+    async def run(self):
+        """Fire due schedules and dispatch queued jobs until cancelled."""
+        while True:
+            try:
+                await self.fire_due_schedules()
+                await self.dispatch()
+            except Exception as e:
+                logger.error(f"Job queue iteration failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.scheduler_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    # ==================== Jobs ====================
+
+    @staticmethod
+    def _job(row: aiosqlite.Row) -> Dict[str, Any]:
+        """Convert a jobs row to an API dict."""
+        job = dict(row)
+        plan = json.loads(job.pop("plan_json"))
+        job["plan_name"] = plan.get("name")
+        job["drives"] = job["drives"].split(",") if job["drives"] else []
+        job["dry_run"] = bool(job["dry_run"])
+        job["resume"] = bool(job["resume"])
+        return job
+
+    async def enqueue(
+        self,
+        plan: Dict[str, Any],
+        dry_run: bool = False,
+        priority: int = 0,
+        execution_id: Optional[str] = None,
+        resume: bool = False,
+        schedule_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Queue a plan for execution.
+
+        Args:
+            plan: Plan to execute
+            dry_run: Report without making changes
+            priority: Higher runs first
+            execution_id: Reuse an execution ID (to resume it); new if omitted
+            resume: Continue from the execution's checkpoint
+            schedule_id: Schedule that created the job
+
+        Returns:
+            The queued job
+        """
+        job_id = execution_id or str(uuid.uuid4())
+        if job_id in self._running:
+            raise ValueError(f"Execution '{job_id}' is already running")
+
+        await self._db.execute(
+            """
+            INSERT OR REPLACE INTO jobs
+                (id, plan_id, plan_json, drives, dry_run, resume, priority, status, schedule_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job_id, plan["id"], json.dumps(plan), ",".join(sorted(plan_drives(plan))),
+                int(dry_run), int(resume), priority, JOB_QUEUED, schedule_id,
+                datetime.now().isoformat()
+            )
+        )
+        await self._db.commit()
+        self._wakeup.set()
+        return await self.get_job(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID."""
+        async with self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)) as cursor:
+            row = await cursor.fetchone()
+        return self._job(row) if row else None
+
+    async def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """List jobs, queued ones in run order first, then the most recent others."""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += """
+            ORDER BY CASE status WHEN 'running' THEN 0 WHEN 'queued' THEN 1 ELSE 2 END,
+                     CASE WHEN status = 'queued' THEN -priority ELSE 0 END,
+                     CASE WHEN status = 'queued' THEN created_at END,
+                     created_at DESC
+            LIMIT ?
+        """
+        async with self._db.execute(query, params + (limit,)) as cursor:
+            rows = await cursor.fetchall()
+        return [self._job(row) for row in rows]
+
+    async def cancel_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued job, or ask a running one to stop."""
+        job = await self.get_job(job_id)
+        if not job:
+            return None
+
+        if job["status"] == JOB_QUEUED:
+            async with self._progress_lock:
+                await self._set_status(job_id, ExecutionStatus.CANCELLED.value, finished=True)
+                # Release subscribers and let the registry evict the manager
+                manager = get_progress_manager(job_id)
+                if manager:
+                    await manager.set_status(ExecutionStatus.CANCELLED)
+        elif job["status"] == JOB_RUNNING:
+            engine = get_active_execution(job_id)
+            if engine:
+                await engine.cancel()
+        return await self.get_job(job_id)
+
+    async def progress_manager(self, job_id: str) -> Optional[ProgressManager]:
+        """Progress manager of a job, registered on demand while it is queued.
+
+        Queued jobs get a manager only once a client subscribes, so live
+        managers follow subscribers and running jobs, not queue length.
+
+        Returns:
+            The manager, or None if the job is unknown and not tracked
+        """
+        async with self._progress_lock:
+            manager = get_progress_manager(job_id)
+            if manager is None:
+                job = await self.get_job(job_id)
+                if job and job["status"] == JOB_QUEUED:
+                    manager = create_progress_manager(job_id)
+            return manager
+
+    async def _set_status(
+        self,
+        job_id: str,
+        status: str,
+        started: bool = False,
+        finished: bool = False,
+        error: Optional[str] = None
+    ):
+        """Update a job's status and timestamps."""
+        now = datetime.now().isoformat()
+        await self._db.execute(
+            """
+            UPDATE jobs SET status = ?, error = ?,
+                started_at = CASE WHEN ? THEN ? ELSE started_at END,
+                finished_at = CASE WHEN ? THEN ? ELSE finished_at END
+            WHERE id = ?
+            """,
+            (status, error, started, now, finished, now, job_id)
+        )
+        await self._db.commit()
+
+    # ==================== Dispatch ====================
+
+    async def dispatch(self) -> List[str]:
+        """Start every queued job the limits allow.
+
+        Returns:
+            IDs of the jobs started
+        """
+        async with self._dispatch_lock:
+            busy = set().union(*self._running_drives.values()) if self._running_drives else set()
+            blocked: Set[str] = set()
+            started = []
+
+            async with self._db.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at",
+                (JOB_QUEUED,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            for row in rows:
+                if len(self._running) >= self.max_concurrent:
+                    break
+                drives = set(row["drives"].split(",")) if row["drives"] else set()
+                if drives & (busy | blocked):
+                    # Hold lower-priority work on these drives until this job runs
+                    blocked |= drives
+                    continue
+
+                busy |= drives
+                await self._start(row, drives)
+                started.append(row["id"])
+
+            return started
+
+    async def _start(self, row: aiosqlite.Row, drives: Set[str]):
+        """Mark a job running and launch its execution."""
+        job_id = row["id"]
+        await self._set_status(job_id, JOB_RUNNING, started=True)
+        engine = ExecutionEngine(
+            job_id,
+            json.loads(row["plan_json"]),
+            dry_run=bool(row["dry_run"]),
+            resume=bool(row["resume"])
+        )
+        self._running_drives[job_id] = drives
+        self._running[job_id] = asyncio.create_task(self._run_job(job_id, engine))
+
+    async def _run_job(self, job_id: str, engine: ExecutionEngine):
+        """Run an execution and record how it finished."""
+        error = None
+        try:
+            await engine.execute()
+            status = (await engine.progress.get_progress())["status"]
+        except Exception as e:
+            status, error = ExecutionStatus.FAILED.value, str(e)
+
+        if status not in FINISHED_STATES:
+            status = ExecutionStatus.FAILED.value
+        try:
+            await self._set_status(job_id, status, finished=True, error=error)
+        finally:
+            self._running.pop(job_id, None)
+            self._running_drives.pop(job_id, None)
+            self._wakeup.set()
+
+    # ==================== Schedules ====================
+
+    async def add_schedule(
+        self,
+        plan_id: str,
+        time_of_day: str,
+        dry_run: bool = False,
+        priority: int = 0
+    ) -> Dict[str, Any]:
+        """Run a plan daily at a local time ("HH:MM")."""
+        schedule_id = str(uuid.uuid4())
+        now = datetime.now()
+        await self._db.execute(
+            """
+            INSERT INTO schedules (id, plan_id, time_of_day, dry_run, priority, next_run_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                schedule_id, plan_id, time_of_day, int(dry_run), priority,
+                next_daily_run(time_of_day, now).isoformat(), now.isoformat()
+            )
+        )
+        await self._db.commit()
+        return await self.get_schedule(schedule_id)
+
+    async def get_schedule(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Get a schedule by ID."""
+        async with self._db.execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,)) as cursor:
+            row = await cursor.fetchone()
+        return self._schedule(row) if row else None
+
+    async def list_schedules(self) -> List[Dict[str, Any]]:
+        """List schedules by next run time."""
+        async with self._db.execute("SELECT * FROM schedules ORDER BY next_run_at") as cursor:
+            rows = await cursor.fetchall()
+        return [self._schedule(row) for row in rows]
+
+    async def delete_schedule(self, schedule_id: str) -> bool:
+        """Delete a schedule. Returns False if it did not exist."""
+        cursor = await self._db.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+        await self._db.commit()
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _schedule(row: aiosqlite.Row) -> Dict[str, Any]:
+        """Convert a schedules row to an API dict."""
+        schedule = dict(row)
+        schedule["dry_run"] = bool(schedule["dry_run"])
+        schedule["enabled"] = bool(schedule["enabled"])
+        return schedule
+
+    async def _generate_plans(self) -> List[Dict[str, Any]]:
+        """Generate fresh plans from a new analysis."""
+        analysis_result = await DriveAnalyzer().analyze()
+        return await PlanGenerator(settings, ai_clients=self.ai_clients).generate_plans(analysis_result)
+
+    async def fire_due_schedules(self, now: Optional[datetime] = None) -> List[str]:
+        """Enqueue the plans of schedules whose time has come.
+
+        Plans are regenerated at fire time so the job acts on current
+        drive contents. A run missed while the backend was down fires
+        once, not once per missed day.
+
+        Returns:
+            IDs of the jobs queued
+        """
+        now = now or datetime.now()
+        async with self._db.execute(
+            "SELECT * FROM schedules WHERE enabled = 1 AND next_run_at <= ?",
+            (now.isoformat(),)
+        ) as cursor:
+            due = await cursor.fetchall()
+        if not due:
+            return []
+
+        plans = await self._generate_plans()
+        queued = []
+        for schedule in due:
+            plan = next((p for p in plans if p["id"] == schedule["plan_id"]), None)
+            if plan:
+                job = await self.enqueue(
+                    plan,
+                    dry_run=bool(schedule["dry_run"]),
+                    priority=schedule["priority"],
+                    schedule_id=schedule["id"]
+                )
+                queued.append(job["id"])
+            else:
+                logger.warning(f"Scheduled plan '{schedule['plan_id']}' was not generated; skipping")
+
+            await self._db.execute(
+                "UPDATE schedules SET next_run_at = ?, last_run_at = ? WHERE id = ?",
+                (next_daily_run(schedule["time_of_day"], now).isoformat(), now.isoformat(), schedule["id"])
+            )
+        await self._db.commit()
+        return queued
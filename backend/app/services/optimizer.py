@@ -0,0 +1,422 @@
+"""Goal-driven plan optimization over candidate cleanup actions."""
+
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import math
+import numpy as np
+from app.models import PlanGoal
+from app.config import Settings
+from app.services.throughput import ThroughputModel
+from app.utils.helpers import format_bytes, get_drive_letter
+
+
+# Relative risk score per candidate kind (higher is riskier)
+CLEANUP_RISK = 1
+PRUNE_RISK = 2
+MOVE_RISK = 3
+WSL_RISK = 4
+
+# Fraction of Docker data a prune is expected to reclaim
+DOCKER_PRUNE_RATIO = 0.3
+
+
+class PlanOptimizer:
+    """Selects the cheapest set of actions that reaches a free-space goal.
+
+    Candidate actions are grouped per space consumer; each group offers
+    mutually exclusive alternatives (e.g. prune Docker *or* move it), so
+    the same bytes are never counted twice. Selection is a multiple-choice
+    min-cost cover solved by dynamic programming over bytes discretized
+    into ``resolution`` buckets, which keeps each solve O(candidates x
+    resolution) and fast for hundreds of candidates. The resolution grows
+    (up to ``max_resolution``) until the smallest candidate spans a few
+    buckets, so small candidates are not rounded away; if no selection
+    is found anyway, a greedy cover is returned. Costs blend risk and
+    estimated time; sweeping the blend weight yields the Pareto front.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        throughput: Optional[ThroughputModel] = None,
+        resolution: int = 512,
+        weight_steps: int = 9,
+        max_resolution: int = 8192
+    ):
+        """Initialize optimizer.
+
+        Args:
+            settings: Application settings
+            throughput: Model used to estimate candidate durations
+            resolution: Minimum number of byte buckets used by the solver
+            weight_steps: Number of risk/time blends explored for the Pareto front
+            max_resolution: Upper bound on byte buckets for small candidates
+        """
+        self.settings = settings
+        self.throughput = throughput
+        self.resolution = resolution
+        self.weight_steps = weight_steps
+        self.max_resolution = max_resolution
+
+    def optimize(
+        self,
+        analysis_result: Dict[str, Any],
+        goal: PlanGoal,
+        targets: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate Pareto-optimal plans (risk vs. time) that meet the goal.
+
+        Args:
+            analysis_result: Drive analysis
+            goal: Free-space goal
+            targets: Target drive per consumer path from placement;
+                unlisted consumers go to the default target drive
+        """
+        need = self._bytes_needed(analysis_result, goal)
+        goal_text = self._describe_goal(goal)
+
+        if need <= 0:
+            return [self._build_plan(
+                "goal_met", "Goal Already Met", [], goal,
+                rationale=f"{goal.drive}: already satisfies the goal ({goal_text}). No actions needed.",
+                recommended=True
+            )]
+
+        groups = self._build_candidates(
+            analysis_result.get("top_consumers", []), goal.drive, targets or {}
+        )
+        if not groups:
+            raise ValueError(f"No candidate actions found for {goal.drive}:")
+
+        reachable = sum(max(c["size_bytes"] for c in options) for options in groups)
+        if reachable < need:
+            selection = [(g, max(range(len(options)), key=lambda k: options[k]["size_bytes"]))
+                         for g, options in enumerate(groups)]
+            actions = [groups[g][k] for g, k in selection]
+            return [self._build_plan(
+                "goal_best_effort", "Best Effort", actions, goal,
+                rationale=(
+                    f"The goal ({goal_text}) needs {format_bytes(need)} but only "
+                    f"{format_bytes(reachable)} can be reclaimed. This plan frees as much as possible."
+                ),
+                recommended=True
+            )]
+
+        total_risk = sum(max(c["risk"] for c in options) for options in groups)
+        total_seconds = sum(max(c["estimated_seconds"] for c in options) for options in groups) or 1
+
+        # Fine enough that the smallest candidate covers at least four buckets
+        smallest = min(c["size_bytes"] for options in groups for c in options if c["size_bytes"] > 0)
+        resolution = min(max(self.resolution, math.ceil(4 * need / smallest)), self.max_resolution)
+
+        # Solve once per risk/time blend and keep distinct selections
+        solutions: Dict[frozenset, Tuple[int, int]] = {}
+        for weight in np.linspace(0.0, 1.0, self.weight_steps):
+            selection = self._solve(groups, need, float(weight), total_risk, total_seconds, resolution)
+            if selection is None:
+                continue
+            key = frozenset(selection)
+            if key not in solutions:
+                risk = sum(groups[g][k]["risk"] for g, k in selection)
+                seconds = sum(groups[g][k]["estimated_seconds"] for g, k in selection)
+                solutions[key] = (risk, seconds)
+
+        # Keep only non-dominated selections, lowest risk first
+        front = [
+            (key, cost) for key, cost in solutions.items()
+            if not any(
+                other[0] <= cost[0] and other[1] <= cost[1] and other != cost
+                for other in solutions.values()
+            )
+        ]
+        front.sort(key=lambda item: (item[1][0], item[1][1]))
+
+        if not front:
+            # Candidates too small for the byte buckets even at max_resolution
+            actions = self._greedy(groups, need)
+            return [self._build_plan(
+                "goal_best_effort", "Best Effort", actions, goal,
+                rationale=(
+                    f"Reaches the goal ({goal_text}) with {len(actions)} actions, "
+                    f"lowest risk per byte first."
+                ),
+                recommended=True
+            )]
+
+        # Recommend the selection with the best even blend of risk and time
+        recommended_idx = min(
+            range(len(front)),
+            key=lambda i: front[i][1][0] / max(total_risk, 1) + front[i][1][1] / total_seconds
+        )
+
+        plans = []
+        for idx, (key, (risk, seconds)) in enumerate(front):
+            if len(front) == 1:
+                plan_id, name = "goal_optimal", "Optimal"
+            elif idx == 0:
+                plan_id, name = "goal_lowest_risk", "Lowest Risk"
+            elif idx == len(front) - 1:
+                plan_id, name = "goal_fastest", "Fastest"
+            else:
+                plan_id, name = f"goal_tradeoff_{idx}", f"Trade-off {idx}"
+
+            actions = [groups[g][k] for g, k in sorted(key)]
+            plans.append(self._build_plan(
+                plan_id, name, actions, goal,
+                rationale=(
+                    f"Reaches the goal ({goal_text}) with risk score {risk} "
+                    f"and about {seconds // 60} minutes of work."
+                ),
+                recommended=idx == recommended_idx
+            ))
+
+        return plans
+
+    def _bytes_needed(self, analysis_result: Dict[str, Any], goal: PlanGoal) -> int:
+        """Compute how many bytes must be reclaimed on the goal drive."""
+        if goal.reclaim_bytes is None and goal.max_percent_used is None:
+            raise ValueError("Goal must set reclaim_bytes or max_percent_used")
+
+        need = goal.reclaim_bytes or 0
+
+        if goal.max_percent_used is not None:
+            drive = next(
+                (d for d in analysis_result.get("drives", []) if d["letter"] == goal.drive),
+                None
+            )
+            if not drive:
+                raise ValueError(f"Drive {goal.drive}: not found")
+            allowed_used = drive["total_bytes"] * goal.max_percent_used / 100
+            need = max(need, math.ceil(drive["used_bytes"] - allowed_used))
+
+        return need
+
+    @staticmethod
+    def _describe_goal(goal: PlanGoal) -> str:
+        """Describe a goal in words."""
+        parts = []
+        if goal.reclaim_bytes is not None:
+            parts.append(f"free {format_bytes(goal.reclaim_bytes)} on {goal.drive}:")
+        if goal.max_percent_used is not None:
+            parts.append(f"bring {goal.drive}: under {goal.max_percent_used:g}%")
+        return " and ".join(parts)
+
+    def _build_candidates(
+        self,
+        consumers: List[Dict[str, Any]],
+        drive: str,
+        targets: Dict[str, str]
+    ) -> List[List[Dict[str, Any]]]:
+        """Build mutually exclusive candidate actions for each consumer on the drive."""
+        groups = []
+
+        for consumer in consumers:
+            target = targets.get(consumer["path"], self.settings.default_target_drive)
+            consumer_drive = get_drive_letter(consumer["path"])
+            if consumer_drive and consumer_drive != drive:
+                continue
+            if consumer["size_bytes"] <= 0:
+                continue
+
+            ctype = consumer["type"]
+            size = consumer["size_bytes"]
+            options = []
+
+            if ctype == "cache":
+                options.append({
+                    "type": "CLEANUP",
+                    "description": f"Clear {consumer['name']}",
+                    "source_path": consumer["path"],
+                    "size_bytes": size,
+                    "safety_explanation": "Browsers will rebuild cache automatically",
+                    "rollback_option": "Not needed (cache data)",
+                    "file_count": consumer.get("file_count"),
+                    "estimated_seconds": 120,
+                    "risk": CLEANUP_RISK
+                })
+            elif ctype == "temp":
+                options.append({
+                    "type": "CLEANUP",
+                    "description": f"Clear Temporary Files: {consumer['name']}",
+                    "source_path": consumer["path"],
+                    "size_bytes": size,
+                    "safety_explanation": "Safe to delete temporary files",
+                    "rollback_option": "Not needed (temporary data)",
+                    "file_count": consumer.get("file_count"),
+                    "estimated_seconds": 180,
+                    "risk": CLEANUP_RISK
+                })
+            elif ctype == "docker":
+                options.append({
+                    "type": "PRUNE",
+                    "description": "Clean Docker unused images and containers",
+                    "source_path": consumer["path"],
+                    "command": "docker system prune -af --volumes",
+                    "size_bytes": int(size * DOCKER_PRUNE_RATIO),
+                    "safety_explanation": "Only removes unused Docker resources",
+                    "rollback_option": "Images can be re-downloaded",
+                    "estimated_seconds": 300,
+                    "risk": PRUNE_RISK
+                })
+                options.append({
+                    "type": "MOVE",
+                    "description": "Move Docker Desktop data",
+                    "source_path": consumer["path"],
+                    "target_path": f"{target}\\Docker",
+                    "size_bytes": size,
+                    "safety_explanation": "Symlink maintains compatibility; Docker will function normally",
+                    "rollback_option": "Reverse move and restore symlink",
+                    "estimated_seconds": 600,
+                    "risk": MOVE_RISK
+                })
+            elif ctype == "wsl":
+                distro_name = consumer["name"].replace("WSL - ", "")
+                options.append({
+                    "type": "EXPORT_IMPORT_WSL",
+                    "description": f"Relocate WSL: {distro_name}",
+                    "source_path": consumer["path"],
+                    "target_path": f"{target}\\WSL\\{distro_name}",
+                    "size_bytes": size,
+                    "safety_explanation": "WSL export/import preserves all data",
+                    "rollback_option": "Re-import from backup tar",
+                    "estimated_seconds": 900,
+                    "risk": WSL_RISK
+                })
+            else:
+                label = "Downloads folder" if ctype == "downloads" else consumer["name"]
+                options.append({
+                    "type": "MOVE",
+                    "description": f"Relocate {label}",
+                    "source_path": consumer["path"],
+                    "target_path": f"{target}\\{consumer['name']}",
+                    "size_bytes": size,
+                    "safety_explanation": "Symlink maintains file access; all programs work normally",
+                    "rollback_option": "Reverse move and restore symlink",
+                    "estimated_seconds": 300,
+                    "risk": MOVE_RISK
+                })
+
+            if self.throughput:
+                for option in options:
+                    option["estimated_seconds"] = self.throughput.estimate_seconds(option)
+
+            groups.append(options)
+
+        return groups
+
+    def _solve(
+        self,
+        groups: List[List[Dict[str, Any]]],
+        need: int,
+        risk_weight: float,
+        total_risk: int,
+        total_seconds: int,
+        resolution: Optional[int] = None
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Find the min-cost selection covering ``need`` bytes.
+
+        Returns a list of (group index, option index) pairs, or None if
+        the goal cannot be covered.
+        """
+        size = resolution or self.resolution
+        unit = need / size
+        dp = np.full(size + 1, np.inf)
+        dp[0] = 0.0
+        history = []
+
+        for options in groups:
+            best = dp.copy()
+            chosen = np.full(size + 1, -1, dtype=np.int16)
+            came_from = np.arange(size + 1, dtype=np.int32)
+
+            for k, option in enumerate(options):
+                # Round down so a selected set always truly covers the goal
+                units = min(size, int(option["size_bytes"] // unit))
+                if units == 0:
+                    continue
+
+                cost = (
+                    risk_weight * option["risk"] / total_risk
+                    + (1 - risk_weight) * option["estimated_seconds"] / total_seconds
+                )
+
+                candidate = np.full(size + 1, np.inf)
+                source = np.arange(size + 1, dtype=np.int32) - units
+                candidate[units:size] = dp[:size - units] + cost
+
+                # Any state within `units` of the goal saturates at the goal
+                tail = dp[size - units:]
+                tail_idx = int(np.argmin(tail))
+                candidate[size] = tail[tail_idx] + cost
+                source[size] = size - units + tail_idx
+
+                improved = candidate < best
+                best[improved] = candidate[improved]
+                chosen[improved] = k
+                came_from[improved] = source[improved]
+
+            history.append((chosen, came_from))
+            dp = best
+
+        if not np.isfinite(dp[size]):
+            return None
+
+        selection = []
+        state = size
+        for g in range(len(groups) - 1, -1, -1):
+            chosen, came_from = history[g]
+            if chosen[state] >= 0:
+                selection.append((g, int(chosen[state])))
+            state = int(came_from[state])
+
+        return sorted(selection)
+
+    @staticmethod
+    def _greedy(groups: List[List[Dict[str, Any]]], need: int) -> List[Dict[str, Any]]:
+        """Cover ``need`` bytes with each group's largest option, lowest risk per byte first."""
+        options = [max(group, key=lambda c: c["size_bytes"]) for group in groups]
+        options.sort(key=lambda c: c["risk"] / max(c["size_bytes"], 1))
+        actions, covered = [], 0
+        for option in options:
+            if covered >= need:
+                break
+            actions.append(option)
+            covered += option["size_bytes"]
+        return actions
+
+    def _build_plan(
+        self,
+        plan_id: str,
+        name: str,
+        candidates: List[Dict[str, Any]],
+        goal: PlanGoal,
+        rationale: str,
+        recommended: bool = False
+    ) -> Dict[str, Any]:
+        """Build a plan dict from selected candidates."""
+        actions = []
+        for idx, candidate in enumerate(candidates, 1):
+            action = {k: v for k, v in candidate.items() if k != "risk"}
+            action["id"] = f"{plan_id}_action_{idx}"
+            actions.append(action)
+
+        max_risk = max((c["risk"] for c in candidates), default=0)
+        if max_risk >= WSL_RISK:
+            risk_level = "high"
+        elif max_risk >= MOVE_RISK:
+            risk_level = "medium"
+        else:
+            risk_level = "low"
+
+        return {
+            "id": plan_id,
+            "name": name,
+            "space_saved_bytes": sum(a["size_bytes"] for a in actions),
+            "risk_level": risk_level,
+            "estimated_minutes": sum(a["estimated_seconds"] for a in actions) // 60,
+            "rationale": rationale,
+            "recommended": recommended,
+            "actions": actions,
+            "goal": goal.model_dump(),
+            "created_at": datetime.now().isoformat()
+        }
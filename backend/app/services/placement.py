@@ -0,0 +1,93 @@
+"""Placement of relocatable data across target drives."""
+
+from typing import List, Dict, Any, Optional
+from app.services.throughput import ThroughputModel
+from app.utils.helpers import get_drive_letter
+
+
+class PlacementEngine:
+    """Assigns relocatable consumers to target drives.
+
+    Uses decreasing-size bin packing: the largest items are placed first,
+    each onto the feasible drive with the best blend of remaining
+    headroom and measured write speed. A drive's capacity is its headroom
+    below ``max_percent_used``, so no target is pushed past the usage
+    threshold. The system drive and the item's own drive are never
+    targets.
+    """
+
+    def __init__(
+        self,
+        drives: List[Dict[str, Any]],
+        max_percent_used: float,
+        system_drive: str = "C",
+        throughput: Optional[ThroughputModel] = None,
+        preferred_drive: Optional[str] = None
+    ):
+        """Initialize engine.
+
+        Args:
+            drives: Drive dicts from analysis
+            max_percent_used: Usage threshold targets must stay under
+            system_drive: Drive letter never used as a target
+            throughput: Model providing measured drive write speeds
+            preferred_drive: Drive letter favoured when scores tie
+        """
+        self.system_drive = system_drive
+        self.preferred_drive = preferred_drive
+        self.targets: Dict[str, Dict[str, float]] = {}
+
+        fastest = 0.0
+        for drive in drives:
+            letter = drive["letter"]
+            if letter == system_drive or not drive["total_bytes"]:
+                continue
+            limit = drive["total_bytes"] * max_percent_used / 100
+            speed = 0.0
+            if throughput and letter in throughput.drives:
+                speed = throughput.drives[letter]["write_bps"]
+            fastest = max(fastest, speed)
+            self.targets[letter] = {
+                "total": drive["total_bytes"],
+                "used": drive["used_bytes"],
+                "headroom": max(limit - drive["used_bytes"], 0),
+                "speed": speed
+            }
+
+        # Normalize speeds; unmeasured drives count as average
+        for target in self.targets.values():
+            target["speed"] = target["speed"] / fastest if fastest and target["speed"] else 0.5
+
+    def assign(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Assign items to target drives.
+
+        Args:
+            items: Dicts with "path" and "size_bytes"
+
+        Returns:
+            Mapping of item path to target drive letter. Items that fit
+            nowhere are left out.
+        """
+        remaining = {letter: dict(t) for letter, t in self.targets.items()}
+        assignments = {}
+
+        for item in sorted(items, key=lambda i: i["size_bytes"], reverse=True):
+            size = item["size_bytes"]
+            source_drive = get_drive_letter(item["path"])
+            best_letter = None
+            best_score = None
+
+            for letter, target in remaining.items():
+                if letter == source_drive or target["headroom"] < size:
+                    continue
+                projected_free = 1 - (target["used"] + size) / target["total"]
+                score = (target["speed"] * projected_free, letter == self.preferred_drive)
+                if best_score is None or score > best_score:
+                    best_letter, best_score = letter, score
+
+            if best_letter:
+                remaining[best_letter]["headroom"] -= size
+                remaining[best_letter]["used"] += size
+                assignments[item["path"]] = best_letter
+
+        return assignments
@@ -1,43 +1,82 @@
 """Plan generation service with AI and rule-based fallback."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
-from app.models import Plan, PlanAction, RiskLevel, ActionType
+from app.models import Plan, PlanAction, RiskLevel, ActionType, PlanGoal
 from app.ai.openai_client import OpenAIClient
 from app.ai.anthropic_client import AnthropicClient
+from app.ai.pool import AIClientPool
+from app.services.optimizer import PlanOptimizer
+from app.services.placement import PlacementEngine
+from app.services.throughput import get_throughput_model, ThroughputModel
 from app.config import Settings
 from pathlib import Path
 import os
 
 
+@asynccontextmanager
+async def _owned(client: Any) -> AsyncIterator[Any]:
+    """Use a short-lived client and close it afterwards."""
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
 class PlanGenerator:
     """Generates cleanup plans using AI or rule-based logic."""
 
-    def __init__(self, settings: Settings):
-        """Initialize plan generator."""
+    def __init__(self, settings: Settings, ai_clients: Optional[AIClientPool] = None):
+        """Initialize plan generator.
+
+        Args:
+            settings: Application settings
+            ai_clients: Shared AI client pool. Without one, a short-lived
+                client is created and closed for each generation.
+        """
         self.settings = settings
+        self.ai_clients = ai_clients
 
     async def generate_plans(
         self,
         analysis_result: Dict[str, Any],
-        force_ai: Optional[bool] = None
+        force_ai: Optional[bool] = None,
+        goal: Optional[PlanGoal] = None
     ) -> List[Dict[str, Any]]:
-        """Generate 3-tier cleanup plans."""
+        """Generate cleanup plans.
+
+        Without a goal, returns the 3-tier plans. With a goal, returns the
+        Pareto-optimal plans (risk vs. time) that reach it.
+        """
+        # Measure drives before estimating durations
+        throughput = get_throughput_model()
+        await throughput.ensure_benchmarked(d["letter"] for d in analysis_result.get("drives", []))
+
+        if goal is not None:
+            relocatable = [
+                c for c in analysis_result.get("top_consumers", [])
+                if c["type"] not in ("cache", "temp")
+            ]
+            targets = self.place_targets(analysis_result, relocatable, throughput)
+            optimizer = PlanOptimizer(self.settings, throughput=throughput)
+            return optimizer.optimize(analysis_result, goal, targets=targets)
+
         use_ai = force_ai if force_ai is not None else False
 
         # Try AI generation if enabled and API key available
+        plans = None
         if use_ai:
             if self.settings.openai_api_key:
                 plans = await self._generate_with_openai(analysis_result)
-                if plans:
-                    return plans
             elif self.settings.anthropic_api_key:
                 plans = await self._generate_with_anthropic(analysis_result)
-                if plans:
-                    return plans
 
         # Fallback to rule-based generation
-        return self._generate_rule_based(analysis_result)
+        if not plans:
+            plans = self._generate_rule_based(analysis_result, throughput)
+
+        return throughput.apply_estimates(plans)
 
     async def _generate_with_openai(
         self,
@@ -45,17 +84,21 @@ class PlanGenerator:
     ) -> Optional[List[Dict[str, Any]]]:
         """Generate plans using OpenAI."""
         try:
-            client = OpenAIClient(self.settings.openai_api_key)
+            if self.ai_clients:
+                lease = self.ai_clients.openai_client()
+            else:
+                lease = _owned(OpenAIClient(self.settings.openai_api_key))
 
             drive_data = {"drives": analysis_result["drives"]}
             consumers_data = analysis_result["top_consumers"]
 
-            plans = await client.generate_plans(
-                drive_data=drive_data,
-                consumers_data=consumers_data,
-                target_drive=self.settings.default_target_drive,
-                backup_location=self.settings.backup_location
-            )
+            async with lease as client:
+                plans = await client.generate_plans(
+                    drive_data=drive_data,
+                    consumers_data=consumers_data,
+                    target_drive=self.settings.default_target_drive,
+                    backup_location=self.settings.backup_location
+                )
 
             return plans
         except Exception as e:
@@ -68,26 +111,55 @@ class PlanGenerator:
     ) -> Optional[List[Dict[str, Any]]]:
         """Generate plans using Anthropic."""
         try:
-            client = AnthropicClient(self.settings.anthropic_api_key)
+            if self.ai_clients:
+                lease = self.ai_clients.anthropic_client()
+            else:
+                lease = _owned(AnthropicClient(self.settings.anthropic_api_key))
 
             drive_data = {"drives": analysis_result["drives"]}
             consumers_data = analysis_result["top_consumers"]
 
-            plans = await client.generate_plans(
-                drive_data=drive_data,
-                consumers_data=consumers_data,
-                target_drive=self.settings.default_target_drive,
-                backup_location=self.settings.backup_location
-            )
+            async with lease as client:
+                plans = await client.generate_plans(
+                    drive_data=drive_data,
+                    consumers_data=consumers_data,
+                    target_drive=self.settings.default_target_drive,
+                    backup_location=self.settings.backup_location
+                )
 
             return plans
         except Exception as e:
             print(f"Anthropic generation failed: {e}")
             return None
 
+    def place_targets(
+        self,
+        analysis_result: Dict[str, Any],
+        consumers: List[Dict[str, Any]],
+        throughput: Optional[ThroughputModel] = None
+    ) -> Dict[str, str]:
+        """Assign relocatable consumers to target drives.
+
+        Returns a mapping of consumer path to target drive (e.g. "E:").
+        Consumers that fit on no drive map to the default target drive.
+        """
+        engine = PlacementEngine(
+            analysis_result.get("drives", []),
+            max_percent_used=self.settings.placement_max_percent_used,
+            throughput=throughput,
+            preferred_drive=self.settings.default_target_drive.rstrip(":\\")
+        )
+        assignments = engine.assign(consumers)
+        return {
+            c["path"]: f"{assignments[c['path']]}:" if c["path"] in assignments
+            else self.settings.default_target_drive
+            for c in consumers
+        }
+
     def _generate_rule_based(
         self,
-        analysis_result: Dict[str, Any]
+        analysis_result: Dict[str, Any],
+        throughput: Optional[ThroughputModel] = None
     ) -> List[Dict[str, Any]]:
         """Generate plans using rule-based logic."""
         consumers = analysis_result.get("top_consumers", [])
@@ -100,6 +172,11 @@ class PlanGenerator:
         temp_consumers = [c for c in consumers if c["type"] == "temp"]
         downloads_consumer = next((c for c in consumers if c["type"] == "downloads"), None)
 
+        # Spread everything the aggressive plan relocates across target drives;
+        # smaller plans relocate a subset, so the same placement still fits
+        relocatable = [c for c in [docker_consumer, *wsl_consumers[:2], downloads_consumer] if c]
+        targets = self.place_targets(analysis_result, relocatable, throughput)
+
         # Conservative Plan
         conservative_actions = []
         conservative_space = 0
@@ -110,9 +187,11 @@ class PlanGenerator:
                 "id": f"conservative_action_{idx}",
                 "type": "CLEANUP",
                 "description": f"Clear {cache['name']}",
+                "source_path": cache["path"],
                 "size_bytes": cache["size_bytes"],
                 "safety_explanation": "Browsers will rebuild cache automatically",
                 "rollback_option": "Not needed (cache data)",
+                "file_count": cache.get("file_count"),
                 "estimated_seconds": 120
             })
             conservative_space += cache["size_bytes"]
@@ -123,9 +202,11 @@ class PlanGenerator:
                 "id": f"conservative_action_{idx}",
                 "type": "CLEANUP",
                 "description": f"Clear Temporary Files: {temp['name']}",
+                "source_path": temp["path"],
                 "size_bytes": temp["size_bytes"],
                 "safety_explanation": "Safe to delete temporary files",
                 "rollback_option": "Not needed (temporary data)",
+                "file_count": temp.get("file_count"),
                 "estimated_seconds": 180
             })
             conservative_space += temp["size_bytes"]
@@ -141,7 +222,7 @@ class PlanGenerator:
                 "type": "MOVE",
                 "description": "Move Docker Desktop data",
                 "source_path": docker_consumer["path"],
-                "target_path": f"{self.settings.default_target_drive}\\Docker",
+                "target_path": f"{targets[docker_consumer['path']]}\\Docker",
                 "size_bytes": docker_consumer["size_bytes"],
                 "safety_explanation": "Symlink maintains compatibility; Docker will function normally",
                 "rollback_option": "Reverse move and restore symlink",
@@ -155,6 +236,7 @@ class PlanGenerator:
                 "id": f"balanced_action_{len(balanced_actions) + 1}",
                 "type": "PRUNE",
                 "description": "Clean Docker unused images and containers",
+                "source_path": docker_consumer["path"],
                 "command": "docker system prune -af --volumes",
                 "size_bytes": int(docker_consumer["size_bytes"] * 0.3),  # Estimate 30%
                 "safety_explanation": "Only removes unused Docker resources",
@@ -175,7 +257,7 @@ class PlanGenerator:
                 "type": "EXPORT_IMPORT_WSL",
                 "description": f"Relocate WSL: {distro_name}",
                 "source_path": wsl["path"],
-                "target_path": f"{self.settings.default_target_drive}\\WSL\\{distro_name}",
+                "target_path": f"{targets[wsl['path']]}\\WSL\\{distro_name}",
                 "size_bytes": wsl["size_bytes"],
                 "safety_explanation": "WSL export/import preserves all data",
                 "rollback_option": "Re-import from backup tar",
@@ -190,7 +272,7 @@ class PlanGenerator:
                 "type": "MOVE",
                 "description": "Relocate Downloads folder",
                 "source_path": downloads_consumer["path"],
-                "target_path": f"{self.settings.default_target_drive}\\Downloads",
+                "target_path": f"{targets[downloads_consumer['path']]}\\Downloads",
                 "size_bytes": downloads_consumer["size_bytes"],
                 "safety_explanation": "Symlink maintains file access; all programs work normally",
                 "rollback_option": "Reverse move and restore symlink",
@@ -1,13 +1,115 @@
 """Progress tracking for execution monitoring."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict, deque
 from datetime import datetime
 from app.models import ExecutionProgress, ExecutionStep, LogEntry, ExecutionStatus, StepStatus, LogLevel
+from app.config import settings
+from app.services.progress_events import get_progress_event_store
 import asyncio
+import threading
+import time
+import uuid
+
+
+# Top-level progress fields repeated in every delta message
+SUMMARY_FIELDS = (
+    "plan_id", "overall_percent", "current_step", "total_steps", "status", "eta_seconds", "updated_at"
+)
+
+# Statuses after which an execution's progress no longer changes
+FINAL_STATUSES = {
+    ExecutionStatus.COMPLETED.value,
+    ExecutionStatus.FAILED.value,
+    ExecutionStatus.CANCELLED.value
+}
+
+
+class ByteCounter:
+    """Thread-safe bytes/files counter fed by worker threads.
+
+    Copy threads call ``add`` on every chunk; the executor samples the
+    totals at a fixed interval, so progress updates are rate-limited no
+    matter how often the workers report.
+    """
+
+    def __init__(self):
+        """Initialize counter."""
+        self.bytes = 0
+        self.files = 0
+        self._lock = threading.Lock()
+
+    def add(self, bytes_delta: int, files_delta: int = 0):
+        """Add processed bytes and files."""
+        with self._lock:
+            self.bytes += bytes_delta
+            self.files += files_delta
+
+    def snapshot(self) -> Tuple[int, int]:
+        """Return (bytes, files) processed so far."""
+        with self._lock:
+            return self.bytes, self.files
+
+
+class LogBuffer:
+    """Fixed-capacity ring buffer of log entries.
+
+    Appending is O(1); once full, each append drops the oldest entry.
+    ``snapshot`` returns an immutable tuple that is cached until the next
+    append, so readers share one copy and never see the buffer change
+    under them. Entries must not be mutated after they are appended.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """Initialize buffer.
+
+        Args:
+            capacity: Entries kept before the oldest are dropped
+        """
+        if capacity < 1:
+            raise ValueError("Log capacity must be at least 1")
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)
+        self._snapshot: Optional[Tuple[Dict[str, Any], ...]] = ()
+        # Seq of the newest entry dropped to make room
+        self.dropped_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, entry: Dict[str, Any]):
+        """Add an entry with a "seq" field, dropping the oldest if full."""
+        if len(self._entries) == self.capacity:
+            self.dropped_seq = self._entries[0]["seq"]
+        self._entries.append(entry)
+        self._snapshot = None
+
+    def snapshot(self) -> Tuple[Dict[str, Any], ...]:
+        """All entries, oldest first, as a tuple shared until the next append."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._entries)
+        return self._snapshot
+
+    def since(self, seq: int) -> List[Dict[str, Any]]:
+        """Entries appended after sequence number seq, oldest first."""
+        entries = []
+        for entry in reversed(self._entries):
+            if entry["seq"] <= seq:
+                break
+            entries.append(entry)
+        entries.reverse()
+        return entries
 
 
 class ProgressManager:
-    """Manages execution progress and real-time updates."""
+    """Manages execution progress and real-time updates.
+
+    Every change bumps the sequence number ``seq`` and wakes tasks
+    waiting in ``wait_for_change``, so subscribers are pushed updates as
+    they happen instead of polling. Steps and log entries remember the
+    sequence number of their last change, which lets ``get_update``
+    send a subscriber only what changed since the last message it saw.
+    """
 
     def __init__(self, execution_id: str):
         """Initialize progress manager."""
@@ -18,11 +120,25 @@ class ProgressManager:
             "current_step": 0,
             "total_steps": 0,
             "steps": [],
-            "logs": [],
             "status": ExecutionStatus.PENDING.value,
+            "eta_seconds": None,
             "updated_at": datetime.now().isoformat()
         }
         self._lock = asyncio.Lock()
+        # Notified on every change; shares the lock that guards progress_data
+        self._changed = asyncio.Condition(self._lock)
+        # Identifies this manager's sequence, so numbers from before a restart are not reused
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.seq = 0
+        # Deltas cannot reach back before this sequence number
+        self._base_seq = 0
+        # Step index -> seq of its last change, least recently changed first
+        self._step_seqs: "OrderedDict[int, int]" = OrderedDict()
+        self._logs = LogBuffer(settings.progress_log_capacity)
+        # Per-step (bytes, monotonic time) of the last byte update
+        self._rate_samples: Dict[int, Tuple[int, float]] = {}
+        # Monotonic time the execution reached a final status; None while live
+        self.finished_at: Optional[float] = None
 
     async def initialize(self, plan_id: str, actions: List[Dict[str, Any]]):
         """Initialize progress tracking for a plan."""
@@ -36,73 +152,204 @@ class ProgressManager:
                     "description": action.get("description", ""),
                     "progress_percent": 0,
                     "error_message": None,
+                    "estimated_seconds": action.get("estimated_seconds", 0),
+                    "total_bytes": action.get("size_bytes", 0),
+                    "bytes_processed": 0,
+                    "files_processed": 0,
+                    "bytes_per_second": None,
+                    "eta_seconds": None,
+                    "impact": None,
                     "started_at": None,
                     "completed_at": None
                 }
                 steps.append(step)
 
+            self._rate_samples = {}
+            self._step_seqs = OrderedDict()
+            self._logs = LogBuffer(settings.progress_log_capacity)
+            self.finished_at = None
             self.progress_data = {
                 "plan_id": plan_id,
                 "overall_percent": 0.0,
                 "current_step": 0,
                 "total_steps": len(actions),
                 "steps": steps,
-                "logs": [],
                 "status": ExecutionStatus.RUNNING.value,
+                "eta_seconds": sum(step["estimated_seconds"] for step in steps),
                 "updated_at": datetime.now().isoformat()
             }
+            self._notify()
+            self._base_seq = self.seq
+            self._record("init", {**self.progress_data, "steps": [dict(s) for s in steps]})
+
+    def _record(self, kind: str, data: Dict[str, Any]):
+        """Append an event to the durable progress log, if one is running."""
+        store = get_progress_event_store()
+        if store:
+            store.record(self.execution_id, self.seq, kind, data)
+
+    def _summary(self) -> Dict[str, Any]:
+        """Top-level fields that change along with steps and status."""
+        data = self.progress_data
+        return {
+            "overall_percent": data["overall_percent"],
+            "current_step": data["current_step"],
+            "status": data["status"],
+            "eta_seconds": data["eta_seconds"],
+            "updated_at": data["updated_at"]
+        }
+
+    def _notify(self):
+        """Record a change and wake waiting subscribers; caller holds the lock."""
+        self.seq += 1
+        self._changed.notify_all()
+
+    async def wait_for_change(self, seq: int) -> int:
+        """Wait until progress changes after the given sequence number.
+
+        Args:
+            seq: Last sequence number the caller has seen
+
+        Returns:
+            The current sequence number
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.seq != seq)
+            return self.seq
+
+    def _estimate_remaining_seconds(self) -> float:
+        """Estimate remaining time.
+
+        Active steps reporting bytes use their live throughput; other
+        steps fall back to their measured-rate plan estimates.
+        """
+        now = datetime.now()
+        remaining = 0.0
+        for step in self.progress_data["steps"]:
+            if step["status"] == StepStatus.PENDING.value:
+                remaining += step["estimated_seconds"]
+            elif step["status"] == StepStatus.ACTIVE.value:
+                if step["eta_seconds"] is not None:
+                    remaining += step["eta_seconds"]
+                elif step["started_at"]:
+                    elapsed = (now - datetime.fromisoformat(step["started_at"])).total_seconds()
+                    remaining += max(step["estimated_seconds"] - elapsed, 0)
+        return remaining
+
+    def _overall_percent(self) -> float:
+        """Overall progress weighted by each step's bytes.
+
+        Falls back to counting steps when no step has a known size.
+        """
+        steps = self.progress_data["steps"]
+        if not steps:
+            return 0.0
+
+        total = sum(s["total_bytes"] for s in steps)
+        if total <= 0:
+            completed = sum(1 for s in steps if s["status"] == StepStatus.COMPLETED.value)
+            return completed / len(steps) * 100
+
+        done = 0
+        for step in steps:
+            if step["status"] == StepStatus.COMPLETED.value:
+                done += step["total_bytes"]
+            elif step["status"] == StepStatus.ACTIVE.value:
+                done += min(step["bytes_processed"], step["total_bytes"])
+        return done / total * 100
+
+    def _record_bytes(self, step_index: int, step: Dict[str, Any], bytes_processed: int):
+        """Update a step's smoothed throughput and remaining time."""
+        now = time.monotonic()
+        last = self._rate_samples.get(step_index)
+        self._rate_samples[step_index] = (bytes_processed, now)
+        step["bytes_processed"] = bytes_processed
+
+        if last is not None and now > last[1]:
+            rate = (bytes_processed - last[0]) / (now - last[1])
+            previous = step["bytes_per_second"]
+            alpha = settings.progress_rate_smoothing
+            # Exponentially weighted so one slow or fast sample does not swing the ETA
+            step["bytes_per_second"] = rate if previous is None else alpha * rate + (1 - alpha) * previous
+
+        if step["total_bytes"] > 0:
+            step["progress_percent"] = min(bytes_processed / step["total_bytes"] * 100, 99.9)
+            if step["bytes_per_second"]:
+                step["eta_seconds"] = max(step["total_bytes"] - bytes_processed, 0) / step["bytes_per_second"]
 
     async def update_step(
         self,
         step_index: int,
         status: StepStatus,
         progress_percent: float = None,
-        error_message: str = None
+        error_message: str = None,
+        bytes_processed: Optional[int] = None,
+        files_processed: Optional[int] = None,
+        impact: Optional[Dict[str, Any]] = None
     ):
-        """Update a specific step's status."""
+        """Update a specific step's status.
+
+        Args:
+            step_index: Index of the step
+            status: New step status
+            progress_percent: Explicit percent, overriding the byte-derived one
+            error_message: Error for a failed step
+            bytes_processed: Bytes the step has processed so far
+            files_processed: Files the step has processed so far
+            impact: Dry-run impact report of the step's action
+        """
         async with self._lock:
             if step_index < len(self.progress_data["steps"]):
                 step = self.progress_data["steps"][step_index]
+                previous_status = step["status"]
                 step["status"] = status.value
 
-                if status == StepStatus.ACTIVE:
+                if status == StepStatus.ACTIVE and previous_status != StepStatus.ACTIVE.value:
                     step["started_at"] = datetime.now().isoformat()
                     self.progress_data["current_step"] = step_index + 1
                 elif status == StepStatus.COMPLETED:
                     step["completed_at"] = datetime.now().isoformat()
                     step["progress_percent"] = 100
+                    step["eta_seconds"] = 0.0
                 elif status == StepStatus.FAILED:
                     step["error_message"] = error_message
+                    step["eta_seconds"] = None
+
+                if bytes_processed is not None:
+                    self._record_bytes(step_index, step, bytes_processed)
+                if files_processed is not None:
+                    step["files_processed"] = files_processed
+                if impact is not None:
+                    step["impact"] = impact
 
                 if progress_percent is not None:
                     step["progress_percent"] = progress_percent
 
-                # Calculate overall progress
-                completed_steps = sum(
-                    1 for s in self.progress_data["steps"]
-                    if s["status"] == StepStatus.COMPLETED.value
-                )
-                self.progress_data["overall_percent"] = (
-                    completed_steps / self.progress_data["total_steps"] * 100
-                )
+                self.progress_data["overall_percent"] = self._overall_percent()
+                self.progress_data["eta_seconds"] = self._estimate_remaining_seconds()
 
                 self.progress_data["updated_at"] = datetime.now().isoformat()
+                self._notify()
+                self._step_seqs.pop(step_index, None)
+                self._step_seqs[step_index] = self.seq
+                self._record("step", {"index": step_index, "step": dict(step), **self._summary()})
 
     async def add_log(self, level: LogLevel, message: str):
-        """Add a log entry."""
+        """Add a log entry; the oldest is dropped beyond progress_log_capacity."""
+        # Format outside the lock so chatty executions do not hold it longer
+        now = datetime.now()
+        timestamp, updated_at = now.strftime("%H:%M:%S"), now.isoformat()
         async with self._lock:
+            self._notify()
             log_entry = {
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
+                "seq": self.seq,
+                "timestamp": timestamp,
                 "level": level.value,
                 "message": message
             }
-            self.progress_data["logs"].append(log_entry)
-
-            # Keep last 100 logs
-            if len(self.progress_data["logs"]) > 100:
-                self.progress_data["logs"] = self.progress_data["logs"][-100:]
-
-            self.progress_data["updated_at"] = datetime.now().isoformat()
+            self._logs.append(log_entry)
+            self.progress_data["updated_at"] = updated_at
+            self._record("log", log_entry)
 
     async def set_status(self, status: ExecutionStatus):
         """Set overall execution status."""
@@ -112,25 +359,157 @@ class ProgressManager:
 
             if status == ExecutionStatus.COMPLETED:
                 self.progress_data["overall_percent"] = 100.0
+                self.progress_data["eta_seconds"] = 0.0
+            self.finished_at = time.monotonic() if status.value in FINAL_STATUSES else None
+            self._notify()
+            self._record("status", self._summary())
 
     async def get_progress(self) -> Dict[str, Any]:
-        """Get current progress data."""
+        """Get a snapshot of the current progress.
+
+        Steps are copied and logs are an immutable tuple, so the result
+        does not change as execution continues.
+        """
         async with self._lock:
-            return self.progress_data.copy()
+            data = self.progress_data
+            return {**data, "steps": [dict(s) for s in data["steps"]], "logs": self._logs.snapshot()}
+
+    async def get_update(self, since: Optional[int] = None, stream_id: Optional[str] = None) -> Dict[str, Any]:
+        """Build the next message for a subscriber.
+
+        Args:
+            since: Sequence number of the last message the subscriber applied
+            stream_id: Stream the subscriber's sequence number came from
+
+        Returns:
+            A "snapshot" with the full progress when the subscriber has
+            nothing usable, otherwise a "delta" with the summary fields,
+            the steps changed after ``since`` (keyed by index) and the
+            log entries appended after it
+        """
+        async with self._lock:
+            data = self.progress_data
+            header = {"stream": self.stream_id, "seq": self.seq}
+            usable = (
+                since is not None
+                and stream_id == self.stream_id
+                and self._base_seq <= since <= self.seq
+                and self._logs.dropped_seq <= since
+            )
+            if not usable:
+                return {"type": "snapshot", **header, **data, "steps": [dict(s) for s in data["steps"]],
+                        "logs": self._logs.snapshot()}
+
+            steps = {}
+            for index, seq in reversed(self._step_seqs.items()):
+                if seq <= since:
+                    break
+                steps[str(index)] = dict(data["steps"][index])
+
+            return {
+                "type": "delta",
+                **header,
+                "since": since,
+                **{field: data[field] for field in SUMMARY_FIELDS},
+                "steps": steps,
+                "logs": self._logs.since(since)
+            }
+
+
+class ProgressRegistry:
+    """Bounded registry of progress managers, keyed by execution ID.
+
+    Managers are only created through ``create`` (by the executor, and
+    by the job queue when a client subscribes to a queued job), so
+    looking up an unknown ID never allocates one.
+    Finished executions are evicted ``ttl_seconds`` after they finish,
+    and the oldest finished ones go first whenever more than
+    ``max_entries`` are held; running executions are never evicted.
+    Eviction happens on every create and lookup.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600.0):
+        """Initialize registry.
+
+        Args:
+            max_entries: Managers kept before finished ones are evicted early
+            ttl_seconds: How long a finished execution's manager is kept
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._managers: "OrderedDict[str, ProgressManager]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __contains__(self, execution_id: str) -> bool:
+        return execution_id in self._managers
+
+    def create(self, execution_id: str) -> ProgressManager:
+        """Get the manager of an execution, registering a new one if needed."""
+        manager = self._managers.get(execution_id)
+        if manager is None:
+            manager = ProgressManager(execution_id)
+            self._managers[execution_id] = manager
+        self.evict()
+        return manager
+
+    def get(self, execution_id: str) -> Optional[ProgressManager]:
+        """Get the manager of a registered execution, or None."""
+        self.evict()
+        return self._managers.get(execution_id)
+
+    def remove(self, execution_id: str):
+        """Drop an execution's manager."""
+        self._managers.pop(execution_id, None)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop expired managers, then the oldest finished ones over the cap.
+
+        Args:
+            now: Monotonic time to evict at; defaults to the current time
+
+        Returns:
+            Number of managers evicted
+        """
+        now = time.monotonic() if now is None else now
+        finished = sorted(
+            (manager.finished_at, execution_id)
+            for execution_id, manager in self._managers.items()
+            if manager.finished_at is not None
+        )
+        excess = len(self._managers) - self.max_entries
+        evicted = 0
+        for finished_at, execution_id in finished:
+            if now - finished_at < self.ttl_seconds and evicted >= excess:
+                break
+            del self._managers[execution_id]
+            evicted += 1
+        return evicted
 
 
 # Global progress managers
-_progress_managers: Dict[str, ProgressManager] = {}
+_registry = ProgressRegistry(
+    max_entries=settings.progress_max_managers,
+    ttl_seconds=settings.progress_retention_seconds
+)
+
+
+def get_progress_registry() -> ProgressRegistry:
+    """Get the global progress manager registry."""
+    return _registry
+
+
+def create_progress_manager(execution_id: str) -> ProgressManager:
+    """Get or create the progress manager of an execution being run or queued."""
+    return _registry.create(execution_id)
 
 
-def get_progress_manager(execution_id: str) -> ProgressManager:
-    """Get or create progress manager for execution."""
-    if execution_id not in _progress_managers:
-        _progress_managers[execution_id] = ProgressManager(execution_id)
-    return _progress_managers[execution_id]
+def get_progress_manager(execution_id: str) -> Optional[ProgressManager]:
+    """Get the progress manager of a known execution; None if unknown or evicted."""
+    return _registry.get(execution_id)
 
 
 def cleanup_progress_manager(execution_id: str):
     """Remove progress manager after completion."""
-    if execution_id in _progress_managers:
-        del _progress_managers[execution_id]
+    _registry.remove(execution_id)
@@ -0,0 +1,283 @@
+"""Durable, append-only log of progress events."""
+
+from typing import Dict, Any, List, Optional
+from collections import deque
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    execution_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_progress_events_execution ON progress_events (execution_id, id);
+CREATE INDEX IF NOT EXISTS idx_progress_events_kind ON progress_events (execution_id, kind, id);
+"""
+
+# Summary fields carried by step and status events
+_SUMMARY = ("overall_percent", "current_step", "status", "eta_seconds", "updated_at")
+
+
+class ProgressEventStore:
+    """Append-only SQLite store of every progress change.
+
+    ``record`` only puts the event on an in-memory queue, so the
+    executor never waits on disk; a writer thread commits queued events
+    in batches, at most every ``flush_seconds``. Events are:
+
+    - ``init``: the initial progress snapshot
+    - ``step``: one step's new state plus the summary fields
+    - ``log``: one log entry (never capped, unlike the live log)
+    - ``status``: the summary fields after a status change
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = 500,
+        flush_seconds: float = 1.0,
+        max_pending: int = 100000
+    ):
+        """Initialize store.
+
+        Args:
+            db_path: SQLite database file
+            batch_size: Maximum events per transaction
+            flush_seconds: Maximum delay before queued events are written
+            max_pending: Events held in memory before new ones are dropped
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    # ==================== Writing ====================
+
+    def start(self):
+        """Create the schema and start the writer thread."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self._thread = threading.Thread(target=self._write_loop, name="progress-events", daemon=True)
+        self._thread.start()
+
+    def record(self, execution_id: str, seq: int, kind: str, data: Dict[str, Any]):
+        """Queue an event; never blocks.
+
+        Args:
+            execution_id: Execution the event belongs to
+            seq: Progress sequence number after the change
+            kind: Event kind
+            data: Event payload; must not be mutated afterwards
+        """
+        try:
+            self._queue.put_nowait((execution_id, seq, kind, data, time.time()))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                logger.warning("Progress event log is falling behind; dropping events")
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every event queued so far is committed."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Write remaining events and stop the writer thread."""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write_loop(self):
+        """Commit queued events in batches until closed."""
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            running = True
+            while running:
+                batch, markers = [], []
+                try:
+                    item = self._queue.get(timeout=self.flush_seconds)
+                except queue.Empty:
+                    continue
+                deadline = time.monotonic() + self.flush_seconds
+                while True:
+                    if item is None:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        execution_id, seq, kind, data, created_at = item
+                        batch.append((execution_id, seq, kind, json.dumps(data), created_at))
+                    if not running or markers or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(
+                                "INSERT INTO progress_events (execution_id, seq, kind, data, created_at) "
+                                "VALUES (?, ?, ?, ?, ?)",
+                                batch
+                            )
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to write {len(batch)} progress events: {e}")
+                for marker in markers:
+                    marker.set()
+        finally:
+            conn.close()
+
+    # ==================== Reading ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read connection with dict-like rows."""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def list_executions(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Executions with recorded progress, most recent first."""
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT execution_id, MIN(created_at) AS started, MAX(created_at) AS updated, "
+                "COUNT(*) AS events FROM progress_events GROUP BY execution_id "
+                "ORDER BY updated DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+            executions = []
+            for row in rows:
+                last = conn.execute(
+                    "SELECT data FROM progress_events WHERE execution_id = ? AND kind IN ('init', 'step', 'status') "
+                    "ORDER BY id DESC LIMIT 1",
+                    (row["execution_id"],)
+                ).fetchone()
+                init = conn.execute(
+                    "SELECT data FROM progress_events WHERE execution_id = ? AND kind = 'init' "
+                    "ORDER BY id DESC LIMIT 1",
+                    (row["execution_id"],)
+                ).fetchone()
+                summary = json.loads(last["data"]) if last else {}
+                executions.append({
+                    "execution_id": row["execution_id"],
+                    "plan_id": json.loads(init["data"]).get("plan_id") if init else None,
+                    "status": summary.get("status"),
+                    "overall_percent": summary.get("overall_percent"),
+                    "started_at": datetime.fromtimestamp(row["started"]).isoformat(),
+                    "updated_at": datetime.fromtimestamp(row["updated"]).isoformat(),
+                    "events": row["events"]
+                })
+        return executions
+
+    def get_events(self, execution_id: str, after: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Events of an execution in order, after event ID ``after``."""
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, seq, kind, data, created_at FROM progress_events "
+                "WHERE execution_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (execution_id, after, limit)
+            ).fetchall()
+        return [
+            {"id": r["id"], "seq": r["seq"], "kind": r["kind"], "data": json.loads(r["data"]),
+             "created_at": r["created_at"]}
+            for r in rows
+        ]
+
+    def get_logs(self, execution_id: str, after: int = 0, limit: int = 200) -> Dict[str, Any]:
+        """One page of an execution's full log.
+
+        Returns:
+            Dict with "logs" (each with its event "id") and "next", the
+            ``after`` value for the next page, or None on the last page
+        """
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM progress_events WHERE execution_id = ? AND kind = 'log' AND id > ? "
+                "ORDER BY id LIMIT ?",
+                (execution_id, after, limit + 1)
+            ).fetchall()
+        logs = [{"id": r["id"], **json.loads(r["data"])} for r in rows[:limit]]
+        return {"logs": logs, "next": logs[-1]["id"] if len(rows) > limit else None}
+
+    def replay(self, execution_id: str, log_limit: int = 100) -> Optional[Dict[str, Any]]:
+        """Rebuild an execution's last progress state from its events.
+
+        Args:
+            execution_id: Execution to replay
+            log_limit: Most recent log entries to include
+
+        Returns:
+            Progress as the live endpoint reports it, plus "log_count";
+            None if nothing was recorded
+        """
+        state: Optional[Dict[str, Any]] = None
+        logs: deque = deque(maxlen=log_limit)
+        log_count = 0
+        after = 0
+        while True:
+            events = self.get_events(execution_id, after, limit=1000)
+            if not events:
+                break
+            for event in events:
+                data = event["data"]
+                if event["kind"] == "init":
+                    state = dict(data)
+                    logs.clear()
+                    log_count = 0
+                elif state is None:
+                    continue
+                elif event["kind"] == "step":
+                    state["steps"][data["index"]] = data["step"]
+                    state.update({k: data[k] for k in _SUMMARY if k in data})
+                elif event["kind"] == "status":
+                    state.update({k: data[k] for k in _SUMMARY if k in data})
+                elif event["kind"] == "log":
+                    logs.append(data)
+                    log_count += 1
+            after = events[-1]["id"]
+
+        if state is None:
+            return None
+        state["logs"] = list(logs)
+        state["log_count"] = log_count
+        return state
+
+
+# Store used by progress managers; set while the app is running
+_event_store: Optional[ProgressEventStore] = None
+
+
+def get_progress_event_store() -> Optional[ProgressEventStore]:
+    """Get the running progress event store, if any."""
+    return _event_store
+
+
+def set_progress_event_store(store: Optional[ProgressEventStore]):
+    """Install (or remove, with None) the progress event store."""
+    global _event_store
+    _event_store = store
@@ -1,9 +1,40 @@
 """Rollback manager for reverting operations."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
+import asyncio
 import json
+import os
 from datetime import datetime
+from app.config import settings
+from app.models import ExecutionStatus, StepStatus, LogLevel
+from app.services.action_graph import build_dependencies, action_drives, DriveLimiter
+from app.services.checkpoint import CheckpointStore
+from app.services.io_control import IOController
+from app.services.progress import create_progress_manager, ByteCounter
+from app.services.rollback_journal import journal_path, read_journal
+from app.services.verification import Verifier, load_manifest
+from app.storage.archiver import ArchiveEngine
+from app.storage.backup_store import BackupStore
+from app.storage.mover import MoveEngine
+from app.utils.helpers import is_link
+
+
+# Rollbacks running in this process, keyed by execution ID
+_active_rollbacks: Dict[str, asyncio.Task] = {}
+
+# Operations undone even when a crash left them without a done record
+INTERRUPTIBLE_ACTIONS = {"MOVE", "ARCHIVE"}
+
+
+def is_rollback_active(execution_id: str) -> bool:
+    """Check whether an execution is being rolled back in this process."""
+    return execution_id in _active_rollbacks
+
+
+def rollback_progress_id(execution_id: str) -> str:
+    """Progress ID under which an execution's rollback reports."""
+    return f"{execution_id}-rollback"
 
 
 class RollbackManager:
@@ -12,7 +43,8 @@ class RollbackManager:
     def __init__(self, execution_id: str):
         """Initialize rollback manager."""
         self.execution_id = execution_id
-        self.rollback_file = Path(f"data/rollback/{execution_id}.json")
+        self.rollback_file = Path(settings.rollback_dir) / f"{execution_id}.json"
+        self.journal_file = journal_path(execution_id)
 
     def save_rollback_data(self, operations: List[Dict[str, Any]], plan_id: str):
         """Save rollback metadata."""
@@ -29,43 +61,362 @@ class RollbackManager:
             json.dump(metadata, f, indent=2)
 
     def load_rollback_data(self) -> Dict[str, Any]:
-        """Load rollback metadata."""
+        """Load rollback metadata, preferring the execution's rollback journal.
+
+        Journal metadata also has "status" and the "incomplete"
+        operations that were started but never recorded as finished.
+        """
+        if self.journal_file.exists():
+            return read_journal(self.journal_file)
+
         if not self.rollback_file.exists():
             raise FileNotFoundError(f"No rollback data found for {self.execution_id}")
 
         with open(self.rollback_file, "r") as f:
             return json.load(f)
 
-    async def rollback(self) -> Dict[str, Any]:
-        """Execute rollback operations."""
-        metadata = self.load_rollback_data()
-        operations = metadata.get("operations", [])
+    @staticmethod
+    def operations_to_undo(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Finished operations, then interrupted moves and archives.
 
-        rolled_back = 0
-        # Reverse order for rollback
-        for operation in reversed(operations):
-            action_type = operation.get("action_type")
+        An interrupted operation started after every finished one it
+        overlaps, so it is undone first. Its data may be anywhere
+        between untouched and fully moved; it is marked "interrupted".
+        """
+        interrupted = [
+            {**{k: v for k, v in op.items() if k != "op"}, "interrupted": True}
+            for op in metadata.get("incomplete", [])
+            if op.get("action_type") in INTERRUPTIBLE_ACTIONS
+        ]
+        return list(metadata.get("operations", [])) + interrupted
 
-            if action_type == "MOVE":
-                # Reverse move operation
-                # In production: shutil.move(target, source) and remove symlink
-                rolled_back += 1
+    async def rollback(self) -> Dict[str, Any]:
+        """Execute rollback operations."""
+        metadata = await asyncio.to_thread(self.load_rollback_data)
+        engine = RollbackEngine(self.execution_id, self.operations_to_undo(metadata))
+        return await engine.run()
 
-            elif action_type == "DELETE_TO_RECYCLE":
-                # Restore from recycle bin
-                rolled_back += 1
+    async def start(self) -> Dict[str, Any]:
+        """Start the rollback in the background.
 
-            elif action_type == "EXPORT_IMPORT_WSL":
-                # Re-import WSL
-                rolled_back += 1
+        Returns:
+            Dict with "execution_id", "rollback_id" (the progress ID to
+            watch) and the number of "operations" to undo
 
+        Raises:
+            FileNotFoundError: If the execution has no rollback data
+        """
+        metadata = await asyncio.to_thread(self.load_rollback_data)
+        engine = RollbackEngine(self.execution_id, self.operations_to_undo(metadata))
+        task = asyncio.create_task(engine.run())
+        _active_rollbacks[self.execution_id] = task
+        task.add_done_callback(lambda _: _active_rollbacks.pop(self.execution_id, None))
         return {
             "execution_id": self.execution_id,
-            "operations_rolled_back": rolled_back,
-            "status": "success"
+            "rollback_id": engine.rollback_id,
+            "operations": len(engine.operations)
         }
 
     def cleanup(self):
         """Remove rollback data after successful execution."""
-        if self.rollback_file.exists():
-            self.rollback_file.unlink()
+        for path in (self.rollback_file, self.journal_file):
+            if path.exists():
+                path.unlink()
+
+
+class RollbackEngine:
+    """Reverses an execution's recorded operations.
+
+    Operations are undone in reverse dependency order: one is undone
+    only after every later operation on overlapping paths has been, and
+    independent ones run in parallel within the execution limits. A move
+    goes back by rename on the same device and by the parallel copy path
+    otherwise; restored files are checked against the manifest recorded
+    when the data was moved or backed up. Progress is reported under
+    ``<execution_id>-rollback`` like a forward execution.
+    """
+
+    def __init__(self, execution_id: str, operations: List[Dict[str, Any]]):
+        """Initialize rollback engine.
+
+        Args:
+            execution_id: Execution to roll back
+            operations: Its rollback data, in the order they were performed
+        """
+        self.execution_id = execution_id
+        self.operations = operations
+        self.rollback_id = rollback_progress_id(execution_id)
+        self.progress = create_progress_manager(self.rollback_id)
+        self.io = IOController.from_settings()
+        self.drive_limiter = DriveLimiter(settings.max_actions_per_drive)
+        # Lets an interrupted cross-device move back resume its copy
+        self.checkpoints = CheckpointStore(self.rollback_id)
+
+    @staticmethod
+    def _paths(operation: Dict[str, Any]) -> Dict[str, Any]:
+        """An operation's paths in the form the action graph expects."""
+        return {
+            "source_path": operation.get("source"),
+            "target_path": operation.get("target") or operation.get("archive")
+        }
+
+    def reverse_dependencies(self) -> List[Set[int]]:
+        """For each operation, the later operations that must be undone first."""
+        deps = build_dependencies([self._paths(op) for op in self.operations])
+        reverse: List[Set[int]] = [set() for _ in self.operations]
+        for later, earlier in enumerate(deps):
+            for idx in earlier:
+                reverse[idx].add(later)
+        return reverse
+
+    @staticmethod
+    def describe(operation: Dict[str, Any]) -> str:
+        """Human-readable step description of undoing an operation."""
+        if operation.get("snapshot"):
+            return f"Restore {operation['source']} from backup"
+        if operation.get("interrupted"):
+            return f"Recover interrupted {operation['action_type'].lower()} of {operation['source']}"
+        if operation.get("action_type") == "MOVE":
+            return f"Move {operation['target']} back to {operation['source']}"
+        if operation.get("action_type") == "ARCHIVE":
+            return f"Extract {operation['archive']} to {operation['source']}"
+        return f"Undo {operation.get('action_type', 'operation')} of {operation.get('source', '')}"
+
+    async def run(self) -> Dict[str, Any]:
+        """Undo every operation and report the outcome.
+
+        Returns:
+            Dict with "execution_id", "rollback_id", "operations_rolled_back",
+            "skipped", "failed", "verified_files" and "status"
+        """
+        io_monitor = asyncio.create_task(self.io.monitor())
+        results: Dict[int, Optional[Dict[str, int]]] = {}
+        try:
+            await self.progress.initialize(
+                plan_id=f"rollback-{self.execution_id}",
+                actions=[
+                    {"id": op.get("action_id", f"operation_{idx}"), "description": self.describe(op)}
+                    for idx, op in enumerate(self.operations)
+                ]
+            )
+            await self.progress.add_log(
+                LogLevel.INFO,
+                f"Rolling back {len(self.operations)} operations of execution {self.execution_id}"
+            )
+            results = await self._run_graph()
+        finally:
+            io_monitor.cancel()
+
+        failed = len(self.operations) - len(results)
+        done = [r for r in results.values() if r is not None]
+        if failed:
+            await self.progress.set_status(ExecutionStatus.FAILED)
+            await self.progress.add_log(LogLevel.ERROR, f"Rollback failed: {failed} operations were not undone")
+        else:
+            await asyncio.to_thread(self.checkpoints.finish)
+            await self.progress.set_status(ExecutionStatus.COMPLETED)
+            await self.progress.add_log(LogLevel.SUCCESS, f"Rolled back {len(done)} operations")
+
+        return {
+            "execution_id": self.execution_id,
+            "rollback_id": self.rollback_id,
+            "operations_rolled_back": len(done),
+            "skipped": len(results) - len(done),
+            "failed": failed,
+            "verified_files": sum(r["verified"] for r in done),
+            "status": "success" if not failed else "failed"
+        }
+
+    async def _run_graph(self) -> Dict[int, Optional[Dict[str, int]]]:
+        """Undo operations as a reverse dependency graph.
+
+        An operation starts once every later one it overlaps has been
+        undone, up to max_parallel_actions at a time. Operations waiting
+        on a failed one are never started.
+
+        Returns:
+            Result of each undone operation by index; None for skipped ones
+        """
+        after = self.reverse_dependencies()
+        results: Dict[int, Optional[Dict[str, int]]] = {}
+        pending = set(range(len(self.operations)))
+        running: Dict[asyncio.Task, int] = {}
+
+        while pending or running:
+            ready = [i for i in sorted(pending, reverse=True) if after[i].issubset(results)]
+            for idx in ready[:max(settings.max_parallel_actions - len(running), 0)]:
+                pending.discard(idx)
+                running[asyncio.create_task(self._run_step(idx))] = idx
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                idx = running.pop(task)
+                ok, result = task.result()
+                if ok:
+                    results[idx] = result
+
+        for idx in pending:
+            await self.progress.update_step(idx, StepStatus.CANCELLED)
+            await self.progress.add_log(
+                LogLevel.WARNING,
+                f"Not undone: {self.describe(self.operations[idx])} (depends on a failed step)"
+            )
+        return results
+
+    async def _run_step(self, idx: int):
+        """Undo one operation as a progress step; returns (succeeded, result)."""
+        operation = self.operations[idx]
+        description = self.describe(operation)
+        async with self.drive_limiter.acquire(action_drives(self._paths(operation))):
+            await self.progress.update_step(idx, StepStatus.ACTIVE)
+            await self.progress.add_log(LogLevel.INFO, f"Starting: {description}")
+
+            counter = ByteCounter()
+            reporter = asyncio.create_task(self._report_bytes(idx, counter))
+            try:
+                result = await asyncio.to_thread(self._undo, idx, operation, counter)
+                reporter.cancel()
+                bytes_done, files_done = counter.snapshot()
+                await self.progress.update_step(
+                    idx, StepStatus.COMPLETED, bytes_processed=bytes_done, files_processed=files_done
+                )
+                if result is None:
+                    await self.progress.add_log(LogLevel.INFO, f"Nothing to undo: {description}")
+                else:
+                    await self.progress.add_log(
+                        LogLevel.INFO,
+                        f"Completed: {description} ({result['files']} files, {result['verified']} verified)"
+                    )
+                return True, result
+
+            except Exception as e:
+                reporter.cancel()
+                await self.progress.update_step(idx, StepStatus.FAILED, error_message=str(e))
+                await self.progress.add_log(LogLevel.ERROR, f"Failed: {description} - {str(e)}")
+                return False, None
+
+            finally:
+                reporter.cancel()
+
+    async def _report_bytes(self, idx: int, counter: ByteCounter):
+        """Publish a step's byte counter at a fixed interval until cancelled."""
+        while True:
+            await asyncio.sleep(settings.progress_update_interval)
+            bytes_done, files_done = counter.snapshot()
+            if bytes_done or files_done:
+                await self.progress.update_step(
+                    idx,
+                    StepStatus.ACTIVE,
+                    bytes_processed=bytes_done,
+                    files_processed=files_done
+                )
+
+    # ==================== Undo (worker threads) ====================
+
+    def _undo(self, idx: int, operation: Dict[str, Any], counter: ByteCounter) -> Optional[Dict[str, int]]:
+        """Undo one operation; returns {"files", "verified"}, or None if nothing applies."""
+        if operation.get("snapshot"):
+            return self._undo_snapshot(operation, counter)
+        if operation.get("interrupted") and operation.get("action_type") == "MOVE":
+            return self._undo_interrupted_move(idx, operation, counter)
+        if operation.get("action_type") == "MOVE":
+            return self._undo_move(idx, operation, counter)
+        if operation.get("action_type") == "ARCHIVE":
+            return self._undo_archive(operation, counter)
+        return None
+
+    def _undo_snapshot(self, operation: Dict[str, Any], counter: ByteCounter) -> Dict[str, int]:
+        """Recreate deleted data from the backup store and check it."""
+        store = BackupStore.from_settings(on_progress=counter.add, io=self.io)
+        stats = store.restore(operation["snapshot"])
+        root, manifest = store.manifest(operation["snapshot"])
+        with Verifier(algorithm=manifest["algorithm"], workers=store.workers, io=self.io) as verifier:
+            verifier.check(root, manifest)
+        return {"files": stats["files"], "verified": len(manifest["files"])}
+
+    def _undo_move(self, idx: int, operation: Dict[str, Any], counter: ByteCounter) -> Dict[str, int]:
+        """Move data back to its source, replacing the link left there."""
+        source, target = Path(operation["source"]), Path(operation["target"])
+        manifest = load_manifest(Path(operation["manifest"])) if operation.get("manifest") else None
+
+        if is_link(source):
+            if os.path.realpath(source) != os.path.realpath(target):
+                raise OSError(f"{source} links to {os.path.realpath(source)}, not {target}")
+            _remove_link(source)
+
+        files = 0
+        if os.path.lexists(target):
+            verifier = Verifier.from_settings(algorithm=manifest["algorithm"], io=self.io) if manifest else None
+            engine = MoveEngine(
+                workers=settings.move_workers,
+                large_file_bytes=settings.move_large_file_bytes,
+                buffer_bytes=settings.move_buffer_bytes,
+                on_progress=counter.add,
+                io=self.io,
+                verifier=verifier
+            )
+            try:
+                files = engine.move(target, source, link=False, journal=self.checkpoints.journal(f"operation_{idx}"))["files"]
+            finally:
+                if verifier:
+                    verifier.close()
+        elif not source.exists():
+            raise FileNotFoundError(f"Neither {target} nor {source} exists")
+
+        if manifest is None:
+            return {"files": files, "verified": 0}
+        # Renamed files hit the hash cache, so this costs one stat each
+        with Verifier.from_settings(algorithm=manifest["algorithm"], io=self.io) as verifier:
+            verifier.check(source, manifest)
+        return {"files": files or len(manifest["files"]), "verified": len(manifest["files"])}
+
+    def _undo_interrupted_move(
+        self,
+        idx: int,
+        operation: Dict[str, Any],
+        counter: ByteCounter
+    ) -> Optional[Dict[str, int]]:
+        """Move back whatever an interrupted move put at its target.
+
+        Returns None if the source was never touched. Data left in both
+        places (a copy or source removal cut short) is not guessed at.
+        """
+        source, target = Path(operation["source"]), Path(operation["target"])
+        target_empty = not os.path.lexists(target) or (
+            target.is_dir() and not is_link(target) and not any(target.iterdir())
+        )
+        if is_link(source) or not os.path.lexists(source):
+            return self._undo_move(idx, operation, counter)
+        if target_empty:
+            return None
+        raise OSError(
+            f"Move of {source} to {target} was interrupted with data in both places; "
+            f"check them and remove the incomplete copy"
+        )
+
+    def _undo_archive(self, operation: Dict[str, Any], counter: ByteCounter) -> Optional[Dict[str, int]]:
+        """Extract what an archive's source removal deleted, unless the source was kept.
+
+        Removal may have kept files in use or been cut short, so only
+        files missing from the source (or with another size) are
+        extracted, each checked against the hash recorded when archiving.
+        An interrupted archive never removed anything: its source is
+        removed only after it is durably journaled as done.
+        """
+        source, archive = Path(operation["source"]), Path(operation["archive"])
+        if operation.get("keep_source") or (operation.get("interrupted") and os.path.lexists(source)):
+            return None
+        stats = ArchiveEngine.extract(archive, source.parent, on_progress=counter.add, skip_existing=True)
+        return {"files": stats["files"], "verified": stats["verified"]}
+
+
+def _remove_link(path: Path):
+    """Remove a symlink or junction without touching what it points to."""
+    if os.path.islink(path):
+        os.unlink(path)
+    else:
+        # Junctions are removed like empty directories
+        os.rmdir(path)
@@ -0,0 +1,286 @@
+"""Write-ahead journal of the operations an execution performs."""
+
+from typing import Dict, Any, List, Tuple
+from pathlib import Path
+from datetime import datetime
+import json
+import os
+import threading
+import time
+from app.config import settings
+
+
+# Bytes read from the end of a journal to find its last record
+_TAIL_BYTES = 4096
+
+
+def journal_path(execution_id: str) -> Path:
+    """Where an execution's rollback journal is kept."""
+    return Path(settings.rollback_dir) / f"{execution_id}.journal"
+
+
+class RollbackJournal:
+    """Append-only, fsynced record of every reversible operation.
+
+    Each operation is journaled twice: an ``intent`` before it changes
+    anything, and ``done`` with its final rollback data afterwards. One
+    line per record:
+
+    - ``{"t": "begin", "plan_id", "at"}`` when the execution starts
+    - ``{"t": "intent", "op", "action_id", "data"}`` before an operation
+    - ``{"t": "done", "op", "data"}`` after it
+    - ``{"t": "end", "status", "at"}`` when the execution stops
+
+    Intents are durable before ``intent`` returns. Concurrent writers
+    share fsyncs: while one thread syncs, the others queue their lines
+    and the next sync commits all of them together. ``done`` records
+    are buffered and synced with the next intent, after ``batch_size``
+    records or ``flush_seconds``, or on close, unless the caller asks for
+    them to be durable; one lost in a crash only leaves its operation
+    reported as incomplete.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 512, flush_seconds: float = 1.0):
+        """Initialize journal, continuing any records already in the file.
+
+        Args:
+            path: Journal file
+            batch_size: Buffered records that force a sync
+            flush_seconds: Maximum delay before buffered records are synced
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._cond = threading.Condition()
+        self._buffer: List[str] = []
+        self._appended = 0
+        self._durable = 0
+        self._syncing = False
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._next_op = 1
+        if self.path.exists():
+            _, last_op, valid_bytes = _scan(self.path)
+            self._next_op = last_op + 1
+            if self.path.stat().st_size > valid_bytes:
+                # Drop a record torn by a crash so new records start on a fresh line
+                with open(self.path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+    @classmethod
+    def for_execution(cls, execution_id: str) -> "RollbackJournal":
+        """Open the journal of an execution with the configured batching."""
+        return cls(
+            journal_path(execution_id),
+            batch_size=settings.rollback_batch_size,
+            flush_seconds=settings.rollback_flush_seconds
+        )
+
+    # ==================== Writing ====================
+
+    def begin(self, plan_id: str):
+        """Record the start (or resumption) of the execution."""
+        self._append({"t": "begin", "plan_id": plan_id, "at": datetime.now().isoformat()}, durable=True)
+
+    def intent(self, action_id: str, data: Dict[str, Any]) -> int:
+        """Durably record an operation before it is performed.
+
+        Args:
+            action_id: Plan action performing the operation
+            data: What is needed to reverse it
+
+        Returns:
+            Operation ID to pass to ``done``
+        """
+        with self._cond:
+            op = self._next_op
+            self._next_op += 1
+        self._append({"t": "intent", "op": op, "action_id": action_id, "data": data}, durable=True)
+        return op
+
+    def done(self, op: int, data: Dict[str, Any], durable: bool = False):
+        """Record that an operation finished, with its final rollback data.
+
+        Pass durable=True when something destructive follows (e.g. the
+        source removal after an archive), so a crash during it cannot
+        leave the operation looking unfinished.
+        """
+        self._append({"t": "done", "op": op, "data": data}, durable=durable)
+
+    def end(self, status: str):
+        """Durably record that the execution stopped with a final status."""
+        self._append({"t": "end", "status": status, "at": datetime.now().isoformat()}, durable=True)
+
+    def flush(self):
+        """Sync every record appended so far."""
+        with self._cond:
+            self._wait_durable(self._appended)
+
+    def close(self):
+        """Sync buffered records and close the file."""
+        with self._cond:
+            self._wait_durable(self._appended)
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _append(self, record: Dict[str, Any], durable: bool):
+        """Queue a record, syncing when it must be durable or a batch is due."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._cond:
+            self._buffer.append(line)
+            self._appended += 1
+            if (
+                durable
+                or len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_sync >= self.flush_seconds
+            ):
+                self._wait_durable(self._appended)
+
+    def _wait_durable(self, target: int):
+        """Block until record number target is synced; caller holds the lock.
+
+        The first waiter syncs; records appended meanwhile are committed
+        together by the next sync instead of one fsync each.
+        """
+        while self._durable < target:
+            if self._syncing:
+                self._cond.wait()
+                continue
+            lines, self._buffer = self._buffer, []
+            upto = self._appended
+            self._syncing = True
+            self._cond.release()
+            try:
+                self._write(lines)
+            except BaseException:
+                self._cond.acquire()
+                self._buffer[:0] = lines
+                self._syncing = False
+                self._cond.notify_all()
+                raise
+            self._cond.acquire()
+            self._syncing = False
+            self._durable = upto
+            self._last_sync = time.monotonic()
+            self._cond.notify_all()
+
+    def _write(self, lines: List[str]):
+        """Append lines and fsync; only one thread at a time gets here."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+def read_journal(path: Path) -> Dict[str, Any]:
+    """Read a rollback journal.
+
+    Returns:
+        Dict with "execution_id", "plan_id", "started_at", "status"
+        (None if the execution never recorded its end), "operations"
+        (finished operations in order, each with its "action_id") and
+        "incomplete" (operations with an intent but no done record)
+    """
+    return _scan(path)[0]
+
+
+def _scan(path: Path) -> Tuple[Dict[str, Any], int, int]:
+    """Parse a journal; returns (state, last operation ID, bytes of complete records)."""
+    path = Path(path)
+    plan_id = started_at = status = None
+    intents: Dict[int, Dict[str, Any]] = {}
+    finished: Dict[int, Dict[str, Any]] = {}
+    last_op = valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            # A crash mid-write leaves a truncated last line; ignore it
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            valid_bytes += len(line)
+            kind = record.get("t")
+            if kind == "begin":
+                plan_id = record["plan_id"]
+                started_at = started_at or record["at"]
+                status = None
+            elif kind == "intent":
+                intents[record["op"]] = {**record["data"], "action_id": record["action_id"]}
+                last_op = max(last_op, record["op"])
+            elif kind == "done" and record["op"] in intents:
+                finished[record["op"]] = {**record["data"], "action_id": intents[record["op"]]["action_id"]}
+            elif kind == "end":
+                status = record["status"]
+
+    operations, seen = [], set()
+    for op in sorted(finished):
+        # A resumed action can finish the same operation twice
+        key = json.dumps(finished[op], sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            operations.append(finished[op])
+    # An interrupted operation that a resumed run redid and finished is not incomplete
+    redone = {json.dumps(intents[op], sort_keys=True) for op in finished}
+    incomplete = [
+        {"op": op, **intents[op]} for op in sorted(intents)
+        if op not in finished and json.dumps(intents[op], sort_keys=True) not in redone
+    ]
+    return {
+        "execution_id": path.stem,
+        "plan_id": plan_id,
+        "started_at": started_at,
+        "status": status,
+        "operations": operations,
+        "incomplete": incomplete
+    }, last_op, valid_bytes
+
+
+def _has_ended(path: Path) -> bool:
+    """Check the last complete record of a journal without reading all of it."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(size - _TAIL_BYTES, 0))
+        tail = f.read()
+    # The last element is "" after a complete line, or a torn record
+    lines = tail.split(b"\n")
+    if len(lines) < 2:
+        return False
+    try:
+        return json.loads(lines[-2]).get("t") == "end"
+    except ValueError:
+        # Cut by the seek, or corrupt; read the whole journal instead
+        return False
+
+
+def recover_unfinished() -> List[Dict[str, Any]]:
+    """Find executions whose journal has no end record.
+
+    Finished journals are recognised from their last few kilobytes;
+    only unfinished ones are read in full.
+
+    Returns:
+        read_journal results of executions that did not finish, most
+        recently modified first
+    """
+    root = Path(settings.rollback_dir)
+    if not root.exists():
+        return []
+
+    paths = sorted(root.glob("*.journal"), key=lambda p: p.stat().st_mtime, reverse=True)
+    unfinished = []
+    for path in paths:
+        try:
+            if _has_ended(path):
+                continue
+            state = read_journal(path)
+        except OSError:
+            continue
+        unfinished.append(state)
+    return unfinished
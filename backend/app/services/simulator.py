@@ -0,0 +1,242 @@
+"""What-if simulation of drive state after running plans."""
+
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from app.models import DriveStatus
+from app.utils.helpers import get_drive_letter, normalize_path, is_subpath
+
+
+# Action types that remove data from their source
+REMOVAL_ACTIONS = {"CLEANUP", "DELETE_TO_RECYCLE", "PRUNE"}
+
+# Action types that relocate data from source to target
+RELOCATION_ACTIONS = {"MOVE", "EXPORT_IMPORT_WSL", "ARCHIVE"}
+
+# Overlap kinds reported per plan
+OVERLAP_ALREADY_REMOVED = "already_removed"
+OVERLAP_RELOCATED_SOURCE = "relocated_source"
+OVERLAP_NESTED_SOURCE = "nested_source"
+
+
+class PlanSimulator:
+    """Projects post-plan drive usage for many plans at once.
+
+    Actions from all plans are pooled into a candidate list and turned
+    into a matrix of byte deltas (actions x drives). Each plan is a row
+    of a selection matrix, so the projected usage of every plan is one
+    matrix product. Overlaps between actions are resolved with pairwise
+    corrections in the same vectorized step:
+
+    - An action on data an earlier action removed is dropped.
+    - An action on data an earlier action relocated (e.g. a Docker PRUNE
+      after the Docker MOVE) takes effect on the relocation's target
+      drive instead of the source.
+    - An action on a folder containing data earlier actions already
+      handled only counts the remaining bytes; per selection, the
+      selected children's bytes are deducted up to the folder's size.
+    """
+
+    def __init__(self, drives: List[Dict[str, Any]], system_drive: str = "C"):
+        """Initialize simulator with current drive state."""
+        self.drives = drives
+        self.system_drive = system_drive
+        self.letters = [d["letter"] for d in drives]
+        self._index = {letter: i for i, letter in enumerate(self.letters)}
+        self.total = np.array([d["total_bytes"] for d in drives], dtype=np.float64)
+        self.used = np.array([d["used_bytes"] for d in drives], dtype=np.float64)
+
+        self.actions: List[Dict[str, Any]] = []
+        self._deltas = np.zeros((0, len(drives)))
+        self._removal_cover = np.zeros((0, 0), dtype=bool)
+        # Bytes of earlier nested action i inside parent j, at [j, i]
+        self._nested_bytes = np.zeros((0, 0))
+        self._sizes = np.zeros(0)
+        self._pairs: List[Tuple[int, int, str]] = []
+        self._pair_deltas = np.zeros((0, len(drives)))
+
+    # ==================== Candidate pool ====================
+
+    def _drive_of(self, action: Dict[str, Any], key: str) -> Optional[int]:
+        """Return the drive index of an action path."""
+        letter = get_drive_letter(action.get(key) or "")
+        if letter is None and key == "source_path":
+            letter = self.system_drive
+        return self._index.get(letter)
+
+    def _base_delta(self, action: Dict[str, Any]) -> np.ndarray:
+        """Byte delta per drive of an action in isolation."""
+        row = np.zeros(len(self.letters))
+        size = action.get("size_bytes", 0)
+        source = self._drive_of(action, "source_path")
+        if source is not None:
+            row[source] -= size
+        if action["type"] in RELOCATION_ACTIONS:
+            target = self._drive_of(action, "target_path")
+            if target is not None:
+                row[target] += size
+        return row
+
+    def build_pool(self, actions: List[Dict[str, Any]]):
+        """Build delta and overlap matrices for an ordered candidate pool.
+
+        Order matters: overlaps are resolved against earlier actions.
+        """
+        n = len(actions)
+        self.actions = actions
+        self._deltas = np.array([self._base_delta(a) for a in actions]).reshape(n, len(self.letters))
+        self._removal_cover = np.zeros((n, n), dtype=bool)
+        self._nested_bytes = np.zeros((n, n))
+        self._sizes = np.array([a.get("size_bytes", 0) for a in actions], dtype=np.float64)
+        self._pairs = []
+        pair_rows = []
+
+        paths = [normalize_path(a.get("source_path")) for a in actions]
+
+        for j, action in enumerate(actions):
+            if paths[j] is None:
+                continue
+            for i in range(j):
+                earlier = actions[i]
+                if paths[i] is None:
+                    continue
+
+                if is_subpath(paths[j], paths[i]):
+                    if earlier["type"] in REMOVAL_ACTIONS:
+                        self._removal_cover[j, i] = True
+                    elif earlier["type"] in RELOCATION_ACTIONS:
+                        # Shift j's source-side delta to where i put the data
+                        source = self._drive_of(action, "source_path")
+                        target = self._drive_of(earlier, "target_path")
+                        row = np.zeros(len(self.letters))
+                        if source is not None and target is not None:
+                            freed = -self._deltas[j, source]
+                            row[source] += freed
+                            row[target] -= freed
+                        self._pairs.append((i, j, OVERLAP_RELOCATED_SOURCE))
+                        pair_rows.append(row)
+
+                elif is_subpath(paths[i], paths[j]):
+                    # j contains data i already handled; deducted per selection
+                    self._nested_bytes[j, i] = earlier.get("size_bytes", 0)
+                    self._pairs.append((i, j, OVERLAP_NESTED_SOURCE))
+                    pair_rows.append(np.zeros(len(self.letters)))
+
+        self._pair_deltas = np.array(pair_rows).reshape(len(pair_rows), len(self.letters))
+
+    # ==================== Simulation ====================
+
+    def simulate_selections(self, selections: np.ndarray) -> Dict[str, np.ndarray]:
+        """Project drive state for many selections of the candidate pool.
+
+        Args:
+            selections: Boolean matrix (variants x pool actions)
+
+        Returns:
+            Dict of arrays: "used_bytes", "percent_used" and "status_code"
+            (variants x drives), "fits" (variants), "removed_overlap"
+            (variants x actions) and "pair_overlap" (variants x pairs).
+        """
+        selected = np.asarray(selections, dtype=bool)
+        if selected.ndim == 1:
+            selected = selected[np.newaxis, :]
+
+        # Drop actions whose data an earlier selected action already removed
+        removed = selected & ((selected.astype(np.int32) @ self._removal_cover.T.astype(np.int32)) > 0)
+        effective = selected & ~removed
+
+        used = self.used + effective.astype(np.float64) @ self._deltas
+
+        # Count only what the selected children left of each parent, never below zero
+        covered = effective.astype(np.float64) @ self._nested_bytes.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            handled = np.where(self._sizes > 0, np.clip(covered, 0, self._sizes) / self._sizes, 0.0)
+        used = used - (effective * handled) @ self._deltas
+
+        if self._pairs:
+            first = np.array([p[0] for p in self._pairs])
+            second = np.array([p[1] for p in self._pairs])
+            pair_overlap = effective[:, first] & effective[:, second]
+            used = used + pair_overlap.astype(np.float64) @ self._pair_deltas
+        else:
+            pair_overlap = np.zeros((len(selected), 0), dtype=bool)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(self.total > 0, used / self.total * 100, 0.0)
+
+        # Same thresholds as DriveScanner: >80 critical, >50 warning
+        status_code = np.select([percent > 80, percent > 50], [2, 1], default=0)
+
+        return {
+            "used_bytes": used,
+            "percent_used": percent,
+            "status_code": status_code,
+            "fits": np.all(used <= self.total, axis=1),
+            "removed_overlap": removed,
+            "pair_overlap": pair_overlap
+        }
+
+    def simulate_plans(self, plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Project drive state after each plan and report overlaps."""
+        # Pool identical actions across plans, preserving first-seen order
+        pool: List[Dict[str, Any]] = []
+        keys: Dict[tuple, int] = {}
+        memberships = []
+        for plan in plans:
+            members = []
+            for action in plan.get("actions", []):
+                key = (
+                    action["type"], action.get("source_path"), action.get("target_path"),
+                    action.get("size_bytes", 0), action.get("command")
+                )
+                if key not in keys:
+                    keys[key] = len(pool)
+                    pool.append(action)
+                members.append(keys[key])
+            memberships.append(members)
+
+        self.build_pool(pool)
+        selections = np.zeros((len(plans), len(pool)), dtype=bool)
+        for row, members in enumerate(memberships):
+            selections[row, members] = True
+
+        result = self.simulate_selections(selections)
+        statuses = [DriveStatus.HEALTHY, DriveStatus.WARNING, DriveStatus.CRITICAL]
+
+        reports = []
+        for row, plan in enumerate(plans):
+            # Report each plan's own action ids, not the pooled ones
+            ids = {}
+            for idx, action in zip(memberships[row], plan.get("actions", [])):
+                ids.setdefault(idx, action.get("id"))
+
+            overlaps = [
+                {"action_id": ids[j], "overlaps_action_id": ids[i], "kind": OVERLAP_ALREADY_REMOVED}
+                for j in np.nonzero(result["removed_overlap"][row])[0]
+                for i in np.nonzero(self._removal_cover[j] & selections[row])[0][:1]
+            ]
+            overlaps += [
+                {"action_id": ids[j], "overlaps_action_id": ids[i], "kind": kind}
+                for (i, j, kind), hit in zip(self._pairs, result["pair_overlap"][row]) if hit
+            ]
+
+            drives = []
+            for col, letter in enumerate(self.letters):
+                used = int(result["used_bytes"][row, col])
+                drives.append({
+                    "letter": letter,
+                    "total_bytes": int(self.total[col]),
+                    "used_bytes": used,
+                    "free_bytes": int(self.total[col]) - used,
+                    "delta_bytes": used - int(self.used[col]),
+                    "percent_used": round(float(result["percent_used"][row, col]), 2),
+                    "status": statuses[result["status_code"][row, col]].value
+                })
+
+            reports.append({
+                "plan_id": plan.get("id"),
+                "drives": drives,
+                "fits": bool(result["fits"][row]),
+                "overlaps": overlaps
+            })
+
+        return reports
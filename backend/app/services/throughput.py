@@ -0,0 +1,262 @@
+"""Measured throughput model for plan and progress time estimates."""
+
+from typing import Dict, Any, List, Optional, Iterable
+from pathlib import Path
+from datetime import datetime, timedelta
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from app.config import settings
+from app.utils.helpers import get_drive_letter
+
+
+# Blend factor for learned rates (weight of the newest sample)
+LEARNING_RATE = 0.3
+
+# Action types whose duration is driven by copying bytes between drives
+COPY_ACTIONS = {"MOVE", "EXPORT_IMPORT_WSL", "ARCHIVE"}
+
+# Probe block size
+PROBE_BLOCK_BYTES = 1024 * 1024
+
+
+class ThroughputModel:
+    """Estimates action durations from drive benchmarks and past executions.
+
+    Two sources of data are kept in a JSON cache:
+
+    - Drive benchmarks: sequential read/write bytes per second per drive,
+      measured with a short probe and refreshed after a TTL.
+    - Learned rates: bytes and files per second per action type and
+      source/target drive pair, blended from completed executions.
+
+    Learned rates win over benchmarks; without either, an action keeps
+    the heuristic ``estimated_seconds`` it was generated with. Actions
+    that carry a ``file_count`` take the slower of their byte- and
+    file-limited durations, so cleaning many small files isn't
+    estimated from its few bytes.
+    """
+
+    def __init__(self, cache_file: Path):
+        """Initialize model and load cached measurements."""
+        self.cache_file = cache_file
+        self.drives: Dict[str, Dict[str, Any]] = {}
+        self.rates: Dict[str, Dict[str, Any]] = {}
+        # Drives whose probe failed, with when; retried after the TTL
+        self._failed: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load cached measurements from disk."""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            self.drives = data.get("drives", {})
+            self.rates = data.get("rates", {})
+        except (OSError, ValueError):
+            self.drives = {}
+            self.rates = {}
+
+    def _save(self):
+        """Persist measurements to disk."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"drives": self.drives, "rates": self.rates}, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+
+    # ==================== Drive benchmarks ====================
+
+    def needs_benchmark(self, letter: str) -> bool:
+        """Check whether a drive has no benchmark or an expired one."""
+        ttl = timedelta(hours=settings.throughput_cache_ttl_hours)
+        failed_at = self._failed.get(letter)
+        if failed_at and datetime.now() - failed_at <= ttl:
+            return False
+        entry = self.drives.get(letter)
+        if not entry:
+            return True
+        measured_at = datetime.fromisoformat(entry["measured_at"])
+        return datetime.now() - measured_at > ttl
+
+    def benchmark_path(self, directory: Path) -> Dict[str, float]:
+        """Measure sequential write and read speed in a directory.
+
+        Writes incompressible blocks until either the probe size or the
+        probe time budget is reached, fsyncs, then reads the file back
+        after asking the OS to drop it from the page cache.
+        """
+        probe = directory / f".reclaim_probe_{uuid.uuid4().hex}"
+        block = os.urandom(PROBE_BLOCK_BYTES)
+        budget = settings.throughput_probe_seconds / 2
+
+        try:
+            written = 0
+            start = time.perf_counter()
+            with open(probe, "wb", buffering=0) as f:
+                while written < settings.throughput_probe_bytes:
+                    f.write(block)
+                    written += len(block)
+                    if time.perf_counter() - start > budget:
+                        break
+                os.fsync(f.fileno())
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            write_seconds = time.perf_counter() - start
+
+            read = 0
+            start = time.perf_counter()
+            with open(probe, "rb", buffering=0) as f:
+                while True:
+                    chunk = f.read(PROBE_BLOCK_BYTES)
+                    if not chunk:
+                        break
+                    read += len(chunk)
+            read_seconds = time.perf_counter() - start
+        finally:
+            try:
+                probe.unlink()
+            except OSError:
+                pass
+
+        return {
+            "write_bps": written / max(write_seconds, 1e-6),
+            "read_bps": read / max(read_seconds, 1e-6)
+        }
+
+    def benchmark_drive(self, letter: str) -> Optional[Dict[str, Any]]:
+        """Benchmark a drive by letter and cache the result."""
+        try:
+            result = self.benchmark_path(Path(f"{letter}:\\"))
+        except OSError:
+            # Unwritable or missing drive; don't probe it again on every plan
+            self._failed[letter] = datetime.now()
+            return None
+
+        entry = {**result, "measured_at": datetime.now().isoformat()}
+        with self._lock:
+            self.drives[letter] = entry
+            self._save()
+        return entry
+
+    async def ensure_benchmarked(self, letters: Iterable[str]):
+        """Benchmark drives whose measurement is missing or stale."""
+        for letter in letters:
+            if self.needs_benchmark(letter):
+                await asyncio.to_thread(self.benchmark_drive, letter)
+
+    # ==================== Learned rates ====================
+
+    @staticmethod
+    def _rate_key(action_type: str, source_drive: Optional[str], target_drive: Optional[str]) -> str:
+        """Build the learned-rate key for an action type and drive pair."""
+        return f"{action_type}|{source_drive or '-'}|{target_drive or '-'}"
+
+    def record(
+        self,
+        action: Dict[str, Any],
+        bytes_processed: int,
+        files_processed: int,
+        seconds: float
+    ):
+        """Blend a completed action's measured rates into the model."""
+        if seconds <= 0 or (bytes_processed <= 0 and files_processed <= 0):
+            return
+
+        key = self._rate_key(
+            action["type"],
+            get_drive_letter(action.get("source_path") or ""),
+            get_drive_letter(action.get("target_path") or "")
+        )
+        bps = bytes_processed / seconds
+        fps = files_processed / seconds
+
+        with self._lock:
+            entry = self.rates.get(key)
+            if entry:
+                entry["bytes_per_second"] += LEARNING_RATE * (bps - entry["bytes_per_second"])
+                # Entries cached before files were tracked start from this sample
+                previous_fps = entry.get("files_per_second", fps)
+                entry["files_per_second"] = previous_fps + LEARNING_RATE * (fps - previous_fps)
+                entry["samples"] += 1
+            else:
+                entry = {"bytes_per_second": bps, "files_per_second": fps, "samples": 1}
+                self.rates[key] = entry
+            entry["updated_at"] = datetime.now().isoformat()
+            self._save()
+
+    # ==================== Estimates ====================
+
+    def bytes_per_second(self, action: Dict[str, Any]) -> Optional[float]:
+        """Return the expected throughput of an action, if known."""
+        source_drive = get_drive_letter(action.get("source_path") or "")
+        target_drive = get_drive_letter(action.get("target_path") or "")
+
+        learned = self.rates.get(self._rate_key(action["type"], source_drive, target_drive))
+        if learned and learned["bytes_per_second"] > 0:
+            return learned["bytes_per_second"]
+
+        if action["type"] in COPY_ACTIONS:
+            source = self.drives.get(source_drive or "")
+            target = self.drives.get(target_drive or "")
+            if source and target:
+                rate = min(source["read_bps"], target["write_bps"])
+                # WSL export writes a tar, then import reads and writes it again
+                if action["type"] == "EXPORT_IMPORT_WSL":
+                    rate /= 2
+                return rate
+
+        return None
+
+    def files_per_second(self, action: Dict[str, Any]) -> Optional[float]:
+        """Return the learned file rate of an action, if known."""
+        learned = self.rates.get(self._rate_key(
+            action["type"],
+            get_drive_letter(action.get("source_path") or ""),
+            get_drive_letter(action.get("target_path") or "")
+        ))
+        if learned and learned.get("files_per_second", 0) > 0:
+            return learned["files_per_second"]
+        return None
+
+    def estimate_seconds(self, action: Dict[str, Any]) -> int:
+        """Estimate an action's duration from measured rates."""
+        estimates = []
+        rate = self.bytes_per_second(action)
+        if rate is not None:
+            estimates.append(action["size_bytes"] / rate)
+        file_rate = self.files_per_second(action)
+        if file_rate is not None and action.get("file_count"):
+            estimates.append(action["file_count"] / file_rate)
+
+        if not estimates:
+            return action.get("estimated_seconds", 60)
+        return max(1, int(max(estimates)))
+
+    def apply_estimates(self, plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rewrite action and plan time estimates in place from measured rates."""
+        for plan in plans:
+            for action in plan.get("actions", []):
+                action["estimated_seconds"] = self.estimate_seconds(action)
+            plan["estimated_minutes"] = sum(
+                a.get("estimated_seconds", 0) for a in plan.get("actions", [])
+            ) // 60
+        return plans
+
+
+# Global throughput model
+_throughput_model: Optional[ThroughputModel] = None
+
+
+def get_throughput_model() -> ThroughputModel:
+    """Get or create the shared throughput model."""
+    global _throughput_model
+    if _throughput_model is None:
+        _throughput_model = ThroughputModel(Path(settings.throughput_cache_file))
+    return _throughput_model
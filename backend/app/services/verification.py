@@ -0,0 +1,258 @@
+"""Content verification of copied, moved and restored data."""
+
+from typing import Dict, Any, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+from app.config import settings
+from app.storage.hash_cache import HashCache
+
+
+# Supported hash algorithms; blake2b is the fastest one in the standard library
+ALGORITHMS = {
+    "blake2b": lambda: hashlib.blake2b(digest_size=16),
+    "sha256": hashlib.sha256
+}
+
+
+class VerificationError(OSError):
+    """Raised when data at a destination does not match its source or manifest."""
+
+
+def manifest_path(execution_id: str, action_id: str) -> Path:
+    """Where the manifest of an execution's action is kept."""
+    return Path(settings.verification_dir) / execution_id / f"{action_id}.json"
+
+
+def save_manifest(manifest: Dict[str, Any], path: Path):
+    """Write a manifest atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    """Read a manifest saved by save_manifest."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _join(root: Path, rel: str) -> Path:
+    """Path of a manifest entry; "" or "." is the root itself."""
+    return root if rel in ("", ".") else root / rel
+
+
+class Verifier:
+    """Hashes files in a worker pool, with a persistent hash cache.
+
+    A manifest records the size and hash of every file of an action:
+    ``{"algorithm", "source", "target", "bytes", "files": {rel: [size, hash]}}``.
+    Files whose device, inode, size and mtime match the cache are not
+    read again, so re-verifying after a resume or checking a rename
+    costs one stat per file.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "blake2b",
+        workers: int = 4,
+        chunk_bytes: int = 1024 * 1024,
+        cache_path: Optional[Path] = None,
+        io=None
+    ):
+        """Initialize verifier.
+
+        Args:
+            algorithm: Hash algorithm (see ALGORITHMS)
+            workers: Parallel hashing threads
+            chunk_bytes: Read size
+            cache_path: Hash cache database; None disables caching
+            io: Optional IOController that rate-limits and prioritizes reads
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.io = io
+        self.cache = HashCache(cache_path, algorithm) if cache_path else None
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> "Verifier":
+        """Create a verifier with the configured workers and hash cache."""
+        kwargs.setdefault("workers", settings.verify_workers)
+        kwargs.setdefault("cache_path", Path(settings.verify_hash_cache))
+        return cls(**kwargs)
+
+    def close(self):
+        """Flush and close the hash cache."""
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _enter_thread(self):
+        """Pool initializer: register the worker with the IOController."""
+        if self.io:
+            self.io.enter_thread()
+
+    # ==================== Hashing ====================
+
+    def hash_file(self, path: Path) -> Tuple[int, str]:
+        """Return (size, hash) of a file, reading it only on a cache miss."""
+        st = os.stat(path)
+        if self.cache:
+            digest = self.cache.get(st)
+            if digest:
+                return st.st_size, digest
+
+        hasher = ALGORITHMS[self.algorithm]()
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                if self.io:
+                    self.io.throttle(len(chunk))
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        if self.cache:
+            after = os.stat(path)
+            if (after.st_size, after.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+                self.cache.put(st, digest)
+        return st.st_size, digest
+
+    def compare(self, source: Path, target: Path) -> Tuple[int, str]:
+        """Hash a copied file on both sides; raise if they differ."""
+        size, digest = self.hash_file(source)
+        try:
+            target_size, target_digest = self.hash_file(target)
+        except FileNotFoundError:
+            raise VerificationError(f"Verification failed: {target} is missing")
+        if (target_size, target_digest) != (size, digest):
+            raise VerificationError(f"Verification failed: {target} does not match {source}")
+        return size, digest
+
+    # ==================== Trees ====================
+
+    def session(self, source: Path, target: Path) -> "VerificationSession":
+        """Start verifying a copy while it is still in progress."""
+        return VerificationSession(self, Path(source), Path(target))
+
+    def verify_tree(self, source: Path, target: Path, files: Optional[List[Tuple[str, int]]] = None) -> Dict[str, Any]:
+        """Compare every file of a copied file or tree and return its manifest."""
+        source, target = Path(source), Path(target)
+        if files is None:
+            files = _list_files(source)
+        session = self.session(source, target)
+        session.submit(files)
+        return session.finish()
+
+    def check(self, root: Path, manifest: Dict[str, Any]):
+        """Check files under root against a manifest, e.g. after a restore.
+
+        Raises:
+            VerificationError: If any file is missing or differs
+        """
+        if manifest.get("algorithm", self.algorithm) != self.algorithm:
+            raise ValueError(f"Manifest uses {manifest['algorithm']}, not {self.algorithm}")
+        root = Path(root)
+        entries = list(manifest["files"].items())
+
+        def check_one(item) -> Optional[str]:
+            rel, (size, digest) = item
+            path = _join(root, rel)
+            try:
+                if self.hash_file(path) != (size, digest):
+                    return f"{path} does not match its manifest"
+            except FileNotFoundError:
+                return f"{path} is missing"
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.workers, initializer=self._enter_thread) as pool:
+            problems = [p for p in pool.map(check_one, entries) if p]
+        if problems:
+            raise VerificationError(
+                f"Verification failed for {len(problems)} files: " + "; ".join(problems[:5])
+            )
+
+
+class VerificationSession:
+    """Verifies batches of files on its own pool as a copy produces them.
+
+    Copy workers submit each batch as soon as it lands, so hashing runs
+    alongside the rest of the copy instead of after it.
+    """
+
+    def __init__(self, verifier: Verifier, source: Path, target: Path):
+        """Initialize session."""
+        self.verifier = verifier
+        self.source = source
+        self.target = target
+        self._pool = ThreadPoolExecutor(max_workers=verifier.workers, initializer=verifier._enter_thread)
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, files: List[Tuple[str, int]]):
+        """Queue (relative path, size) pairs for verification; thread-safe."""
+        if not files:
+            return
+        future = self._pool.submit(self._verify_batch, list(files))
+        with self._lock:
+            self._futures.append(future)
+
+    def _verify_batch(self, files: List[Tuple[str, int]]) -> Dict[str, List]:
+        """Compare a batch of files."""
+        return {
+            rel: list(self.verifier.compare(_join(self.source, rel), _join(self.target, rel)))
+            for rel, _ in files
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Wait for all batches and return the manifest; raises on any mismatch."""
+        try:
+            files: Dict[str, List] = {}
+            with self._lock:
+                futures = list(self._futures)
+            for future in futures:
+                files.update(future.result())
+        finally:
+            self.close()
+        return {
+            "algorithm": self.verifier.algorithm,
+            "source": str(self.source),
+            "target": str(self.target),
+            "bytes": sum(size for size, _ in files.values()),
+            "files": files
+        }
+
+    def close(self):
+        """Stop the pool, dropping batches that have not started."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _list_files(root: Path) -> List[Tuple[str, int]]:
+    """(relative path, size) of every regular file under root."""
+    if not root.is_dir() or root.is_symlink():
+        return [("", root.stat().st_size)]
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.is_symlink():
+                continue
+            rel = name if rel_dir == "." else os.path.join(rel_dir, name)
+            files.append((rel, path.stat().st_size))
+    return files
@@ -0,0 +1,464 @@
+"""Streaming compressed archives with a random-access index."""
+
+from typing import Dict, Any, List, Tuple, Callable, Optional, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+import bisect
+import gzip
+import hashlib
+import io as io_module
+import json
+import lzma
+import os
+import tarfile
+
+
+# Progress callback: (bytes_delta, files_delta)
+ProgressCallback = Callable[[int, int], None]
+
+# Archive suffix per compression
+SUFFIXES = {"xz": ".tar.xz", "gz": ".tar.gz"}
+
+INDEX_SUFFIX = ".index.jsonl"
+
+
+def _compress_block(data: bytes, compression: str, level: int) -> bytes:
+    """Compress one block as a self-contained xz stream or gzip member."""
+    if compression == "xz":
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _decompress_block(data: bytes, compression: str) -> bytes:
+    """Decompress one block written by _compress_block."""
+    if compression == "xz":
+        return lzma.decompress(data, format=lzma.FORMAT_XZ)
+    return gzip.decompress(data)
+
+
+def index_path_for(archive_path: Path) -> Path:
+    """Return the index file that accompanies an archive."""
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+class _BlockWriter:
+    """File-like sink that compresses fixed-size blocks on a thread pool.
+
+    Blocks are compressed independently, so the output is a valid
+    multi-stream .tar.xz (or multi-member .tar.gz) that standard tools
+    read, and any block can be decompressed on its own. At most
+    ``max_pending`` blocks are in flight, which bounds memory regardless
+    of the tree size.
+    """
+
+    def __init__(self, out, compression: str, level: int, block_bytes: int, pool: ThreadPoolExecutor,
+                 max_pending: int, on_block: Callable[[int, int, int], None]):
+        """Initialize writer."""
+        self.out = out
+        self.compression = compression
+        self.level = level
+        self.block_bytes = block_bytes
+        self.pool = pool
+        self.max_pending = max_pending
+        self.on_block = on_block
+        self._buffer = bytearray()
+        self._pending: deque = deque()
+        self._raw_offset = 0
+        self.compressed_bytes = 0
+
+    def write(self, data) -> int:
+        """Buffer data and submit full blocks for compression."""
+        self._buffer += data
+        while len(self._buffer) >= self.block_bytes:
+            self._submit(bytes(self._buffer[:self.block_bytes]))
+            del self._buffer[:self.block_bytes]
+        return len(data)
+
+    def _submit(self, block: bytes):
+        """Queue a block, draining the oldest when too many are in flight."""
+        future: Future = self.pool.submit(_compress_block, block, self.compression, self.level)
+        self._pending.append((self._raw_offset, future))
+        self._raw_offset += len(block)
+        while len(self._pending) > self.max_pending:
+            self._drain_one()
+
+    def _drain_one(self):
+        """Write the oldest compressed block, preserving order."""
+        raw_offset, future = self._pending.popleft()
+        compressed = future.result()
+        self.on_block(raw_offset, self.compressed_bytes, len(compressed))
+        self.out.write(compressed)
+        self.compressed_bytes += len(compressed)
+
+    def close(self):
+        """Flush the final partial block and all pending blocks."""
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._drain_one()
+
+
+class _BlockReader(io_module.RawIOBase):
+    """Readable stream of an archive's decompressed bytes from a given offset."""
+
+    def __init__(self, archive, compression: str, blocks: List[Tuple[int, int, int]], start: int):
+        """Initialize reader at uncompressed offset start."""
+        self.archive = archive
+        self.compression = compression
+        self.blocks = blocks
+        self._index = max(bisect.bisect_right([b[0] for b in blocks], start) - 1, 0)
+        self._data = b""
+        self._skip = start - blocks[self._index][0] if blocks else 0
+
+    def readable(self) -> bool:
+        """Stream is readable."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Decompress blocks on demand."""
+        while not self._data:
+            if self._index >= len(self.blocks):
+                return 0
+            _, compressed_offset, length = self.blocks[self._index]
+            self.archive.seek(compressed_offset)
+            self._data = _decompress_block(self.archive.read(length), self.compression)[self._skip:]
+            self._skip = 0
+            self._index += 1
+        count = min(len(buffer), len(self._data))
+        buffer[:count] = self._data[:count]
+        self._data = self._data[count:]
+        return count
+
+
+class ArchiveEngine:
+    """Streams a file or tree into a compressed tar with a restore index.
+
+    Files are read in chunks and fed to a streaming tar writer; the tar
+    stream is cut into blocks that a thread pool compresses in parallel
+    (lzma and zlib release the GIL). The index, written alongside as
+    ``<archive>.index.jsonl``, records each member's tar offset, size
+    and SHA-256 (hashed as it streams in) and the block table, so a
+    single file is restored by decompressing only the blocks that hold
+    it, and extracted files are checked against their recorded hashes.
+    """
+
+    def __init__(
+        self,
+        compression: str = "xz",
+        level: int = 6,
+        workers: int = 4,
+        block_bytes: int = 4 * 1024 * 1024,
+        chunk_bytes: int = 1024 * 1024,
+        on_progress: Optional[ProgressCallback] = None,
+        io=None
+    ):
+        """Initialize archive engine.
+
+        Args:
+            compression: "xz" (higher ratio) or "gz" (faster)
+            level: Compression level (xz 0-9, gz 1-9)
+            workers: Compression threads
+            block_bytes: Uncompressed bytes per independently compressed block
+            chunk_bytes: Read size for source files
+            on_progress: Called with (bytes, files) deltas as files are archived
+            io: Optional IOController that rate-limits and prioritizes reads
+        """
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.compression = compression
+        self.level = level
+        self.workers = workers
+        self.block_bytes = block_bytes
+        self.chunk_bytes = chunk_bytes
+        self.on_progress = on_progress
+        self.io = io
+
+    def archive_name(self, source: Path, tag: str) -> str:
+        """Archive file name for a source, e.g. "Downloads-<tag>.tar.xz"."""
+        return f"{source.name}-{tag}{SUFFIXES[self.compression]}"
+
+    # ==================== Create ====================
+
+    def archive(self, source: Path, archive_path: Path) -> Dict[str, Any]:
+        """Write source into a compressed tar at archive_path.
+
+        Returns:
+            Stats with "bytes" and "files" read, "compressed_bytes",
+            "archive" and "index" paths
+        """
+        source = Path(source)
+        archive_path = Path(archive_path)
+        if not source.exists():
+            raise FileNotFoundError(f"Source not found: {source}")
+        if archive_path.exists():
+            raise FileExistsError(f"Archive already exists: {archive_path}")
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+        index_path = index_path_for(archive_path)
+        tmp_archive = archive_path.with_name(archive_path.name + ".partial")
+        tmp_index = index_path.with_name(index_path.name + ".partial")
+        total_bytes, total_files = 0, 0
+
+        try:
+            with open(tmp_archive, "wb") as out, open(tmp_index, "w", encoding="utf-8") as index, \
+                    ThreadPoolExecutor(max_workers=self.workers) as pool:
+                index.write(json.dumps({
+                    "format": SUFFIXES[self.compression],
+                    "compression": self.compression,
+                    "block_bytes": self.block_bytes,
+                    "source": str(source)
+                }) + "\n")
+
+                def on_block(raw_offset: int, compressed_offset: int, length: int):
+                    index.write(json.dumps({"block": [raw_offset, compressed_offset, length]}) + "\n")
+
+                writer = _BlockWriter(
+                    out, self.compression, self.level, self.block_bytes, pool,
+                    max_pending=self.workers * 2, on_block=on_block
+                )
+                with tarfile.open(
+                    fileobj=writer, mode="w|", format=tarfile.PAX_FORMAT, copybufsize=self.chunk_bytes
+                ) as tar:
+                    for path, arcname in self._walk(source):
+                        size = self._add(tar, path, arcname, index)
+                        if size is not None:
+                            total_bytes += size
+                            total_files += 1
+                writer.close()
+                compressed_bytes = writer.compressed_bytes
+                out.flush()
+                os.fsync(out.fileno())
+
+            os.replace(tmp_index, index_path)
+            os.replace(tmp_archive, archive_path)
+        except BaseException:
+            for partial in (tmp_archive, tmp_index):
+                if partial.exists():
+                    partial.unlink()
+            raise
+
+        return {
+            "bytes": total_bytes,
+            "files": total_files,
+            "compressed_bytes": compressed_bytes,
+            "archive": str(archive_path),
+            "index": str(index_path)
+        }
+
+    @staticmethod
+    def _walk(source: Path) -> Iterator[Tuple[Path, str]]:
+        """Yield (path, archive name) for source and everything beneath it."""
+        base = source.name
+        yield source, base
+        if not source.is_dir() or source.is_symlink():
+            return
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            rel = os.path.relpath(dirpath, source)
+            prefix = base if rel == "." else f"{base}/{Path(rel).as_posix()}"
+            for name in dirnames + sorted(filenames):
+                yield Path(dirpath) / name, f"{prefix}/{name}"
+
+    def _add(self, tar: tarfile.TarFile, path: Path, arcname: str, index) -> Optional[int]:
+        """Add one entry; returns the file size for regular files, else None."""
+        try:
+            tarinfo = tar.gettarinfo(str(path), arcname=arcname)
+        except FileNotFoundError:
+            return None
+        if tarinfo is None:
+            # Sockets and other special files cannot be archived
+            return None
+
+        offset = tar.offset
+        if not tarinfo.isreg():
+            tar.addfile(tarinfo)
+            return None
+
+        with open(path, "rb") as f:
+            reader = _ThrottledReader(f, self.io, self.on_progress)
+            tar.addfile(tarinfo, reader)
+        index.write(json.dumps({
+            "file": arcname, "offset": offset, "size": tarinfo.size, "mtime": tarinfo.mtime,
+            "sha256": reader.hasher.hexdigest()
+        }) + "\n")
+        if self.on_progress:
+            self.on_progress(0, 1)
+        return tarinfo.size
+
+    # ==================== Read back ====================
+
+    @staticmethod
+    def read_index(index_path: Path) -> Tuple[Dict[str, Any], List[Tuple[int, int, int]], Dict[str, Dict[str, Any]]]:
+        """Load an index: (header, block table, files by archive name)."""
+        blocks: List[Tuple[int, int, int]] = []
+        files: Dict[str, Dict[str, Any]] = {}
+        with open(index_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                entry = json.loads(line)
+                if "block" in entry:
+                    blocks.append(tuple(entry["block"]))
+                else:
+                    files[entry["file"]] = entry
+        return header, blocks, files
+
+    @classmethod
+    def restore_file(cls, archive_path: Path, name: str, destination: Path) -> Path:
+        """Extract one file, decompressing only the blocks that hold it.
+
+        Args:
+            archive_path: Archive to read
+            name: Member name as listed in the index
+            destination: Directory to write the file into
+
+        Returns:
+            Path of the restored file
+        """
+        header, blocks, files = cls.read_index(index_path_for(archive_path))
+        entry = files.get(name)
+        if entry is None:
+            raise FileNotFoundError(f"{name} is not in {archive_path}")
+
+        destination = Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        target = destination / Path(name).name
+
+        with open(archive_path, "rb") as archive:
+            stream = io_module.BufferedReader(_BlockReader(archive, header["compression"], blocks, entry["offset"]))
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                member = tar.next()
+                if member is None or member.name != name:
+                    raise OSError(f"Index does not match archive at {name}")
+                source = tar.extractfile(member)
+                with open(target, "wb") as out:
+                    while True:
+                        chunk = source.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+        os.utime(target, (entry["mtime"], entry["mtime"]))
+        return target
+
+    @classmethod
+    def extract(
+        cls,
+        archive_path: Path,
+        destination: Path,
+        on_progress: Optional[ProgressCallback] = None,
+        skip_existing: bool = False
+    ) -> Dict[str, int]:
+        """Extract a whole archive, checking every file against the index.
+
+        Args:
+            archive_path: Archive to read
+            destination: Directory that receives the archived top-level entry
+            on_progress: Called with (bytes, files) deltas as files are written
+            skip_existing: Leave files that already exist with the indexed size
+
+        Returns:
+            Stats with extracted "files" and "bytes", "skipped" existing
+            files, and "verified" files whose content matched the hash
+            recorded when archiving (archives from before hashes were
+            recorded are only checked by size)
+        """
+        header, blocks, files = cls.read_index(index_path_for(archive_path))
+        destination = Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        total_files, total_bytes, skipped, verified = 0, 0, 0, 0
+
+        with open(archive_path, "rb") as archive:
+            stream = io_module.BufferedReader(_BlockReader(archive, header["compression"], blocks, 0))
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                for member in tar:
+                    parts = Path(member.name).parts
+                    if Path(member.name).is_absolute() or ".." in parts:
+                        raise OSError(f"Unsafe member name in {archive_path}: {member.name}")
+                    target = destination.joinpath(*parts)
+                    if member.isdir():
+                        target.mkdir(parents=True, exist_ok=True)
+                    elif member.issym():
+                        if not os.path.lexists(target):
+                            target.parent.mkdir(parents=True, exist_ok=True)
+                            os.symlink(member.linkname, target)
+                    elif member.isreg():
+                        entry = files.get(member.name)
+                        if entry is None or entry["size"] != member.size:
+                            raise OSError(f"Verification failed: {member.name} does not match the index")
+                        if skip_existing and target.is_file() and target.stat().st_size == entry["size"]:
+                            skipped += 1
+                            continue
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        source = tar.extractfile(member)
+                        hasher = hashlib.sha256()
+                        with open(target, "wb") as out:
+                            while True:
+                                chunk = source.read(1024 * 1024)
+                                if not chunk:
+                                    break
+                                hasher.update(chunk)
+                                out.write(chunk)
+                                if on_progress:
+                                    on_progress(len(chunk), 0)
+                        if target.stat().st_size != entry["size"]:
+                            raise OSError(f"Verification failed: {target} is incomplete")
+                        if "sha256" in entry:
+                            if hasher.hexdigest() != entry["sha256"]:
+                                raise OSError(f"Verification failed: {target} content does not match its hash")
+                            verified += 1
+                        os.utime(target, (entry["mtime"], entry["mtime"]))
+                        total_files += 1
+                        total_bytes += member.size
+                        if on_progress:
+                            on_progress(0, 1)
+
+        if total_files + skipped != len(files):
+            raise OSError(
+                f"Verification failed: {len(files) - total_files - skipped} indexed files missing from {archive_path}"
+            )
+        return {"files": total_files, "bytes": total_bytes, "skipped": skipped, "verified": verified}
+
+    @classmethod
+    def verify(cls, archive_path: Path):
+        """Read the whole archive back and check it against its index."""
+        header, blocks, files = cls.read_index(index_path_for(archive_path))
+        seen = 0
+        # tarfile's own decompressors stop after the first xz stream or gzip member
+        with open(archive_path, "rb") as archive:
+            stream = io_module.BufferedReader(_BlockReader(archive, header["compression"], blocks, 0))
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                for member in tar:
+                    entry = files.get(member.name)
+                    if entry is None:
+                        continue
+                    if member.size != entry["size"]:
+                        raise OSError(
+                            f"Verification failed: {member.name} has {member.size} bytes, expected {entry['size']}"
+                        )
+                    seen += 1
+        if seen != len(files):
+            raise OSError(f"Verification failed: {len(files) - seen} indexed files missing from {archive_path}")
+
+
+class _ThrottledReader:
+    """File wrapper that hashes, reports progress and honors I/O limits on each read."""
+
+    def __init__(self, f, io, on_progress: Optional[ProgressCallback]):
+        """Wrap an open file."""
+        self.f = f
+        self.io = io
+        self.on_progress = on_progress
+        # Hash of exactly the bytes tarfile read into the archive
+        self.hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read a chunk."""
+        data = self.f.read(size)
+        if data:
+            self.hasher.update(data)
+            if self.io:
+                self.io.throttle(len(data))
+            if self.on_progress:
+                self.on_progress(len(data), 0)
+        return data
@@ -0,0 +1,454 @@
+"""Content-addressed, deduplicating backup store."""
+
+from typing import Dict, Any, List, Tuple, Callable, Optional, Iterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import uuid
+from app.config import settings
+from app.storage.hash_cache import HashCache
+
+
+# Progress callback: (bytes_delta, files_delta)
+ProgressCallback = Callable[[int, int], None]
+
+# Errors meaning a file vanished or is locked; such files are skipped
+_UNREADABLE = (FileNotFoundError, PermissionError)
+
+# gc must not run while a backup is referencing objects it has not listed yet
+_gc_cond = threading.Condition()
+_backups_running = 0
+_collecting = False
+
+
+class BackupStore:
+    """Stores file contents once, keyed by SHA-256, with per-backup manifests.
+
+    ``objects/ab/abcdef...`` holds each distinct content once; a snapshot
+    is a JSONL manifest under ``snapshots/`` that references objects by
+    hash. Backing up overlapping folders, or the same folder again, only
+    writes contents the store has not seen, and the hash cache means
+    unchanged files are not even read. New files are hashed while being
+    copied into the store, so each is read exactly once.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        workers: int = 8,
+        chunk_bytes: int = 1024 * 1024,
+        batch_files: int = 256,
+        on_progress: Optional[ProgressCallback] = None,
+        io=None
+    ):
+        """Initialize backup store.
+
+        Args:
+            root: Store directory
+            workers: Parallel hash/copy threads
+            chunk_bytes: Read size for source files
+            batch_files: Files handed to the pool at once
+            on_progress: Called with (bytes, files) deltas as files are backed up
+            io: Optional IOController that rate-limits and prioritizes reads
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.batch_files = batch_files
+        self.on_progress = on_progress
+        self.io = io
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> "BackupStore":
+        """Open the store configured under backup_location."""
+        return cls(
+            Path(settings.backup_location) / settings.backup_store_dir,
+            workers=settings.backup_workers,
+            **kwargs
+        )
+
+    def object_path(self, digest: str) -> Path:
+        """Path of the object holding a content hash."""
+        return self.objects_dir / digest[:2] / digest
+
+    def snapshot_path(self, snapshot_id: str) -> Path:
+        """Path of a snapshot manifest."""
+        return self.snapshots_dir / f"{snapshot_id}.jsonl"
+
+    def has_snapshot(self, snapshot_id: str) -> bool:
+        """Check whether a snapshot was completed."""
+        return self.snapshot_path(snapshot_id).exists()
+
+    # ==================== Backup ====================
+
+    def backup(self, source: Path, snapshot_id: str) -> Dict[str, Any]:
+        """Back up a file or tree as a snapshot.
+
+        Returns:
+            Stats with "files" and "bytes" backed up, "new_bytes" actually
+            written to the store, "hashed_bytes" read to compute hashes,
+            and "skipped" (files that vanished or were locked)
+        """
+        source = Path(source)
+        if not os.path.lexists(source):
+            raise FileNotFoundError(f"Source not found: {source}")
+        with _backup_running():
+            return self._backup(source, snapshot_id)
+
+    def _backup(self, source: Path, snapshot_id: str) -> Dict[str, Any]:
+        """Write a snapshot; the caller has registered the running backup."""
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        (self.objects_dir / "tmp").mkdir(parents=True, exist_ok=True)
+
+        manifest = self.snapshot_path(snapshot_id)
+        tmp_manifest = manifest.with_name(manifest.name + ".partial")
+        stats = {"files": 0, "bytes": 0, "new_bytes": 0, "hashed_bytes": 0, "skipped": 0}
+        cache = HashCache(self.root / "hash-cache.db", "sha256")
+
+        try:
+            with open(tmp_manifest, "w", encoding="utf-8") as out, \
+                    ThreadPoolExecutor(max_workers=self.workers, initializer=self._enter_thread) as pool:
+                out.write(json.dumps({
+                    "snapshot": snapshot_id,
+                    "source": str(source),
+                    "created_at": datetime.now().isoformat()
+                }) + "\n")
+
+                batch: List[Tuple[Path, str]] = []
+                for path, rel, kind in self._walk(source):
+                    if kind == "dir":
+                        out.write(json.dumps({"dir": rel}) + "\n")
+                    elif kind == "link":
+                        out.write(json.dumps({"link": rel, "target": os.readlink(path)}) + "\n")
+                    else:
+                        batch.append((path, rel))
+                        if len(batch) >= self.batch_files:
+                            self._store_batch(pool, cache, batch, out, stats)
+                            batch = []
+                if batch:
+                    self._store_batch(pool, cache, batch, out, stats)
+
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_manifest, manifest)
+        except BaseException:
+            if tmp_manifest.exists():
+                tmp_manifest.unlink()
+            raise
+        finally:
+            cache.close()
+
+        return stats
+
+    def _enter_thread(self):
+        """Pool initializer: register the worker with the IOController."""
+        if self.io:
+            self.io.enter_thread()
+
+    @staticmethod
+    def _walk(source: Path) -> Iterator[Tuple[Path, str, str]]:
+        """Yield (path, relative name, kind) for source and everything beneath it."""
+        if source.is_symlink():
+            yield source, ".", "link"
+            return
+        if not source.is_dir():
+            yield source, ".", "file"
+            return
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel_dir = os.path.relpath(dirpath, source)
+            if rel_dir != ".":
+                yield Path(dirpath), Path(rel_dir).as_posix(), "dir"
+            for name in dirnames + filenames:
+                path = Path(dirpath) / name
+                rel = name if rel_dir == "." else f"{Path(rel_dir).as_posix()}/{name}"
+                if path.is_symlink():
+                    yield path, rel, "link"
+                elif name in filenames and stat.S_ISREG(path.lstat().st_mode):
+                    yield path, rel, "file"
+
+    def _store_batch(self, pool, cache: HashCache, batch, out, stats: Dict[str, int]):
+        """Store a batch of files in parallel and append them to the manifest."""
+        results = pool.map(lambda item: self._store_file(cache, item[0]), batch)
+        for (_, rel), result in zip(batch, results):
+            if result is None:
+                stats["skipped"] += 1
+                continue
+            digest, st, hashed, written = result
+            out.write(json.dumps({
+                "file": rel, "hash": digest, "size": st.st_size,
+                "mtime": st.st_mtime, "mode": stat.S_IMODE(st.st_mode)
+            }) + "\n")
+            stats["files"] += 1
+            stats["bytes"] += st.st_size
+            stats["hashed_bytes"] += hashed
+            stats["new_bytes"] += written
+
+    def _store_file(self, cache: HashCache, path: Path) -> Optional[Tuple[str, os.stat_result, int, int]]:
+        """Store one file's contents.
+
+        Returns:
+            (hash, stat, bytes hashed, bytes written), or None if unreadable
+        """
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except _UNREADABLE:
+            return None
+
+        digest = cache.get(st)
+        if digest and self.object_path(digest).exists():
+            if self.io:
+                self.io.throttle()
+            if self.on_progress:
+                self.on_progress(st.st_size, 1)
+            return digest, st, 0, 0
+
+        # Hash while copying into a temporary object, so the file is read once
+        tmp = self.objects_dir / "tmp" / uuid.uuid4().hex
+        hasher = hashlib.sha256()
+        hashed = 0
+        try:
+            with open(path, "rb") as src, open(tmp, "wb") as dst:
+                while True:
+                    chunk = src.read(self.chunk_bytes)
+                    if not chunk:
+                        break
+                    if self.io:
+                        self.io.throttle(len(chunk))
+                    hasher.update(chunk)
+                    dst.write(chunk)
+                    hashed += len(chunk)
+                    if self.on_progress:
+                        self.on_progress(len(chunk), 0)
+        except _UNREADABLE:
+            tmp.unlink(missing_ok=True)
+            return None
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        digest = hasher.hexdigest()
+        target = self.object_path(digest)
+        written = 0
+        if target.exists():
+            tmp.unlink()
+        else:
+            target.parent.mkdir(exist_ok=True)
+            os.replace(tmp, target)
+            written = hashed
+
+        # Only cache the hash if the file did not change while it was read
+        try:
+            after = os.stat(path, follow_symlinks=False)
+            if (after.st_size, after.st_mtime_ns) == (st.st_size, st.st_mtime_ns) and hashed == st.st_size:
+                cache.put(st, digest)
+        except _UNREADABLE:
+            pass
+        if self.on_progress:
+            self.on_progress(0, 1)
+        return digest, st, hashed, written
+
+    # ==================== Restore ====================
+
+    def read_snapshot(self, snapshot_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Load a snapshot: (header, entries)."""
+        path = self.snapshot_path(snapshot_id)
+        if not path.exists():
+            raise FileNotFoundError(f"Snapshot not found: {snapshot_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            entries = [json.loads(line) for line in f]
+        return header, entries
+
+    def manifest(self, snapshot_id: str) -> Tuple[Path, Dict[str, Any]]:
+        """A snapshot's source path and its files as a verification manifest."""
+        header, entries = self.read_snapshot(snapshot_id)
+        files = {e["file"]: [e["size"], e["hash"]] for e in entries if "file" in e}
+        return Path(header["source"]), {
+            "algorithm": "sha256",
+            "source": header["source"],
+            "bytes": sum(size for size, _ in files.values()),
+            "files": files
+        }
+
+    def restore(self, snapshot_id: str, destination: Optional[Path] = None) -> Dict[str, int]:
+        """Recreate a snapshot's files.
+
+        Args:
+            snapshot_id: Snapshot to restore
+            destination: Where to recreate the source (default: its original path)
+
+        Returns:
+            Stats with restored "files" and "bytes"
+        """
+        header, entries = self.read_snapshot(snapshot_id)
+        root = Path(destination or header["source"])
+        single = any(e.get("file") == "." or e.get("link") == "." for e in entries)
+        if not single:
+            root.mkdir(parents=True, exist_ok=True)
+
+        def target_of(rel: str) -> Path:
+            return root if rel == "." else root / rel
+
+        files = []
+        for entry in entries:
+            if "dir" in entry:
+                target_of(entry["dir"]).mkdir(parents=True, exist_ok=True)
+            elif "link" in entry:
+                link = target_of(entry["link"])
+                if not os.path.lexists(link):
+                    link.parent.mkdir(parents=True, exist_ok=True)
+                    os.symlink(entry["target"], link)
+            else:
+                files.append(entry)
+
+        with ThreadPoolExecutor(max_workers=self.workers, initializer=self._enter_thread) as pool:
+            list(pool.map(lambda e: self._restore_file(e, target_of(e["file"])), files))
+
+        return {"files": len(files), "bytes": sum(e["size"] for e in files)}
+
+    def _restore_file(self, entry: Dict[str, Any], target: Path):
+        """Copy one object back out of the store."""
+        if self.io:
+            self.io.throttle(entry["size"])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".restoring")
+        shutil.copyfile(self.object_path(entry["hash"]), tmp)
+        os.chmod(tmp, entry["mode"] | stat.S_IWUSR)
+        os.replace(tmp, target)
+        os.utime(target, (entry["mtime"], entry["mtime"]))
+        if self.on_progress:
+            self.on_progress(entry["size"], 1)
+
+    # ==================== Housekeeping ====================
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Headers of all completed snapshots."""
+        if not self.snapshots_dir.exists():
+            return []
+        headers = []
+        for path in sorted(self.snapshots_dir.glob("*.jsonl")):
+            with open(path, "r", encoding="utf-8") as f:
+                headers.append(json.loads(f.readline()))
+        return headers
+
+    def delete_snapshot(self, snapshot_id: str):
+        """Forget a snapshot; its objects are freed by the next gc."""
+        self.snapshot_path(snapshot_id).unlink(missing_ok=True)
+
+    def expire(
+        self,
+        max_age_days: int = 0,
+        max_bytes: int = 0,
+        keep: Iterable[str] = ()
+    ) -> Dict[str, int]:
+        """Delete snapshots beyond the retention limits, oldest first, then gc.
+
+        Args:
+            max_age_days: Delete snapshots older than this (0 = no age limit)
+            max_bytes: Delete snapshots until their contents fit (0 = no size limit)
+            keep: Snapshot IDs never deleted, e.g. those of a running execution
+
+        Returns:
+            Stats with deleted "snapshots", removed "objects" and freed "bytes"
+        """
+        keep = set(keep)
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        hashes: Dict[str, set] = {}
+        sizes: Dict[str, int] = {}
+        refs: Counter = Counter()
+        headers = sorted(self.list_snapshots(), key=lambda h: h["created_at"])
+        for header in headers:
+            _, entries = self.read_snapshot(header["snapshot"])
+            files = {e["hash"]: e["size"] for e in entries if "hash" in e}
+            hashes[header["snapshot"]] = set(files)
+            sizes.update(files)
+            refs.update(files.keys())
+        total = sum(sizes[digest] for digest in refs)
+
+        deleted = 0
+        for header in headers:
+            snapshot_id = header["snapshot"]
+            too_old = max_age_days and datetime.fromisoformat(header["created_at"]) < cutoff
+            too_big = max_bytes and total > max_bytes
+            if not (too_old or too_big):
+                # Oldest first, so every later snapshot is within the limits too
+                break
+            if snapshot_id in keep:
+                continue
+            self.delete_snapshot(snapshot_id)
+            deleted += 1
+            for digest in hashes[snapshot_id]:
+                refs[digest] -= 1
+                if refs[digest] == 0:
+                    total -= sizes[digest]
+
+        removed = self.gc() if deleted else {"objects": 0, "bytes": 0}
+        return {"snapshots": deleted, **removed}
+
+    def gc(self) -> Dict[str, int]:
+        """Remove objects no snapshot references.
+
+        Waits for running backups to finish and holds new ones back, so
+        objects of a snapshot still being written are not collected.
+
+        Returns:
+            Stats with removed "objects" and freed "bytes"
+        """
+        global _collecting
+        with _gc_cond:
+            while _backups_running or _collecting:
+                _gc_cond.wait()
+            _collecting = True
+        try:
+            return self._gc()
+        finally:
+            with _gc_cond:
+                _collecting = False
+                _gc_cond.notify_all()
+
+    def _gc(self) -> Dict[str, int]:
+        """Remove unreferenced objects; the caller holds off backups."""
+        referenced = set()
+        for header in self.list_snapshots():
+            _, entries = self.read_snapshot(header["snapshot"])
+            referenced.update(e["hash"] for e in entries if "hash" in e)
+
+        removed = {"objects": 0, "bytes": 0}
+        if not self.objects_dir.exists():
+            return removed
+        for bucket in self.objects_dir.iterdir():
+            if bucket.name == "tmp" or not bucket.is_dir():
+                continue
+            for obj in bucket.iterdir():
+                if obj.name not in referenced:
+                    removed["bytes"] += obj.stat().st_size
+                    removed["objects"] += 1
+                    obj.unlink()
+        return removed
+
+
+
+@contextmanager
+def _backup_running():
+    """Register a running backup so gc waits for it; waits out a running gc."""
+    global _backups_running
+    with _gc_cond:
+        while _collecting:
+            _gc_cond.wait()
+        _backups_running += 1
+    try:
+        yield
+    finally:
+        with _gc_cond:
+            _backups_running -= 1
+            _gc_cond.notify_all()
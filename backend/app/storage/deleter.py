@@ -0,0 +1,203 @@
+"""Parallel deletion engine for clearing cache and temp directories."""
+
+from typing import Dict, Any, List, Tuple, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+import errno
+import os
+import stat
+import threading
+from app.utils.helpers import is_link, is_link_stat
+
+
+# Errors meaning a file is locked, in use or protected; such files are skipped
+_IN_USE_ERRNOS = {
+    errno.EACCES, errno.EPERM, errno.EBUSY, getattr(errno, "ETXTBSY", errno.EBUSY)
+}
+
+# Progress callback: (bytes_delta, files_delta)
+ProgressCallback = Callable[[int, int], None]
+
+
+class DeleteEngine:
+    """Deletes the contents of a directory tree with a worker pool.
+
+    Directories are scanned in parallel with ``os.scandir``; each scan
+    yields the subdirectories to scan next and the directory's files,
+    split into batches that workers unlink. Once every file is gone, the
+    emptied directories are removed bottom-up. Files that are locked or
+    in use are skipped, and so are the directories that still hold them.
+    Symlinks and junctions are removed without following them.
+    """
+
+    def __init__(
+        self,
+        workers: int = 16,
+        batch_files: int = 1000,
+        on_progress: Optional[ProgressCallback] = None,
+        io=None
+    ):
+        """Initialize deletion engine.
+
+        Args:
+            workers: Parallel scan/unlink threads
+            batch_files: Maximum files unlinked per task
+            on_progress: Called with (bytes, files) deltas as files are freed
+            io: Optional IOController whose priority the workers run at
+        """
+        self.workers = workers
+        self.batch_files = batch_files
+        self.on_progress = on_progress
+        self.io = io
+        self._lock = threading.Lock()
+        self._stats = {"bytes": 0, "files": 0, "dirs": 0, "skipped": 0}
+
+    def _add(self, bytes_delta: int = 0, files_delta: int = 0, dirs_delta: int = 0, skipped: int = 0):
+        """Accumulate stats and forward freed bytes to the callback."""
+        with self._lock:
+            self._stats["bytes"] += bytes_delta
+            self._stats["files"] += files_delta
+            self._stats["dirs"] += dirs_delta
+            self._stats["skipped"] += skipped
+            if self.on_progress and (bytes_delta or files_delta):
+                self.on_progress(bytes_delta, files_delta)
+
+    # ==================== Entry point ====================
+
+    def clear(self, root: Path, remove_root: bool = False) -> Dict[str, int]:
+        """Delete everything under root.
+
+        Args:
+            root: Directory to clear
+            remove_root: Also remove root itself once it is empty
+
+        Returns:
+            Stats with freed "bytes", deleted "files" and "dirs", and
+            "skipped" (entries left in place because they were in use)
+        """
+        root = Path(root)
+        if not root.is_dir() or is_link(root):
+            raise NotADirectoryError(f"Not a directory: {root}")
+        if root.parent == root:
+            raise ValueError(f"Refusing to clear a drive root: {root}")
+
+        self._stats = {"bytes": 0, "files": 0, "dirs": 0, "skipped": 0}
+        dirs = self._delete_files(str(root))
+
+        # Deepest first, so every directory is empty by the time it is reached
+        for path in sorted(dirs, key=lambda d: d.count(os.sep), reverse=True):
+            self._remove_dir(path)
+        if remove_root:
+            self._remove_dir(str(root))
+
+        return dict(self._stats)
+
+    # ==================== Files ====================
+
+    def _delete_files(self, root: str) -> List[str]:
+        """Scan and unlink all files in parallel; return the directories found."""
+        found: List[str] = []
+
+        initializer = self.io.enter_thread if self.io else None
+        with ThreadPoolExecutor(max_workers=self.workers, initializer=initializer) as pool:
+            running = {pool.submit(self._scan, root)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    subdirs, batches = result
+                    found.extend(subdirs)
+                    running.update(pool.submit(self._scan, d) for d in subdirs)
+                    running.update(pool.submit(self._unlink_batch, b) for b in batches)
+
+        return found
+
+    def _scan(self, path: str) -> Optional[Tuple[List[str], List[List[Tuple[str, int]]]]]:
+        """List one directory: (subdirectories, batches of (file, size))."""
+        if self.io:
+            self.io.throttle()
+        subdirs: List[str] = []
+        files: List[Tuple[str, int]] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        # Junctions look like directories; never descend into them
+                        if entry.is_dir(follow_symlinks=False) and not is_link_stat(st):
+                            subdirs.append(entry.path)
+                        else:
+                            files.append((entry.path, st.st_size))
+                    except FileNotFoundError:
+                        continue
+        except FileNotFoundError:
+            return None
+        except PermissionError:
+            self._add(skipped=1)
+            return None
+
+        batches = [files[i:i + self.batch_files] for i in range(0, len(files), self.batch_files)]
+        return subdirs, batches
+
+    def _unlink_batch(self, batch: List[Tuple[str, int]]):
+        """Unlink a batch of files, skipping those in use."""
+        if self.io:
+            # Deletes are metadata I/O: priority applies, the byte rate does not
+            self.io.throttle()
+        freed, deleted, skipped = 0, 0, 0
+        for path, size in batch:
+            if self._unlink(path):
+                freed += size
+                deleted += 1
+            else:
+                skipped += 1
+        self._add(freed, deleted, skipped=skipped)
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        """Unlink a file or link. Returns False if it is in use."""
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except IsADirectoryError:
+            # Directory symlinks and junctions on Windows
+            return DeleteEngine._rmdir(path)
+        except OSError as e:
+            if e.errno not in _IN_USE_ERRNOS:
+                raise
+        if os.path.isdir(path):
+            # Windows refuses to unlink directory links; they are removed like directories
+            return DeleteEngine._rmdir(path)
+        # Read-only files need their attribute cleared on Windows
+        try:
+            os.chmod(path, stat.S_IWRITE, follow_symlinks=False)
+            os.unlink(path)
+            return True
+        except (OSError, NotImplementedError):
+            return False
+
+    # ==================== Directories ====================
+
+    @staticmethod
+    def _rmdir(path: str) -> bool:
+        """Remove an empty directory. Returns False if it is not empty or in use."""
+        try:
+            os.rmdir(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            if e.errno in _IN_USE_ERRNOS or e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                return False
+            raise
+
+    def _remove_dir(self, path: str):
+        """Remove an emptied directory, counting it as deleted or skipped."""
+        if self._rmdir(path):
+            self._add(dirs_delta=1)
+        else:
+            self._add(skipped=1)
@@ -0,0 +1,69 @@
+"""Persistent cache of file hashes."""
+
+from typing import Optional
+from pathlib import Path
+import os
+import sqlite3
+import threading
+
+
+class HashCache:
+    """SQLite cache of file hashes keyed on device, inode, size and mtime.
+
+    A file whose inode, size and modification time match a cached entry
+    is assumed unchanged, so its contents are never read again. Entries
+    are per hash algorithm. Lookups and inserts are thread-safe; inserts
+    are committed in batches.
+    """
+
+    def __init__(self, db_path: Path, algorithm: str, batch_size: int = 500):
+        """Open or create the cache database.
+
+        Args:
+            db_path: SQLite database file
+            algorithm: Hash algorithm the cached digests were made with
+            batch_size: Inserts per commit
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.algorithm = algorithm
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, ino INTEGER, algorithm TEXT, size INTEGER, mtime_ns INTEGER, hash TEXT, "
+            "PRIMARY KEY (dev, ino, algorithm))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def get(self, st: os.stat_result) -> Optional[str]:
+        """Cached hash of a file, or None if unknown or changed since."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, hash FROM hashes WHERE dev = ? AND ino = ? AND algorithm = ?",
+                (st.st_dev, st.st_ino, self.algorithm)
+            ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+        return None
+
+    def put(self, st: os.stat_result, digest: str):
+        """Remember a file's hash."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (dev, ino, algorithm, size, mtime_ns, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (st.st_dev, st.st_ino, self.algorithm, st.st_size, st.st_mtime_ns, digest)
+            )
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self):
+        """Commit pending entries and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
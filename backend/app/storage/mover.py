@@ -0,0 +1,391 @@
+"""High-throughput move engine for relocating directory trees."""
+
+from typing import Dict, Any, List, Tuple, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import errno
+import os
+import shutil
+import stat
+import sys
+import threading
+from app.utils.helpers import is_link_stat
+
+
+# Errors meaning the kernel copy path is unavailable for this file pair
+_KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL), getattr(errno, "ENOTSUP", errno.EINVAL)
+}
+
+# Progress callback: (bytes_delta, files_delta)
+ProgressCallback = Callable[[int, int], None]
+
+
+def _remove_readonly(func, path, _exc_info):
+    """rmtree error handler that clears the read-only bit and retries."""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def create_link(link: Path, target: Path):
+    """Point link at target with a directory symlink, or a junction on Windows."""
+    try:
+        os.symlink(target, link, target_is_directory=target.is_dir())
+    except OSError:
+        if sys.platform != "win32" or not target.is_dir():
+            raise
+        # Junctions need no special privilege on Windows
+        import _winapi
+        _winapi.CreateJunction(str(target), str(link))
+
+
+class MoveEngine:
+    """Moves a file or directory tree to a target path and links it back.
+
+    On the same filesystem the move is a single rename. Across devices the
+    tree is copied with a thread pool: large files use kernel-side copy
+    (``copy_file_range``/``sendfile``) or large buffered chunks, small
+    files are copied in batches to amortize per-task overhead. Metadata is
+    preserved, every file is verified, and only then is the source removed
+    and replaced by a link to the target. With a verifier, copied files are
+    also hashed on both sides as they land, and the resulting manifest is
+    kept in ``self.manifest``.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        large_file_bytes: int = 8 * 1024 * 1024,
+        buffer_bytes: int = 8 * 1024 * 1024,
+        batch_files: int = 256,
+        on_progress: Optional[ProgressCallback] = None,
+        io=None,
+        verifier=None
+    ):
+        """Initialize move engine.
+
+        Args:
+            workers: Parallel copy threads
+            large_file_bytes: Files at least this big are copied individually
+            buffer_bytes: Chunk size for kernel and buffered copies
+            batch_files: Maximum small files per copy task
+            on_progress: Called with (bytes, files) deltas as copying advances
+            io: Optional IOController that rate-limits and prioritizes workers
+            verifier: Optional Verifier that hashes copies before the source is removed
+        """
+        self.workers = workers
+        self.large_file_bytes = large_file_bytes
+        self.buffer_bytes = buffer_bytes
+        self.batch_files = batch_files
+        self.on_progress = on_progress
+        self.io = io
+        self.verifier = verifier
+        self.manifest: Optional[Dict[str, Any]] = None
+        self._progress_lock = threading.Lock()
+
+    def _report(self, bytes_delta: int, files_delta: int):
+        """Forward progress to the callback."""
+        if self.on_progress:
+            with self._progress_lock:
+                self.on_progress(bytes_delta, files_delta)
+
+    def _throttle(self, nbytes: int):
+        """Wait for I/O budget before transferring nbytes."""
+        if self.io:
+            self.io.throttle(nbytes)
+
+    # ==================== Entry point ====================
+
+    def move(
+        self,
+        source: Path,
+        target: Path,
+        link: bool = True,
+        journal=None
+    ) -> Dict[str, Any]:
+        """Move source to target, then link source to target.
+
+        Args:
+            source: File or directory to move
+            target: Destination path
+            link: Replace source with a link to target
+            journal: Optional checkpoint journal; phases and finished files
+                are recorded so an interrupted move resumes where it stopped
+
+        Returns:
+            Stats with "bytes", "files", "renamed" (True if the move
+            was a same-filesystem rename) and "manifest" (hashes of the
+            copied files, if a verifier was given and data was copied)
+        """
+        phases = journal.phases if journal else set()
+        files, total = 0, 0
+
+        # A crash between rename and its journal entry leaves only the target
+        if "renaming" in phases and not os.path.lexists(source) and target.exists():
+            journal.record_phase("renamed")
+        renamed = "renamed" in phases
+
+        if not phases & {"renamed", "copied"}:
+            if not source.exists():
+                raise FileNotFoundError(f"Source not found: {source}")
+            resuming = journal is not None and journal.has_progress
+            if target.exists() and (not target.is_dir() or (any(target.iterdir()) and not resuming)):
+                raise FileExistsError(f"Target already exists: {target}")
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            if os.stat(source).st_dev == os.stat(target.parent).st_dev:
+                files, total = self._measure(source)
+                if target.exists():
+                    target.rmdir()
+                if journal:
+                    journal.record_phase("renaming")
+                os.rename(source, target)
+                self._report(total, files)
+                renamed = True
+                if journal:
+                    journal.record_phase("renamed")
+            else:
+                files, total = self.copy_tree(source, target, journal=journal)
+                if journal:
+                    journal.record_phase("copied")
+
+        if not renamed and "removed" not in phases:
+            if os.path.lexists(source):
+                if self.verifier and self.manifest is None:
+                    # Copied before a restart; cached hashes make this cheap
+                    self.manifest = self.verifier.verify_tree(source, target)
+                self.remove_source(source)
+            if journal:
+                journal.record_phase("removed")
+
+        if link and "linked" not in phases:
+            # Anything at the source by now is a link made before a crash
+            if not os.path.lexists(source):
+                create_link(source, target)
+            if journal:
+                journal.record_phase("linked")
+
+        return {"bytes": total, "files": files, "renamed": renamed, "manifest": self.manifest}
+
+    # ==================== Tree copy ====================
+
+    @staticmethod
+    def scan(source: Path) -> Tuple[List[str], List[Tuple[str, int]], List[str]]:
+        """List a tree's directories, files with sizes, and symlinks (relative paths)."""
+        dirs: List[str] = []
+        files: List[Tuple[str, int]] = []
+        links: List[str] = []
+        stack = [""]
+
+        while stack:
+            rel_dir = stack.pop()
+            with os.scandir(source / rel_dir if rel_dir else source) as entries:
+                for entry in entries:
+                    rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    # Junctions are kept as links, never copied through
+                    if is_link_stat(entry.stat(follow_symlinks=False)):
+                        links.append(rel)
+                    elif entry.is_dir(follow_symlinks=False):
+                        dirs.append(rel)
+                        stack.append(rel)
+                    else:
+                        files.append((rel, entry.stat(follow_symlinks=False).st_size))
+
+        return dirs, files, links
+
+    def _measure(self, source: Path) -> Tuple[int, int]:
+        """Count files and bytes under source."""
+        if source.is_file():
+            return 1, source.stat().st_size
+        _, files, _ = self.scan(source)
+        return len(files), sum(size for _, size in files)
+
+    def plan_batches(self, files: List[Tuple[str, int]]) -> List[List[Tuple[str, int]]]:
+        """Group files into copy tasks: one per large file, batches of small ones."""
+        batches: List[List[Tuple[str, int]]] = []
+        current: List[Tuple[str, int]] = []
+        current_bytes = 0
+
+        # Largest first so big copies start early and the tail is small files
+        for rel, size in sorted(files, key=lambda f: f[1], reverse=True):
+            if size >= self.large_file_bytes:
+                batches.append([(rel, size)])
+                continue
+            current.append((rel, size))
+            current_bytes += size
+            if len(current) >= self.batch_files or current_bytes >= self.large_file_bytes:
+                batches.append(current)
+                current, current_bytes = [], 0
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def copy_tree(self, source: Path, target: Path, journal=None) -> Tuple[int, int]:
+        """Copy a file or tree in parallel, preserving metadata, then verify.
+
+        With a journal, files it lists as finished (same size and mtime,
+        and present at the target) are skipped, and each newly copied
+        file is recorded.
+
+        Returns:
+            (files, bytes) under source
+        """
+        if source.is_file():
+            self.copy_file(str(source), str(target), source.stat().st_size)
+            self.verify(source, target, [("", source.stat().st_size)])
+            if self.verifier:
+                self.manifest = self.verifier.verify_tree(source, target)
+            return 1, source.stat().st_size
+
+        dirs, files, links = self.scan(source)
+
+        target.mkdir(parents=True, exist_ok=True)
+        for rel in dirs:
+            (target / rel).mkdir(exist_ok=True)
+        for rel in links:
+            link_path = target / rel
+            if not os.path.lexists(link_path):
+                os.symlink(os.readlink(source / rel), link_path)
+
+        session = self.verifier.session(source, target) if self.verifier else None
+        todo = files
+        if journal and journal.has_progress:
+            todo, done = [], []
+            for rel, size in files:
+                if self._already_copied(source / rel, target / rel, rel, size, journal):
+                    self._report(size, 1)
+                    done.append((rel, size))
+                else:
+                    todo.append((rel, size))
+            if session:
+                session.submit(done)
+
+        def copy_batch(batch: List[Tuple[str, int]]):
+            for rel, size in batch:
+                src = str(source / rel)
+                self.copy_file(src, str(target / rel), size)
+                if journal:
+                    journal.record_file(rel, size, os.stat(src).st_mtime_ns)
+            if session:
+                # Hash this batch while the pool copies the next ones
+                session.submit(batch)
+
+        initializer = self.io.enter_thread if self.io else None
+        try:
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers, initializer=initializer) as pool:
+                    for future in [pool.submit(copy_batch, b) for b in self.plan_batches(todo)]:
+                        future.result()
+            finally:
+                # Keep finished files journaled even when the copy stops early
+                if journal:
+                    journal.flush()
+
+            # Directory times change as files land, so restore them deepest first
+            for rel in sorted(dirs, key=lambda d: d.count(os.sep), reverse=True):
+                shutil.copystat(source / rel, target / rel)
+            shutil.copystat(source, target)
+
+            self.verify(source, target, files)
+            if session:
+                self.manifest = session.finish()
+        finally:
+            if session:
+                session.close()
+        return len(files), sum(size for _, size in files)
+
+    @staticmethod
+    def _already_copied(src: Path, dst: Path, rel: str, size: int, journal) -> bool:
+        """Check a journaled file is unchanged at the source and intact at the target."""
+        try:
+            src_stat = os.stat(src)
+            dst_stat = os.stat(dst)
+        except FileNotFoundError:
+            return False
+        return journal.is_done(rel, size, src_stat.st_mtime_ns) and dst_stat.st_size == size
+
+    def copy_file(self, src: str, dst: str, size: int):
+        """Copy one file's contents and metadata."""
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            if size < self.large_file_bytes or not self._copy_kernel(fsrc, fdst, size):
+                self._copy_buffered(fsrc, fdst, size)
+        shutil.copystat(src, dst)
+        self._report(0, 1)
+
+    def _copy_kernel(self, fsrc, fdst, size: int) -> bool:
+        """Copy with copy_file_range or sendfile. Returns False if unavailable."""
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+
+        for method in ("copy_file_range", "sendfile"):
+            if not hasattr(os, method) or (method == "sendfile" and not sys.platform.startswith("linux")):
+                continue
+            copied = 0
+            try:
+                while copied < size:
+                    count = min(self.buffer_bytes, size - copied)
+                    self._throttle(count)
+                    if method == "copy_file_range":
+                        sent = os.copy_file_range(infd, outfd, count)
+                    else:
+                        sent = os.sendfile(outfd, infd, copied, count)
+                    if sent == 0:
+                        break
+                    copied += sent
+                    self._report(sent, 0)
+            except OSError as e:
+                if copied == 0 and e.errno in _KERNEL_COPY_UNSUPPORTED:
+                    continue
+                raise
+            if copied:
+                # File shrank or grew mid-copy; finish with buffered reads
+                if copied < size:
+                    fsrc.seek(copied)
+                    fdst.seek(copied)
+                    self._copy_buffered(fsrc, fdst, size - copied)
+                return True
+
+        return False
+
+    def _copy_buffered(self, fsrc, fdst, size: int):
+        """Copy with large reusable buffers."""
+        buffer = bytearray(min(self.buffer_bytes, max(size, 1)))
+        view = memoryview(buffer)
+        while True:
+            read = fsrc.readinto(buffer)
+            if not read:
+                break
+            self._throttle(read)
+            fdst.write(view[:read])
+            self._report(read, 0)
+
+    # ==================== Verify and clean up ====================
+
+    @staticmethod
+    def verify(source: Path, target: Path, files: List[Tuple[str, int]]):
+        """Check every copied file exists with the source's size and mtime."""
+        for rel, size in files:
+            src = source / rel if rel else source
+            dst = target / rel if rel else target
+            try:
+                src_stat = os.stat(src)
+                dst_stat = os.stat(dst)
+            except FileNotFoundError:
+                raise OSError(f"Verification failed: {dst} is missing")
+            if dst_stat.st_size != src_stat.st_size:
+                raise OSError(
+                    f"Verification failed: {dst} has {dst_stat.st_size} bytes, expected {src_stat.st_size}"
+                )
+            # Allow for coarse timestamp resolution on FAT/exFAT targets
+            if abs(dst_stat.st_mtime - src_stat.st_mtime) > 2:
+                raise OSError(f"Verification failed: {dst} modification time differs")
+
+    @staticmethod
+    def remove_source(source: Path):
+        """Delete the source after a verified copy."""
+        if source.is_dir() and not source.is_symlink():
+            shutil.rmtree(source, onerror=_remove_readonly)
+        else:
+            source.unlink()
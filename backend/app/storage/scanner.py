@@ -2,7 +2,7 @@
 
 import psutil
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from app.models import Drive, DriveStatus, SpaceConsumer, ConsumerType
 import os
 
@@ -52,6 +52,16 @@ class DriveScanner:
     @staticmethod
     def get_directory_size(path: Path) -> int:
         """Calculate total size of a directory."""
+        return DriveScanner.get_directory_stats(path)[1]
+
+    @staticmethod
+    def get_directory_stats(path: Path) -> Tuple[int, int]:
+        """Count the files in a directory and their total size.
+
+        Returns:
+            Tuple of (files, bytes)
+        """
+        total_files = 0
         total_size = 0
         try:
             for dirpath, dirnames, filenames in os.walk(path):
@@ -59,11 +69,12 @@ class DriveScanner:
                     filepath = os.path.join(dirpath, filename)
                     try:
                         total_size += os.path.getsize(filepath)
+                        total_files += 1
                     except (OSError, FileNotFoundError):
                         continue
         except (PermissionError, OSError):
             pass
-        return total_size
+        return total_files, total_size
 
     @staticmethod
     def identify_space_consumers() -> List[SpaceConsumer]:
@@ -119,12 +130,13 @@ class DriveScanner:
         ]
         for temp_path in temp_paths:
             if temp_path.exists():
-                size = DriveScanner.get_directory_size(temp_path)
+                files, size = DriveScanner.get_directory_stats(temp_path)
                 if size > 0:
                     consumers.append(SpaceConsumer(
                         name=f"Temp - {temp_path.name}",
                         path=str(temp_path),
                         size_bytes=size,
+                        file_count=files,
                         type=ConsumerType.TEMP,
                         last_modified=None
                     ))
@@ -137,12 +149,13 @@ class DriveScanner:
 
         for name, cache_path in cache_paths.items():
             if cache_path.exists():
-                size = DriveScanner.get_directory_size(cache_path)
+                files, size = DriveScanner.get_directory_stats(cache_path)
                 if size > 0:
                     consumers.append(SpaceConsumer(
                         name=name,
                         path=str(cache_path),
                         size_bytes=size,
+                        file_count=files,
                         type=ConsumerType.CACHE,
                         last_modified=None
                     ))
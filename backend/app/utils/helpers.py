@@ -1,7 +1,9 @@
 """Helper functions."""
 
 from pathlib import Path
+from typing import Optional, Union
 import os
+import stat
 
 
 def format_bytes(bytes_value: int) -> str:
@@ -29,6 +31,44 @@ def get_directory_size(path: Path) -> int:
     return total_size
 
 
+def is_link_stat(st: os.stat_result) -> bool:
+    """Check an lstat result for a symlink or a Windows reparse point.
+
+    Junctions are reparse points that ``S_ISLNK`` does not report (and
+    ``os.path.isjunction`` only exists on Python 3.12+); like
+    ``shutil.rmtree``, treat them as links that must not be followed.
+    """
+    attributes = getattr(st, "st_file_attributes", 0)
+    return stat.S_ISLNK(st.st_mode) or bool(attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def is_link(path: Union[str, Path]) -> bool:
+    """Check whether a path is a symlink or a Windows junction."""
+    try:
+        return is_link_stat(os.lstat(path))
+    except OSError:
+        return False
+
+
 def ensure_directory(path: Path):
     """Ensure directory exists."""
     path.mkdir(parents=True, exist_ok=True)
+
+
+def get_drive_letter(path: str) -> Optional[str]:
+    """Return the upper-case drive letter of a Windows path, if it has one."""
+    if path and len(path) >= 2 and path[1] == ":" and path[0].isalpha():
+        return path[0].upper()
+    return None
+
+
+def normalize_path(path: Optional[str]) -> Optional[str]:
+    """Normalize a Windows path for case-insensitive prefix comparison."""
+    if not path:
+        return None
+    return path.replace("/", "\\").rstrip("\\").lower()
+
+
+def is_subpath(path: str, parent: str) -> bool:
+    """Check whether a normalized path equals or lies inside parent."""
+    return path == parent or path.startswith(parent + "\\")
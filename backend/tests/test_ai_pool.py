@@ -0,0 +1,66 @@
+"""Tests for the shared AI client pool."""
+
+import pytest
+from app.ai.pool import AIClientPool
+from app.config import Settings
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_for_same_key():
+    """Test that the same client is returned while the key is unchanged."""
+    pool = AIClientPool(Settings(openai_api_key="sk-test-key-000000000000"))
+
+    async with pool.openai_client() as first:
+        pass
+    async with pool.openai_client() as second:
+        pass
+
+    assert first is not None
+    assert first is second
+    assert not first.client._client.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_rebuilds_client_when_key_changes():
+    """Test that changing the API key rebuilds the client and keeps the old one usable."""
+    settings = Settings(anthropic_api_key="sk-ant-test-key-00000000")
+    pool = AIClientPool(settings)
+
+    async with pool.anthropic_client() as first:
+        settings.anthropic_api_key = "sk-ant-test-key-11111111"
+        async with pool.anthropic_client() as second:
+            assert first is not second
+            # Requests still running on the old client must not fail
+            assert not first.client._client.is_closed
+
+    # Closed once its last request finished, not at shutdown
+    assert first.client._client.is_closed
+    assert not second.client._client.is_closed
+    await pool.aclose()
+    assert second.client._client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_idle_client_is_closed_when_key_changes():
+    """Test that a replaced client without requests is closed right away."""
+    settings = Settings(openai_api_key="sk-test-key-000000000000")
+    pool = AIClientPool(settings)
+
+    async with pool.openai_client() as first:
+        pass
+    settings.openai_api_key = "sk-test-key-111111111111"
+    async with pool.openai_client():
+        pass
+
+    assert first.client._client.is_closed
+    assert pool._retired == []
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_returns_none_without_key():
+    """Test that no client is built when no key is configured."""
+    pool = AIClientPool(Settings(openai_api_key=""))
+    async with pool.openai_client() as client:
+        assert client is None
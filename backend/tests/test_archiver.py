@@ -0,0 +1,103 @@
+"""Tests for the streaming archive engine."""
+
+import os
+import tarfile
+import pytest
+from app.storage.archiver import ArchiveEngine, index_path_for
+
+
+def _make_tree(root):
+    root.mkdir()
+    (root / "sub").mkdir()
+    contents = {}
+    for i in range(30):
+        data = os.urandom(1000 + i * 700) if i % 2 else b"text line\n" * (200 + i)
+        path = root / ("sub" if i % 3 == 0 else ".") / f"file{i}.bin"
+        path.write_bytes(data)
+        contents[path] = data
+    return contents
+
+
+@pytest.mark.parametrize("compression", ["xz", "gz"])
+def test_archive_round_trip_and_single_file_restore(tmp_path, compression):
+    """Test that an archive verifies, lists every file and restores one file intact."""
+    source = tmp_path / "Downloads"
+    contents = _make_tree(source)
+    engine = ArchiveEngine(compression=compression, level=1, workers=3, block_bytes=8192, chunk_bytes=4096)
+    archive_path = tmp_path / "out" / engine.archive_name(source, "abc")
+
+    stats = engine.archive(source, archive_path)
+
+    assert stats["files"] == len(contents)
+    assert stats["bytes"] == sum(len(d) for d in contents.values())
+    assert archive_path.exists() and index_path_for(archive_path).exists()
+    assert not list((tmp_path / "out").glob("*.partial"))
+    ArchiveEngine.verify(archive_path)
+
+    _, blocks, files = ArchiveEngine.read_index(index_path_for(archive_path))
+    assert len(blocks) > 1
+    assert "Downloads/sub/file9.bin" in files
+
+    restored = ArchiveEngine.restore_file(archive_path, "Downloads/sub/file9.bin", tmp_path / "restore")
+    assert restored.read_bytes() == contents[source / "sub" / "file9.bin"]
+
+
+def test_first_stream_readable_by_standard_tar(tmp_path):
+    """Test that a gzip archive is a plain multi-member .tar.gz."""
+    source = tmp_path / "docs"
+    contents = _make_tree(source)
+    engine = ArchiveEngine(compression="gz", level=1, block_bytes=1 << 20)
+    archive_path = tmp_path / engine.archive_name(source, "t")
+    engine.archive(source, archive_path)
+
+    # One block fits the whole tree, so the stdlib reader sees everything
+    with tarfile.open(archive_path, "r:gz") as tar:
+        names = {m.name for m in tar.getmembers() if m.isfile()}
+    assert len(names) == len(contents)
+
+
+def test_archive_reports_progress(tmp_path):
+    """Test that bytes and files are reported as they are read."""
+    source = tmp_path / "src"
+    contents = _make_tree(source)
+    reported = []
+    engine = ArchiveEngine(level=0, chunk_bytes=1024, on_progress=lambda b, f: reported.append((b, f)))
+
+    engine.archive(source, tmp_path / "src.tar.xz")
+
+    assert sum(b for b, _ in reported) == sum(len(d) for d in contents.values())
+    assert sum(f for _, f in reported) == len(contents)
+
+
+def test_archive_refuses_existing_archive(tmp_path):
+    """Test that an existing archive is never overwritten."""
+    source = tmp_path / "src"
+    _make_tree(source)
+    archive_path = tmp_path / "src.tar.xz"
+    archive_path.write_bytes(b"old")
+
+    with pytest.raises(FileExistsError):
+        ArchiveEngine(level=0).archive(source, archive_path)
+    assert archive_path.read_bytes() == b"old"
+
+
+def test_extract_restores_missing_files_and_checks_hashes(tmp_path):
+    """Test that existing files are skipped and extracted ones are hash-checked."""
+    source = tmp_path / "Downloads"
+    contents = _make_tree(source)
+    engine = ArchiveEngine(compression="gz", level=1, block_bytes=8192)
+    archive_path = tmp_path / engine.archive_name(source, "t")
+    engine.archive(source, archive_path)
+    missing = source / "sub" / "file3.bin"
+    missing.unlink()
+
+    stats = ArchiveEngine.extract(archive_path, tmp_path, skip_existing=True)
+
+    assert stats == {"files": 1, "bytes": len(contents[missing]), "skipped": len(contents) - 1, "verified": 1}
+    assert missing.read_bytes() == contents[missing]
+
+    index = index_path_for(archive_path)
+    index.write_text(index.read_text().replace('"sha256": "', '"sha256": "0'))
+    missing.unlink()
+    with pytest.raises(OSError, match="hash"):
+        ArchiveEngine.extract(archive_path, tmp_path, skip_existing=True)
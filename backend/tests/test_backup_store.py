@@ -0,0 +1,141 @@
+"""Tests for the deduplicating backup store."""
+
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+from app.storage.backup_store import BackupStore
+
+
+def _make_tree(root, prefix=b""):
+    (root / "sub").mkdir(parents=True)
+    contents = {}
+    for i in range(12):
+        path = root / ("sub" if i % 2 else ".") / f"f{i}.dat"
+        data = prefix + bytes([i]) * (500 + i)
+        path.write_bytes(data)
+        contents[path.relative_to(root)] = data
+    return contents
+
+
+def test_repeat_backup_reads_and_writes_nothing_new(tmp_path):
+    """Test that unchanged files are neither rehashed nor stored twice."""
+    source = tmp_path / "cache"
+    contents = _make_tree(source)
+    store = BackupStore(tmp_path / "store", workers=3, batch_files=5)
+
+    first = store.backup(source, "one")
+    second = store.backup(source, "two")
+
+    total = sum(len(d) for d in contents.values())
+    assert first["files"] == len(contents)
+    assert first["new_bytes"] == total
+    assert second["bytes"] == total
+    assert second["hashed_bytes"] == 0
+    assert second["new_bytes"] == 0
+
+
+def test_overlapping_folders_store_shared_contents_once(tmp_path):
+    """Test that identical contents in another folder are only referenced."""
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    _make_tree(a)
+    _make_tree(b)
+    (b / "extra.dat").write_bytes(b"new" * 10)
+    store = BackupStore(tmp_path / "store")
+
+    store.backup(a, "a")
+    stats = store.backup(b, "b")
+
+    assert stats["hashed_bytes"] == stats["bytes"]
+    assert stats["new_bytes"] == 30
+
+
+def test_changed_file_is_rehashed_and_restored_to_snapshot(tmp_path):
+    """Test that restore brings back each snapshot's own contents."""
+    source = tmp_path / "cache"
+    contents = _make_tree(source)
+    store = BackupStore(tmp_path / "store")
+    store.backup(source, "before")
+
+    changed = source / "sub" / "f1.dat"
+    changed.write_bytes(b"changed contents")
+    os.utime(changed, ns=(1, 1))
+    after = store.backup(source, "after")
+    assert after["hashed_bytes"] == len(b"changed contents")
+
+    for path in list(source.rglob("*"))[::-1]:
+        path.unlink() if path.is_file() else path.rmdir()
+    store.restore("before")
+
+    for rel, data in contents.items():
+        assert (source / rel).read_bytes() == data
+
+    store.restore("after", tmp_path / "copy")
+    assert (tmp_path / "copy" / "sub" / "f1.dat").read_bytes() == b"changed contents"
+
+
+def test_gc_removes_only_unreferenced_objects(tmp_path):
+    """Test that deleting a snapshot frees only contents no other snapshot uses."""
+    a = tmp_path / "a"
+    a.mkdir()
+    (a / "shared").write_bytes(b"shared")
+    (a / "only_a").write_bytes(b"only in a")
+    b = tmp_path / "b"
+    b.mkdir()
+    (b / "shared").write_bytes(b"shared")
+    store = BackupStore(tmp_path / "store")
+    store.backup(a, "a")
+    store.backup(b, "b")
+
+    store.delete_snapshot("a")
+    removed = store.gc()
+
+    assert removed == {"objects": 1, "bytes": len(b"only in a")}
+    with pytest.raises(FileNotFoundError):
+        store.restore("a")
+    store.restore("b", tmp_path / "restored")
+    assert (tmp_path / "restored" / "shared").read_bytes() == b"shared"
+
+
+def _age_snapshot(store, snapshot_id, days):
+    """Rewrite a snapshot's creation time to make it older."""
+    path = store.snapshot_path(snapshot_id)
+    header, *rest = path.read_text().splitlines(keepends=True)
+    created = (datetime.now() - timedelta(days=days)).isoformat()
+    header = json.dumps({**json.loads(header), "created_at": created}) + "\n"
+    path.write_text(header + "".join(rest))
+
+
+def test_expire_deletes_old_snapshots_and_frees_their_objects(tmp_path):
+    """Test that snapshots past the age limit are deleted unless kept."""
+    for name in ("old", "kept", "new"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "data").write_bytes(name.encode() * 10)
+    store = BackupStore(tmp_path / "store")
+    for name in ("old", "kept", "new"):
+        store.backup(tmp_path / name, name)
+    _age_snapshot(store, "old", 40)
+    _age_snapshot(store, "kept", 40)
+
+    removed = store.expire(max_age_days=30, keep=["kept"])
+
+    assert removed == {"snapshots": 1, "objects": 1, "bytes": 30}
+    assert [h["snapshot"] for h in store.list_snapshots()] == ["kept", "new"]
+
+
+def test_expire_deletes_oldest_snapshots_above_size_limit(tmp_path):
+    """Test that the oldest snapshots go first until the store fits."""
+    for n in range(3):
+        (tmp_path / f"s{n}").mkdir()
+        (tmp_path / f"s{n}" / "data").write_bytes(bytes([n]) * 100)
+    store = BackupStore(tmp_path / "store")
+    for n in range(3):
+        store.backup(tmp_path / f"s{n}", f"s{n}")
+        _age_snapshot(store, f"s{n}", 3 - n)
+
+    removed = store.expire(max_bytes=200)
+
+    assert removed["snapshots"] == 1
+    assert removed["bytes"] == 100
+    assert [h["snapshot"] for h in store.list_snapshots()] == ["s1", "s2"]
@@ -0,0 +1,118 @@
+"""Tests for progress fan-out to WebSocket subscribers."""
+
+import asyncio
+import json
+import pytest
+from app.api.progress import progress_websocket
+from app.models import LogLevel, ExecutionStatus
+from app.services import broadcast
+from app.services.broadcast import ProgressBroadcaster, get_broadcaster
+from app.services.progress import ProgressManager, create_progress_manager, cleanup_progress_manager
+
+
+class _FakeWebSocket:
+    """Records sent messages; optionally slow to send."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.messages = []
+        self.incoming = asyncio.Queue()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.messages.append(json.loads(text))
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+def _apply(messages):
+    """Rebuild the client's view of the logs from snapshot and deltas."""
+    logs = []
+    for message in messages:
+        if message["type"] == "snapshot":
+            logs = [log["message"] for log in message["logs"]]
+        else:
+            logs += [log["message"] for log in message["logs"]]
+    return logs
+
+
+@pytest.mark.asyncio
+async def test_update_is_encoded_once_for_all_subscribers(monkeypatch):
+    """Test that every subscriber receives the same encoded update."""
+    encoded = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(broadcast.json, "dumps", lambda obj: encoded.append(obj) or real_dumps(obj))
+    manager = ProgressManager("test-fanout")
+    await manager.initialize("plan", [])
+    broadcaster = ProgressBroadcaster(manager, interval=0)
+    subscribers = [broadcaster.subscribe() for _ in range(5)]
+
+    await manager.add_log(LogLevel.INFO, "hello")
+    updates = [await asyncio.wait_for(s.queue.get(), timeout=1) for s in subscribers]
+
+    assert len(encoded) == 1
+    assert all(u is updates[0] for u in updates)
+    for subscriber in subscribers:
+        broadcaster.unsubscribe(subscriber)
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_queue_stays_bounded():
+    """Test that a client that never reads keeps at most queue_size updates."""
+    manager = ProgressManager("test-bounded")
+    await manager.initialize("plan", [])
+    broadcaster = ProgressBroadcaster(manager, queue_size=2, interval=0)
+    stuck = broadcaster.subscribe()
+
+    for i in range(20):
+        await manager.add_log(LogLevel.INFO, f"line {i}")
+        await asyncio.sleep(0.005)
+
+    assert stuck.queue.qsize() == 2
+    assert stuck.dropped > 0
+    broadcaster.unsubscribe(stuck)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_catches_up_without_losing_logs(monkeypatch):
+    """Test that a lagging client ends with the same logs as a fast one."""
+    monkeypatch.setattr(broadcast.settings, "progress_push_interval", 0)
+    monkeypatch.setattr(broadcast.settings, "progress_subscriber_queue", 1)
+    manager = create_progress_manager("test-catch-up")
+    await manager.initialize("plan", [])
+    fast, slow = _FakeWebSocket(), _FakeWebSocket(delay=0.02)
+    tasks = [asyncio.create_task(progress_websocket(ws, "test-catch-up", job_queue=None)) for ws in (fast, slow)]
+    await asyncio.sleep(0.01)
+
+    for i in range(30):
+        await manager.add_log(LogLevel.INFO, f"line {i}")
+        await asyncio.sleep(0.002)
+    await manager.set_status(ExecutionStatus.COMPLETED)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+
+    expected = [f"line {i}" for i in range(30)]
+    assert _apply(fast.messages) == expected
+    assert _apply(slow.messages) == expected
+    assert len(slow.messages) < len(fast.messages)
+    assert "test-catch-up" not in broadcast._broadcasters
+    cleanup_progress_manager("test-catch-up")
+
+
+@pytest.mark.asyncio
+async def test_unknown_execution_is_rejected_without_allocating():
+    """Test that subscribing to an unknown ID closes the socket and registers nothing."""
+    from app.services.progress import get_progress_registry
+
+    ws = _FakeWebSocket()
+    await progress_websocket(ws, "test-unknown", job_queue=None)
+    assert ws.close_code == 4404
+    assert ws.messages == []
+    assert "test-unknown" not in get_progress_registry()
+    assert "test-unknown" not in broadcast._broadcasters
@@ -0,0 +1,95 @@
+"""Tests for checkpoint journals and resumable moves."""
+
+import os
+from app.services.checkpoint import CheckpointJournal
+from app.storage.mover import MoveEngine
+
+
+def test_journal_batches_and_survives_reload(tmp_path):
+    """Test that batched entries are durable after flush and reload."""
+    path = tmp_path / "action.journal"
+    journal = CheckpointJournal(path, batch_size=3, flush_seconds=3600)
+
+    journal.record_file("a.txt", 1, 100)
+    journal.record_file("b.txt", 2, 200)
+    assert not path.exists()
+
+    journal.record_file("c.txt", 3, 300)
+    journal.record_phase("copied")
+
+    reloaded = CheckpointJournal(path)
+    assert reloaded.is_done("b.txt", 2, 200)
+    assert not reloaded.is_done("b.txt", 2, 201)
+    assert reloaded.phases == {"copied"}
+
+
+def test_journal_ignores_truncated_tail(tmp_path):
+    """Test that a partially written last line is discarded."""
+    path = tmp_path / "action.journal"
+    path.write_text('{"f": "a.txt", "s": 1, "m": 100}\n{"f": "b.t')
+
+    journal = CheckpointJournal(path)
+
+    assert list(journal.files) == ["a.txt"]
+
+
+def test_journal_appends_after_truncated_tail(tmp_path):
+    """Test that entries recorded after a torn line survive the next reload."""
+    path = tmp_path / "action.journal"
+    path.write_text('{"f": "a.txt", "s": 1, "m": 100}\n{"f": "b.t')
+
+    journal = CheckpointJournal(path, batch_size=1)
+    journal.record_file("c.txt", 3, 300)
+    journal.record_phase("copied")
+
+    reloaded = CheckpointJournal(path)
+    assert list(reloaded.files) == ["a.txt", "c.txt"]
+    assert reloaded.phases == {"copied"}
+
+
+def test_copy_resumes_from_journal(tmp_path):
+    """Test that files recorded as copied are not copied again."""
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    source.mkdir()
+    for i in range(10):
+        (source / f"f{i}.txt").write_text(f"data {i}")
+
+    journal = CheckpointJournal(tmp_path / "move.journal")
+    engine = MoveEngine(workers=2)
+    engine.copy_tree(source, target, journal=journal)
+
+    # Simulate a crash that lost half of the target files
+    for i in range(5):
+        (target / f"f{i}.txt").unlink()
+
+    copied = []
+    original_copy = engine.copy_file
+
+    def tracking_copy(src, dst, size):
+        copied.append(os.path.basename(src))
+        original_copy(src, dst, size)
+
+    engine.copy_file = tracking_copy
+    files, _ = engine.copy_tree(source, target, journal=CheckpointJournal(tmp_path / "move.journal"))
+
+    assert files == 10
+    assert sorted(copied) == [f"f{i}.txt" for i in range(5)]
+    assert (target / "f0.txt").read_text() == "data 0"
+
+
+def test_move_finishes_after_crash_following_copy(tmp_path):
+    """Test that a move whose copy phase completed only removes and links."""
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    source.mkdir()
+    (source / "file.txt").write_text("payload")
+
+    journal = CheckpointJournal(tmp_path / "move.journal")
+    MoveEngine().copy_tree(source, target, journal=journal)
+    journal.record_phase("copied")
+
+    MoveEngine().move(source, target, journal=CheckpointJournal(tmp_path / "move.journal"))
+
+    assert source.is_symlink()
+    assert (source / "file.txt").read_text() == "payload"
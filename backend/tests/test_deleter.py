@@ -0,0 +1,148 @@
+"""Tests for the parallel deletion engine."""
+
+import errno
+import os
+import stat
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+import pytest
+from app.storage.deleter import DeleteEngine
+
+
+def _make_tree(root, dirs=5, files_per_dir=40):
+    total = 0
+    for d in range(dirs):
+        nested = root / f"dir{d}" / "nested"
+        nested.mkdir(parents=True)
+        for f in range(files_per_dir):
+            data = b"x" * (f + 1)
+            (nested / f"file{f}.tmp").write_bytes(data)
+            total += len(data)
+    return total
+
+
+def test_clear_removes_contents_and_reports_progress(tmp_path):
+    """Test that every file and folder goes, the root stays, and bytes are reported."""
+    root = tmp_path / "cache"
+    root.mkdir()
+    total = _make_tree(root)
+    reported = []
+
+    engine = DeleteEngine(workers=4, batch_files=7, on_progress=lambda b, f: reported.append((b, f)))
+    stats = engine.clear(root)
+
+    assert root.exists()
+    assert list(root.iterdir()) == []
+    assert stats["bytes"] == total
+    assert stats["files"] == 200
+    assert stats["dirs"] == 10
+    assert stats["skipped"] == 0
+    assert sum(b for b, _ in reported) == total
+    assert len(reported) > 1
+
+
+def test_clear_skips_files_in_use(tmp_path, monkeypatch):
+    """Test that a locked file and its folders are left while the rest is cleared."""
+    root = tmp_path / "temp"
+    (root / "locked").mkdir(parents=True)
+    (root / "locked" / "in_use.log").write_text("busy")
+    (root / "free.tmp").write_text("free")
+
+    real_unlink = os.unlink
+
+    def unlink(path, *args, **kwargs):
+        if str(path).endswith("in_use.log"):
+            raise PermissionError(errno.EACCES, "in use", str(path))
+        real_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr("app.storage.deleter.os.unlink", unlink)
+    stats = DeleteEngine(workers=2).clear(root)
+
+    assert (root / "locked" / "in_use.log").exists()
+    assert not (root / "free.tmp").exists()
+    assert stats["files"] == 1
+    assert stats["skipped"] == 2
+
+
+def test_clear_does_not_follow_symlinks(tmp_path):
+    """Test that a link inside the tree is removed without touching its target."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    root = tmp_path / "cache"
+    root.mkdir()
+    os.symlink(outside, root / "link", target_is_directory=True)
+
+    DeleteEngine().clear(root)
+
+    assert not os.path.lexists(root / "link")
+    assert (outside / "keep.txt").exists()
+
+
+class _ReparsePoint:
+    """A scandir entry that reports a directory as a reparse point, like a junction on Python < 3.12."""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self.name, self.path = entry.name, entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return True
+
+    def is_symlink(self):
+        return False
+
+    def stat(self, follow_symlinks=True):
+        st = self._entry.stat(follow_symlinks=False)
+        return SimpleNamespace(
+            st_mode=st.st_mode, st_size=st.st_size,
+            st_file_attributes=stat.FILE_ATTRIBUTE_REPARSE_POINT
+        )
+
+
+def test_clear_does_not_descend_into_junctions(tmp_path, monkeypatch):
+    """Test that a junction's contents survive even where isjunction is missing."""
+    root = tmp_path / "cache"
+    junction = root / "junction"
+    junction.mkdir(parents=True)
+    (junction / "keep.txt").write_text("keep")
+    (root / "entry.tmp").write_text("tmp")
+    real_scandir = os.scandir
+
+    @contextmanager
+    def scandir(path):
+        with real_scandir(path) as entries:
+            yield [_ReparsePoint(e) if e.name == "junction" else e for e in entries]
+
+    monkeypatch.delattr(os.path, "isjunction", raising=False)
+    monkeypatch.setattr(os, "scandir", scandir)
+    stats = DeleteEngine().clear(root)
+
+    assert (junction / "keep.txt").read_text() == "keep"
+    assert not (root / "entry.tmp").exists()
+    assert stats["skipped"] == 1
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="junctions are Windows-only")
+def test_clear_removes_real_junction_without_following_it(tmp_path):
+    """Test that a real junction is removed and its target left intact."""
+    import _winapi
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    root = tmp_path / "cache"
+    root.mkdir()
+    _winapi.CreateJunction(str(outside), str(root / "junction"))
+
+    DeleteEngine().clear(root)
+
+    assert not os.path.lexists(root / "junction")
+    assert (outside / "keep.txt").exists()
+
+
+def test_clear_refuses_drive_root():
+    """Test that a filesystem root is never cleared."""
+    with pytest.raises(ValueError):
+        DeleteEngine().clear(os.path.abspath(os.sep))
@@ -0,0 +1,342 @@
+"""Tests for the execution engine."""
+
+import asyncio
+import pytest
+from app.config import settings
+from app.services import throughput
+from app.services.action_graph import build_dependencies
+from app.services.executor import ExecutionEngine
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """Keep execution checkpoints and learned rates out of the working tree."""
+    monkeypatch.setattr(settings, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(settings, "rollback_dir", str(tmp_path / "rollback"))
+    monkeypatch.setattr(settings, "throughput_cache_file", str(tmp_path / "throughput.json"))
+    monkeypatch.setattr(throughput, "_throughput_model", None)
+    return tmp_path / "checkpoints"
+
+
+def _action(idx, action_type="CLEANUP", source=None, target=None):
+    return {
+        "id": f"action_{idx}",
+        "type": action_type,
+        "description": f"Action {idx}",
+        "source_path": source,
+        "target_path": target,
+        "size_bytes": 0
+    }
+
+
+def test_dependencies_follow_overlapping_paths():
+    """Test that only actions on overlapping data are ordered."""
+    actions = [
+        _action(1, "MOVE", "C:\\Docker", "D:\\Docker"),
+        _action(2, "CLEANUP", "C:\\Cache"),
+        _action(3, "PRUNE", "C:\\Docker"),
+        _action(4, "MOVE", "C:\\Downloads", "D:\\Docker\\Downloads"),
+    ]
+
+    deps = build_dependencies(actions)
+
+    assert deps == [set(), set(), {0}, {0}]
+
+
+def test_pathless_actions_are_barriers():
+    """Test that actions without paths are ordered against all others."""
+    actions = [_action(1, source="C:\\A"), _action(2, "PRUNE"), _action(3, source="C:\\B")]
+
+    assert build_dependencies(actions) == [set(), {0}, {1}]
+
+
+@pytest.mark.asyncio
+async def test_independent_actions_run_in_parallel():
+    """Test that independent actions overlap while dependent ones wait."""
+    plan = {
+        "id": "test",
+        "name": "Test",
+        "space_saved_bytes": 0,
+        "actions": [
+            _action(1, "MOVE", "C:\\Docker", "D:\\Docker"),
+            _action(2, "CLEANUP", "E:\\Cache"),
+            _action(3, "PRUNE", "C:\\Docker"),
+        ]
+    }
+    engine = ExecutionEngine("test-parallel", plan)
+    events = []
+
+    async def fake_execute(action):
+        events.append(("start", action["id"]))
+        await asyncio.sleep(0.05)
+        events.append(("end", action["id"]))
+
+    engine._execute_action = fake_execute
+    await engine.execute()
+
+    progress = await engine.progress.get_progress()
+    assert progress["status"] == "completed"
+    assert events.index(("start", "action_2")) < events.index(("end", "action_1"))
+    assert events.index(("start", "action_3")) > events.index(("end", "action_1"))
+
+
+@pytest.mark.asyncio
+async def test_failure_stops_dependents():
+    """Test that a failed action prevents its dependents from running."""
+    plan = {
+        "id": "test",
+        "name": "Test",
+        "space_saved_bytes": 0,
+        "actions": [
+            _action(1, "MOVE", "C:\\Docker", "D:\\Docker"),
+            _action(2, "PRUNE", "C:\\Docker"),
+        ]
+    }
+    engine = ExecutionEngine("test-failure", plan)
+    started = []
+
+    async def fake_execute(action):
+        started.append(action["id"])
+        raise RuntimeError("boom")
+
+    engine._execute_action = fake_execute
+    await engine.execute()
+
+    progress = await engine.progress.get_progress()
+    assert progress["status"] == "failed"
+    assert started == ["action_1"]
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_actions(checkpoint_dir):
+    """Test that a resumed execution only runs unfinished actions."""
+    plan = {
+        "id": "test",
+        "name": "Test",
+        "space_saved_bytes": 0,
+        "actions": [_action(1, source="C:\\A"), _action(2, source="C:\\B")]
+    }
+    attempts = []
+
+    async def flaky_execute(action):
+        attempts.append(action["id"])
+        if action["id"] == "action_2" and attempts.count("action_2") == 1:
+            raise RuntimeError("interrupted")
+
+    first = ExecutionEngine("test-resume", plan)
+    first._execute_action = flaky_execute
+    await first.execute()
+    assert (checkpoint_dir / "test-resume" / "execution.json").exists()
+
+    resumed = ExecutionEngine("test-resume", plan, resume=True)
+    resumed._execute_action = flaky_execute
+    await resumed.execute()
+
+    progress = await resumed.progress.get_progress()
+    assert progress["status"] == "completed"
+    assert attempts == ["action_1", "action_2", "action_2"]
+    assert not (checkpoint_dir / "test-resume").exists()
+
+
+@pytest.mark.asyncio
+async def test_step_reports_bytes_while_running(monkeypatch):
+    """Test that bytes counted by an action show up before it finishes."""
+    monkeypatch.setattr(settings, "progress_update_interval", 0.01)
+    action = _action(1, "MOVE", "C:\\Docker", "D:\\Docker")
+    action["size_bytes"] = 1000
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [action]}
+    engine = ExecutionEngine("test-bytes", plan)
+    seen = []
+
+    async def fake_execute(action):
+        engine.counters[action["id"]].add(400, 2)
+        await asyncio.sleep(0.05)
+        progress = await engine.progress.get_progress()
+        seen.append(progress["steps"][0]["bytes_processed"])
+        engine.counters[action["id"]].add(600, 3)
+
+    engine._execute_action = fake_execute
+    await engine.execute()
+
+    progress = await engine.progress.get_progress()
+    assert seen == [400]
+    assert progress["steps"][0]["bytes_processed"] == 1000
+    assert progress["steps"][0]["files_processed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_impact_without_changes(tmp_path):
+    """Test that a dry run measures each action and leaves files in place."""
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    (cache / "entry.tmp").write_bytes(b"x" * 64)
+    action = _action(1, "CLEANUP", str(cache))
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [action]}
+
+    engine = ExecutionEngine("test-dry-run", plan, dry_run=True)
+    await engine.execute()
+
+    progress = await engine.progress.get_progress()
+    impact = progress["steps"][0]["impact"]
+    assert progress["status"] == "completed"
+    assert impact["files"] == 1
+    assert impact["bytes"] == 64
+    assert (cache / "entry.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_at_safe_point_and_keeps_checkpoint(checkpoint_dir):
+    """Test that cancelling stops the running action and starts no others."""
+    plan = {
+        "id": "test",
+        "name": "Test",
+        "space_saved_bytes": 0,
+        "actions": [_action(1, source="C:\\A"), _action(2, source="C:\\A\\B")]
+    }
+    engine = ExecutionEngine("test-cancel", plan)
+    started = []
+
+    async def slow_execute(action):
+        started.append(action["id"])
+        for _ in range(100):
+            await engine.io.check_async()
+            await asyncio.sleep(0.01)
+
+    engine._execute_action = slow_execute
+    task = asyncio.create_task(engine.execute())
+    await asyncio.sleep(0.05)
+    await engine.cancel()
+    await asyncio.wait_for(task, timeout=1)
+
+    progress = await engine.progress.get_progress()
+    assert progress["status"] == "cancelled"
+    assert progress["steps"][0]["status"] == "cancelled"
+    assert started == ["action_1"]
+    assert (checkpoint_dir / "test-cancel" / "execution.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_pause_holds_workers_until_resumed():
+    """Test that a paused execution makes no progress until resumed."""
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [_action(1, source="C:\\A")]}
+    engine = ExecutionEngine("test-pause", plan)
+    ticks = []
+
+    async def ticking_execute(action):
+        for i in range(10):
+            await engine.io.check_async()
+            ticks.append(i)
+            await asyncio.sleep(0.01)
+
+    engine._execute_action = ticking_execute
+    task = asyncio.create_task(engine.execute())
+    await asyncio.sleep(0.03)
+    await engine.pause()
+    await asyncio.sleep(0.05)
+    paused_at = len(ticks)
+    await asyncio.sleep(0.2)
+    assert len(ticks) == paused_at
+    assert (await engine.progress.get_progress())["status"] == "paused"
+
+    await engine.unpause()
+    await asyncio.wait_for(task, timeout=1)
+    assert len(ticks) == 10
+    assert (await engine.progress.get_progress())["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_learned_rate_excludes_paused_time(monkeypatch):
+    """Test that time spent paused is not counted as action duration."""
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [_action(1, source="C:\\A")]}
+    engine = ExecutionEngine("test-pause-rate", plan)
+    recorded = []
+    monkeypatch.setattr(engine.throughput, "record",
+                        lambda action, nbytes, files, seconds: recorded.append(seconds))
+
+    async def ticking_execute(action):
+        for _ in range(5):
+            await engine.io.check_async()
+            await asyncio.sleep(0.01)
+        return {"bytes": 1000, "files": 5}
+
+    engine._execute_action = ticking_execute
+    task = asyncio.create_task(engine.execute())
+    await asyncio.sleep(0.02)
+    await engine.pause()
+    await asyncio.sleep(0.3)
+    await engine.unpause()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert len(recorded) == 1
+    assert recorded[0] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_archive_action_writes_archive_and_removes_source(tmp_path):
+    """Test that an ARCHIVE action leaves a verified archive and no source."""
+    source = tmp_path / "Old Projects"
+    (source / "a").mkdir(parents=True)
+    (source / "a" / "notes.txt").write_bytes(b"notes" * 100)
+    backups = tmp_path / "backups"
+    action = _action(1, "ARCHIVE", str(source), str(backups))
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [action]}
+
+    engine = ExecutionEngine("test-archive", plan)
+    await engine.execute()
+
+    progress = await engine.progress.get_progress()
+    assert progress["status"] == "completed"
+    assert progress["steps"][0]["files_processed"] == 1
+    assert not source.exists()
+    archives = list(backups.glob("*.tar.xz"))
+    assert [a.name for a in archives] == ["Old Projects-test-arc.tar.xz"]
+    assert engine.rollback_data[0]["archive"] == str(archives[0])
+
+
+@pytest.mark.asyncio
+async def test_cleanup_backs_up_and_rollback_restores(tmp_path, monkeypatch):
+    """Test that a cleanup with backups on can be rolled back from the store."""
+    from app.services.rollback import RollbackManager
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "create_backups", True)
+    monkeypatch.setattr(settings, "backup_location", str(tmp_path / "backups"))
+    cache = tmp_path / "cache"
+    (cache / "nested").mkdir(parents=True)
+    (cache / "nested" / "entry.tmp").write_bytes(b"cached" * 10)
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [_action(1, "CLEANUP", str(cache))]}
+
+    engine = ExecutionEngine("test-backup", plan)
+    await engine.execute()
+    assert not (cache / "nested").exists()
+    assert engine.rollback_data[0]["snapshot"] == "test-backup-action_1"
+
+    manager = RollbackManager("test-backup")
+    manager.save_rollback_data(engine.rollback_data, "test")
+    result = await manager.rollback()
+
+    assert result["operations_rolled_back"] == 1
+    assert (cache / "nested" / "entry.tmp").read_bytes() == b"cached" * 10
+
+
+@pytest.mark.asyncio
+async def test_completed_execution_expires_other_backups(tmp_path, monkeypatch):
+    """Test that retention runs after success and keeps the execution's own snapshots."""
+    from app.storage.backup_store import BackupStore
+
+    monkeypatch.setattr(settings, "create_backups", True)
+    monkeypatch.setattr(settings, "backup_location", str(tmp_path / "backups"))
+    monkeypatch.setattr(settings, "backup_max_bytes", 1)
+    earlier = tmp_path / "earlier"
+    earlier.mkdir()
+    (earlier / "old.tmp").write_bytes(b"old" * 10)
+    store = BackupStore.from_settings()
+    store.backup(earlier, "earlier-action_1")
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    (cache / "entry.tmp").write_bytes(b"cached" * 10)
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [_action(1, "CLEANUP", str(cache))]}
+
+    await ExecutionEngine("test-retention", plan).execute()
+
+    assert [h["snapshot"] for h in store.list_snapshots()] == ["test-retention-action_1"]
@@ -0,0 +1,70 @@
+"""Tests for dry-run impact analysis."""
+
+from types import SimpleNamespace
+from app.services.impact import ImpactAnalyzer, ScanIndex
+
+
+def _tree(root, files=3):
+    (root / "sub").mkdir(parents=True)
+    for i in range(files):
+        (root / "sub" / f"f{i}.bin").write_bytes(b"x" * 100)
+    (root / "top.bin").write_bytes(b"y" * 50)
+
+
+def test_cleanup_counts_files_and_bytes(tmp_path):
+    """Test that a cleanup reports what it would delete."""
+    _tree(tmp_path / "cache")
+    impact = ImpactAnalyzer().analyze({
+        "id": "a1", "type": "CLEANUP", "source_path": str(tmp_path / "cache"), "size_bytes": 1
+    })
+
+    assert impact["operation"] == "delete"
+    assert impact["files"] == 4
+    assert impact["bytes"] == 350
+    assert not impact["estimated"]
+    assert impact["warnings"] == []
+
+
+def test_same_device_move_is_a_rename(tmp_path):
+    """Test that a move within one filesystem needs no target space."""
+    _tree(tmp_path / "data")
+    impact = ImpactAnalyzer().analyze({
+        "id": "a1", "type": "MOVE",
+        "source_path": str(tmp_path / "data"),
+        "target_path": str(tmp_path / "elsewhere" / "data")
+    })
+
+    assert impact["operation"] == "rename"
+    assert impact["required_free_bytes"] == 0
+    assert impact["fits"]
+
+
+def test_copies_share_target_free_space(tmp_path, monkeypatch):
+    """Test that copies to one device are checked against its combined free space."""
+    _tree(tmp_path / "a")
+    _tree(tmp_path / "b")
+    monkeypatch.setattr("app.services.impact.shutil.disk_usage", lambda _: SimpleNamespace(free=500))
+    analyzer = ImpactAnalyzer()
+
+    # WSL relocations always write a full copy to the target
+    def copy_action(name):
+        return {"id": name, "type": "EXPORT_IMPORT_WSL", "source_path": str(tmp_path / name),
+                "target_path": str(tmp_path / "target" / name)}
+
+    first = analyzer.analyze(copy_action("a"))
+    second = analyzer.analyze(copy_action("b"))
+
+    assert first["fits"] and first["required_free_bytes"] == 350
+    assert not second["fits"]
+    assert second["target_free_bytes"] == 150
+    assert second["warnings"]
+
+
+def test_scan_index_reuses_parent_scan(tmp_path, monkeypatch):
+    """Test that a folder inside an indexed tree is not scanned again."""
+    _tree(tmp_path / "docker")
+    index = ScanIndex()
+    assert index.summarize(tmp_path / "docker") == (4, 350)
+
+    monkeypatch.setattr(ScanIndex, "_scan", staticmethod(lambda root: (_ for _ in ()).throw(AssertionError)))
+    assert index.summarize(tmp_path / "docker" / "sub") == (3, 300)
@@ -0,0 +1,104 @@
+"""Tests for I/O throttling."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.io_control import TokenBucket, IOController
+
+MB = 1024 * 1024
+
+
+def test_token_bucket_limits_rate():
+    """Test that consumption beyond the burst waits for the rate."""
+    bucket = TokenBucket(rate=10 * MB)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.consume(1 * MB)
+    elapsed = time.monotonic() - started
+
+    assert 0.3 <= elapsed < 1.0
+
+
+def test_unlimited_bucket_does_not_wait():
+    """Test that a zero rate disables limiting."""
+    bucket = TokenBucket(rate=0)
+    started = time.monotonic()
+    bucket.consume(10 ** 12)
+
+    assert time.monotonic() - started < 0.05
+
+
+def test_adaptive_backoff_and_recovery():
+    """Test that high latency halves the rate and low latency ramps it back."""
+    io = IOController(rate_bytes_per_second=100 * MB, adaptive=True,
+                      latency_target_ms=20, min_rate_bytes_per_second=10 * MB)
+
+    io.adjust(latency_ms=80, observed_bps=100 * MB)
+    assert io.effective_rate == 50 * MB
+    io.adjust(latency_ms=80, observed_bps=50 * MB)
+    io.adjust(latency_ms=80, observed_bps=25 * MB)
+    io.adjust(latency_ms=80, observed_bps=12 * MB)
+    assert io.effective_rate == 10 * MB
+
+    for _ in range(20):
+        io.adjust(latency_ms=5, observed_bps=io.effective_rate)
+    assert io.effective_rate == 100 * MB
+
+
+def _fake_disk(monkeypatch, io, own_share):
+    """Feed the monitor a disk at 100ms per op moving 50MB per sample, own_share of it ours."""
+    samples = {"n": 0}
+
+    def disk_counters():
+        n = samples["n"]
+        samples["n"] += 1
+        return SimpleNamespace(read_count=n * 100, write_count=0, read_time=n * 10000, write_time=0,
+                               read_bytes=n * 50 * MB, write_bytes=0)
+
+    monkeypatch.setattr(io, "_disk_counters", disk_counters)
+    monkeypatch.setattr(io, "_own_disk_bytes", lambda: int((samples["n"]) * 50 * MB * own_share))
+
+
+async def _run_monitor(io, samples=4):
+    task = asyncio.create_task(io.monitor(interval=0.01))
+    await asyncio.sleep(0.01 * samples + 0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_own_io_does_not_trigger_backoff(monkeypatch):
+    """Test that high latency caused only by this process keeps the rate."""
+    io = IOController(rate_bytes_per_second=100 * MB, adaptive=True, latency_target_ms=20)
+    _fake_disk(monkeypatch, io, own_share=1.0)
+
+    await _run_monitor(io)
+
+    assert io.latency_ms == 100
+    assert io.foreground_bps == 0
+    assert io.effective_rate == 100 * MB
+
+
+@pytest.mark.asyncio
+async def test_foreground_io_triggers_backoff(monkeypatch):
+    """Test that high latency while other processes use the disk lowers the rate."""
+    io = IOController(rate_bytes_per_second=100 * MB, adaptive=True, latency_target_ms=20)
+    _fake_disk(monkeypatch, io, own_share=0.5)
+
+    await _run_monitor(io)
+
+    assert io.foreground_bps > 0
+    assert io.effective_rate < 100 * MB
+
+
+def test_configure_changes_rate_while_running():
+    """Test that a new limit applies to the shared bucket."""
+    io = IOController()
+    io.configure(rate_bytes_per_second=5 * MB, low_priority=True)
+
+    status = io.status()
+    assert io.bucket.rate == 5 * MB
+    assert status["effective_rate_bytes_per_second"] == 5 * MB
+    assert status["low_priority"]
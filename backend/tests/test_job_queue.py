@@ -0,0 +1,157 @@
+"""Tests for the persistent job queue and scheduler."""
+
+import asyncio
+from datetime import datetime
+import pytest
+from app.services.job_queue import JobQueue, next_daily_run
+
+
+def _plan(plan_id, *drives):
+    return {
+        "id": plan_id,
+        "name": plan_id.title(),
+        "actions": [
+            {"id": f"{plan_id}_{d}", "type": "CLEANUP", "source_path": f"{d}:\\Temp", "size_bytes": 0}
+            for d in drives
+        ]
+    }
+
+
+@pytest.fixture
+async def queue(tmp_path, monkeypatch):
+    """Open a queue whose jobs never actually execute."""
+    job_queue = JobQueue(tmp_path / "jobs.db", max_concurrent=2)
+    started = []
+
+    async def fake_start(row, drives):
+        started.append(row["id"])
+        await job_queue._set_status(row["id"], "running", started=True)
+        job_queue._running[row["id"]] = asyncio.get_running_loop().create_future()
+        job_queue._running_drives[row["id"]] = drives
+
+    monkeypatch.setattr(job_queue, "_start", fake_start)
+    await job_queue.open()
+    job_queue.started = started
+    yield job_queue
+    job_queue._running.clear()
+    await job_queue.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_respects_priority_and_drives(queue):
+    """Test that jobs start by priority, never two on the same drive."""
+    low = await queue.enqueue(_plan("low", "E"), priority=0)
+    high = await queue.enqueue(_plan("high", "C"), priority=5)
+    same_drive = await queue.enqueue(_plan("same", "C"), priority=9)
+    other = await queue.enqueue(_plan("other", "D"), priority=1)
+
+    started = await queue.dispatch()
+
+    # Highest priority first; the C: job waits for it and the cap of two stops the rest
+    assert started == [same_drive["id"], other["id"]]
+    assert (await queue.get_job(high["id"]))["status"] == "queued"
+    assert (await queue.get_job(low["id"]))["status"] == "queued"
+
+
+@pytest.mark.asyncio
+async def test_queued_jobs_register_progress_only_for_subscribers(queue):
+    """Test that queued jobs hold no manager until subscribed, and cancelling releases it."""
+    from app.services.progress import get_progress_registry
+
+    jobs = [await queue.enqueue(_plan(f"plan{n}", "C")) for n in range(3)]
+    registry = get_progress_registry()
+    assert not any(job["id"] in registry for job in jobs)
+    assert await queue.progress_manager("test-unknown-job") is None
+
+    manager = await queue.progress_manager(jobs[0]["id"])
+    assert manager is not None and jobs[0]["id"] in registry
+    waiter = asyncio.create_task(manager.wait_for_change(manager.seq))
+
+    await queue.cancel_job(jobs[0]["id"])
+
+    await asyncio.wait_for(waiter, timeout=1)
+    assert (await manager.get_progress())["status"] == "cancelled"
+    assert manager.finished_at is not None
+    assert await queue.progress_manager(jobs[1]["id"]) is not None
+    assert await queue.progress_manager(jobs[0]["id"]) is manager
+
+
+@pytest.mark.asyncio
+async def test_blocked_job_holds_back_lower_priority_on_its_drive(queue):
+    """Test that a lower-priority job cannot overtake a blocked one on shared drives."""
+    queue.max_concurrent = 5
+    await queue.enqueue(_plan("running", "C"), priority=9)
+    await queue.dispatch()
+
+    blocked = await queue.enqueue(_plan("blocked", "C", "D"), priority=5)
+    behind = await queue.enqueue(_plan("behind", "D"), priority=1)
+    free = await queue.enqueue(_plan("free", "E"), priority=0)
+
+    started = await queue.dispatch()
+
+    assert started == [free["id"]]
+    assert blocked["id"] not in started and behind["id"] not in started
+
+
+@pytest.mark.asyncio
+async def test_running_jobs_are_requeued_after_restart(tmp_path):
+    """Test that work survives a restart and resumes from its checkpoint."""
+    first = JobQueue(tmp_path / "jobs.db")
+    await first.open()
+    job = await first.enqueue(_plan("balanced", "C"))
+    await first._set_status(job["id"], "running", started=True)
+    await first.close()
+
+    second = JobQueue(tmp_path / "jobs.db")
+    await second.open()
+    restored = await second.get_job(job["id"])
+    await second.close()
+
+    assert restored["status"] == "queued"
+    assert restored["resume"]
+
+
+@pytest.mark.asyncio
+async def test_due_schedule_enqueues_fresh_plan(queue, monkeypatch):
+    """Test that a schedule queues its plan once and moves to the next day."""
+    async def fake_plans():
+        return [_plan("conservative", "C"), _plan("aggressive", "C")]
+
+    monkeypatch.setattr(queue, "_generate_plans", fake_plans)
+    schedule = await queue.add_schedule("conservative", "02:00")
+
+    fire_at = datetime.fromisoformat(schedule["next_run_at"])
+    queued = await queue.fire_due_schedules(now=fire_at)
+    again = await queue.fire_due_schedules(now=fire_at)
+
+    job = await queue.get_job(queued[0])
+    updated = await queue.get_schedule(schedule["id"])
+    assert len(queued) == 1 and again == []
+    assert job["plan_id"] == "conservative"
+    assert job["schedule_id"] == schedule["id"]
+    assert datetime.fromisoformat(updated["next_run_at"]) > fire_at
+
+
+def test_next_daily_run():
+    """Test that the next run is today if still ahead, otherwise tomorrow."""
+    assert next_daily_run("02:00", datetime(2024, 1, 1, 1, 0)) == datetime(2024, 1, 1, 2, 0)
+    assert next_daily_run("02:00", datetime(2024, 1, 1, 2, 0)) == datetime(2024, 1, 2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_records_final_status(tmp_path):
+    """Test that a dispatched job executes and stores the execution's outcome."""
+    job_queue = JobQueue(tmp_path / "jobs.db")
+    await job_queue.open()
+    plan = _plan("conservative", "C")
+    plan["space_saved_bytes"] = 0
+    plan["actions"][0]["description"] = "Clear temp"
+    job = await job_queue.enqueue(plan, dry_run=True)
+
+    await job_queue.dispatch()
+    await asyncio.wait_for(job_queue._running[job["id"]], timeout=5)
+
+    finished = await job_queue.get_job(job["id"])
+    await job_queue.close()
+    assert finished["status"] == "completed"
+    assert finished["finished_at"] is not None
@@ -0,0 +1,129 @@
+"""Tests for the move engine."""
+
+import os
+import pytest
+from app.services.checkpoint import CheckpointJournal
+from app.services.io_control import IOController, ExecutionCancelled
+from app.storage.mover import MoveEngine
+
+
+def _make_tree(root):
+    (root / "sub" / "deep").mkdir(parents=True)
+    (root / "big.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+    for i in range(50):
+        (root / "sub" / f"small_{i}.txt").write_text(f"file {i}")
+    (root / "sub" / "deep" / "leaf.txt").write_text("leaf")
+    os.utime(root / "sub" / "small_0.txt", (1_000_000_000, 1_000_000_000))
+
+
+def test_cross_device_copy_preserves_content_and_metadata(tmp_path):
+    """Test the parallel copy path used across devices."""
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    _make_tree(source)
+    progress = {"bytes": 0, "files": 0}
+
+    def on_progress(bytes_delta, files_delta):
+        progress["bytes"] += bytes_delta
+        progress["files"] += files_delta
+
+    engine = MoveEngine(workers=4, large_file_bytes=1024 * 1024, batch_files=8, on_progress=on_progress)
+    files, total = engine.copy_tree(source, target)
+
+    assert files == 52
+    assert (target / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+    assert (target / "sub" / "deep" / "leaf.txt").read_text() == "leaf"
+    assert int(os.stat(target / "sub" / "small_0.txt").st_mtime) == 1_000_000_000
+    assert progress == {"bytes": total, "files": files}
+
+
+def test_move_renames_and_links_on_same_filesystem(tmp_path):
+    """Test that a same-filesystem move is a rename plus symlink."""
+    source = tmp_path / "source"
+    target = tmp_path / "elsewhere" / "target"
+    _make_tree(source)
+
+    stats = MoveEngine().move(source, target)
+
+    assert stats["renamed"] is True
+    assert stats["files"] == 52
+    assert source.is_symlink()
+    assert (source / "sub" / "deep" / "leaf.txt").read_text() == "leaf"
+
+
+def test_move_refuses_non_empty_target(tmp_path):
+    """Test that an existing target is never overwritten."""
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    _make_tree(source)
+    target.mkdir()
+    (target / "keep.txt").write_text("keep")
+
+    try:
+        MoveEngine().move(source, target)
+        assert False, "expected FileExistsError"
+    except FileExistsError:
+        pass
+    assert (source / "big.bin").exists()
+
+
+def test_batches_group_small_files():
+    """Test that small files are batched and large files stand alone."""
+    engine = MoveEngine(large_file_bytes=100, batch_files=3)
+    files = [("big", 500)] + [(f"s{i}", 10) for i in range(7)]
+
+    batches = engine.plan_batches(files)
+
+    assert batches[0] == [("big", 500)]
+    assert [len(b) for b in batches[1:]] == [3, 3, 1]
+
+
+def test_cancelled_copy_keeps_journal(tmp_path):
+    """Test that a cancelled copy stops early with finished files journaled."""
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(50):
+        (source / f"f{i}.bin").write_bytes(b"x" * 1000)
+
+    io = IOController()
+    copied = []
+
+    def on_progress(bytes_delta, files_delta):
+        copied.append(files_delta)
+        if sum(copied) >= 5:
+            io.cancel()
+
+    journal = CheckpointJournal(tmp_path / "move.journal", batch_size=1000, flush_seconds=3600)
+    engine = MoveEngine(workers=1, batch_files=1, on_progress=on_progress, io=io)
+
+    with pytest.raises(ExecutionCancelled):
+        engine.copy_tree(source, tmp_path / "target", journal=journal)
+
+    reloaded = CheckpointJournal(tmp_path / "move.journal")
+    assert 5 <= len(reloaded.files) < 50
+
+
+def test_verifier_rejects_copy_with_wrong_content(tmp_path):
+    """Test that a copy matching in size and mtime but not content is caught."""
+    from app.services.verification import Verifier, VerificationError
+
+    source = tmp_path / "source"
+    _make_tree(source)
+    engine = MoveEngine(workers=2, large_file_bytes=1024 * 1024, verifier=Verifier(workers=2))
+    copy_file = engine.copy_file
+
+    def corrupting_copy(src, dst, size):
+        copy_file(src, dst, size)
+        if src.endswith("leaf.txt"):
+            st = os.stat(dst)
+            with open(dst, "r+b") as f:
+                f.write(b"L")
+            os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    engine.copy_file = corrupting_copy
+    with pytest.raises(VerificationError):
+        engine.copy_tree(source, tmp_path / "bad")
+
+    clean = MoveEngine(workers=2, large_file_bytes=1024 * 1024, verifier=Verifier(workers=2))
+    clean.copy_tree(source, tmp_path / "good")
+    assert len(clean.manifest["files"]) == 52
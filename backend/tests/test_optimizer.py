@@ -0,0 +1,121 @@
+"""Tests for goal-driven plan optimizer."""
+
+import time
+import pytest
+from app.config import Settings
+from app.models import PlanGoal
+from app.services.optimizer import PlanOptimizer
+
+GB = 1024 ** 3
+
+
+def _analysis(consumers, used_gb=400, total_gb=500):
+    return {
+        "drives": [{
+            "letter": "C",
+            "total_bytes": total_gb * GB,
+            "used_bytes": used_gb * GB,
+            "free_bytes": (total_gb - used_gb) * GB,
+            "percent_used": used_gb / total_gb * 100,
+            "status": "critical"
+        }],
+        "top_consumers": consumers
+    }
+
+
+CONSUMERS = [
+    {"name": "Docker Desktop", "path": "C:\\Docker", "size_bytes": 80 * GB, "type": "docker"},
+    {"name": "WSL - Ubuntu", "path": "C:\\WSL", "size_bytes": 40 * GB, "type": "wsl"},
+    {"name": "Chrome Cache", "path": "C:\\Cache", "size_bytes": 5 * GB, "type": "cache"},
+    {"name": "Temp - Temp", "path": "C:\\Temp", "size_bytes": 10 * GB, "type": "temp"},
+]
+
+
+def test_plans_meet_reclaim_goal():
+    """Test that every returned plan frees at least the requested bytes."""
+    optimizer = PlanOptimizer(Settings())
+    plans = optimizer.optimize(_analysis(CONSUMERS), PlanGoal(reclaim_bytes=60 * GB))
+
+    assert plans
+    assert sum(p["recommended"] for p in plans) == 1
+    for plan in plans:
+        assert plan["space_saved_bytes"] >= 60 * GB
+
+
+def test_small_goal_uses_low_risk_actions():
+    """Test that a goal reachable by cleanup avoids moves."""
+    optimizer = PlanOptimizer(Settings())
+    plans = optimizer.optimize(_analysis(CONSUMERS), PlanGoal(reclaim_bytes=8 * GB))
+
+    lowest_risk = plans[0]
+    assert {a["type"] for a in lowest_risk["actions"]} == {"CLEANUP"}
+
+
+def test_docker_alternatives_are_exclusive():
+    """Test that Docker is never both pruned and moved in one plan."""
+    optimizer = PlanOptimizer(Settings())
+    plans = optimizer.optimize(_analysis(CONSUMERS), PlanGoal(max_percent_used=70))
+
+    for plan in plans:
+        docker_actions = [a for a in plan["actions"] if "Docker" in a["description"]]
+        assert len(docker_actions) <= 1
+
+
+def test_goal_already_met_returns_empty_plan():
+    """Test that a satisfied goal yields a plan without actions."""
+    optimizer = PlanOptimizer(Settings())
+    plans = optimizer.optimize(_analysis(CONSUMERS), PlanGoal(max_percent_used=90))
+
+    assert len(plans) == 1
+    assert plans[0]["actions"] == []
+
+
+def test_goal_requires_target():
+    """Test that a goal without a target is rejected."""
+    with pytest.raises(ValueError):
+        PlanOptimizer(Settings()).optimize(_analysis(CONSUMERS), PlanGoal())
+
+
+def test_optimizer_scales_to_many_candidates():
+    """Test that hundreds of candidates are solved quickly."""
+    consumers = [
+        {"name": f"Dir {i}", "path": f"C:\\Data\\{i}", "size_bytes": (i % 17 + 1) * GB, "type": "other"}
+        for i in range(500)
+    ]
+    optimizer = PlanOptimizer(Settings())
+
+    start = time.perf_counter()
+    plans = optimizer.optimize(_analysis(consumers, used_gb=4000, total_gb=5000), PlanGoal(reclaim_bytes=900 * GB))
+    elapsed = time.perf_counter() - start
+
+    assert plans[0]["space_saved_bytes"] >= 900 * GB
+    assert elapsed < 2.0
+
+
+def test_many_small_candidates_are_not_rounded_away():
+    """Test that candidates smaller than a solver bucket still cover the goal."""
+    consumers = [
+        {"name": f"Temp - {i}", "path": f"C:\\Temp\\{i}", "size_bytes": 990, "type": "temp"}
+        for i in range(600)
+    ]
+    optimizer = PlanOptimizer(Settings())
+    plans = optimizer.optimize(_analysis(consumers), PlanGoal(reclaim_bytes=512000))
+
+    assert plans
+    assert sum(p["recommended"] for p in plans) == 1
+    for plan in plans:
+        assert plan["space_saved_bytes"] >= 512000
+
+
+def test_greedy_fallback_when_solver_finds_nothing():
+    """Test that a best-effort plan is returned when the solver cannot cover the goal."""
+    consumers = [
+        {"name": f"Temp - {i}", "path": f"C:\\Temp\\{i}", "size_bytes": 990, "type": "temp"}
+        for i in range(600)
+    ]
+    optimizer = PlanOptimizer(Settings(), resolution=64, max_resolution=64)
+    plans = optimizer.optimize(_analysis(consumers), PlanGoal(reclaim_bytes=512000))
+
+    assert len(plans) == 1
+    assert plans[0]["recommended"]
+    assert plans[0]["space_saved_bytes"] >= 512000
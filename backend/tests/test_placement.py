@@ -0,0 +1,56 @@
+"""Tests for multi-target placement engine."""
+
+from app.services.placement import PlacementEngine
+
+GB = 1024 ** 3
+
+
+def _drive(letter, total_gb, used_gb):
+    return {"letter": letter, "total_bytes": total_gb * GB, "used_bytes": used_gb * GB}
+
+
+DRIVES = [
+    _drive("C", 500, 450),
+    _drive("D", 1000, 100),
+    _drive("E", 1000, 100),
+]
+
+
+def test_large_items_spread_across_drives():
+    """Test that relocations are balanced rather than piled on one drive."""
+    engine = PlacementEngine(DRIVES, max_percent_used=80, preferred_drive="D")
+    items = [
+        {"path": "C:\\Docker", "size_bytes": 300 * GB},
+        {"path": "C:\\WSL", "size_bytes": 250 * GB},
+    ]
+
+    assignments = engine.assign(items)
+
+    assert set(assignments.values()) == {"D", "E"}
+
+
+def test_threshold_headroom_is_respected():
+    """Test that no target is pushed past the usage threshold."""
+    engine = PlacementEngine(DRIVES, max_percent_used=80)
+    items = [{"path": f"C:\\Data{i}", "size_bytes": 400 * GB} for i in range(4)]
+
+    assignments = engine.assign(items)
+
+    assert len(assignments) == 2
+    assert "C" not in assignments.values()
+
+
+def test_faster_drive_preferred_when_room_allows(tmp_path):
+    """Test that measured write speed steers placement."""
+    from app.services.throughput import ThroughputModel
+
+    model = ThroughputModel(tmp_path / "throughput.json")
+    model.drives = {
+        "D": {"read_bps": 100, "write_bps": 100, "measured_at": "2026-01-01T00:00:00"},
+        "E": {"read_bps": 1000, "write_bps": 1000, "measured_at": "2026-01-01T00:00:00"},
+    }
+    engine = PlacementEngine(DRIVES, max_percent_used=80, throughput=model)
+
+    assignments = engine.assign([{"path": "C:\\Docker", "size_bytes": 50 * GB}])
+
+    assert assignments["C:\\Docker"] == "E"
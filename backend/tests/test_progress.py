@@ -0,0 +1,218 @@
+"""Tests for execution progress tracking."""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.models import StepStatus, LogLevel, ExecutionStatus
+from app.services.progress import ProgressManager, ProgressRegistry, LogBuffer
+
+GB = 1024 ** 3
+
+
+def _actions():
+    return [
+        {"id": "action_1", "description": "Small cleanup", "size_bytes": 1 * GB, "estimated_seconds": 5},
+        {"id": "action_2", "description": "Large move", "size_bytes": 9 * GB, "estimated_seconds": 900},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_overall_percent_is_weighted_by_bytes():
+    """Test that a small finished step counts less than a large one in flight."""
+    manager = ProgressManager("test-weighted")
+    await manager.initialize("plan", _actions())
+
+    await manager.update_step(0, StepStatus.ACTIVE)
+    await manager.update_step(0, StepStatus.COMPLETED)
+    await manager.update_step(1, StepStatus.ACTIVE)
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=int(4.5 * GB), files_processed=10)
+
+    progress = await manager.get_progress()
+    assert progress["overall_percent"] == pytest.approx(55.0)
+    step = progress["steps"][1]
+    assert step["progress_percent"] == pytest.approx(50.0)
+    assert step["files_processed"] == 10
+
+
+@pytest.mark.asyncio
+async def test_eta_uses_measured_throughput(monkeypatch):
+    """Test that an active step's remaining time follows its byte rate."""
+    clock = iter([100.0, 110.0])
+    monkeypatch.setattr("app.services.progress.time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    manager = ProgressManager("test-eta")
+    await manager.initialize("plan", _actions())
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=0)
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=1 * GB)
+
+    progress = await manager.get_progress()
+    step = progress["steps"][1]
+    assert step["bytes_per_second"] == pytest.approx(GB / 10)
+    assert step["eta_seconds"] == pytest.approx(80.0)
+    # The pending cleanup still counts with its plan estimate
+    assert progress["eta_seconds"] == pytest.approx(85.0)
+
+
+@pytest.mark.asyncio
+async def test_throughput_is_smoothed(monkeypatch):
+    """Test that a single slow sample only partly lowers the rate."""
+    clock = iter([0.0, 1.0, 2.0])
+    monkeypatch.setattr("app.services.progress.time", SimpleNamespace(monotonic=lambda: next(clock)))
+    monkeypatch.setattr("app.services.progress.settings.progress_rate_smoothing", 0.5)
+
+    manager = ProgressManager("test-smooth")
+    await manager.initialize("plan", _actions())
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=0)
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=100)
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=100)
+
+    progress = await manager.get_progress()
+    assert progress["steps"][1]["bytes_per_second"] == pytest.approx(50.0)
+
+
+@pytest.mark.asyncio
+async def test_subscribers_are_woken_by_changes():
+    """Test that waiters wake on the next change and not before."""
+    manager = ProgressManager("test-notify")
+    await manager.initialize("plan", _actions())
+    seq = manager.seq
+
+    waiter = asyncio.create_task(manager.wait_for_change(seq))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    await manager.add_log(LogLevel.INFO, "copying")
+    assert await asyncio.wait_for(waiter, timeout=1) == seq + 1
+    # A caller that is already behind returns immediately
+    assert await asyncio.wait_for(manager.wait_for_change(seq), timeout=1) == seq + 1
+
+
+@pytest.mark.asyncio
+async def test_delta_holds_only_changed_steps_and_new_logs():
+    """Test that a subscriber gets a snapshot first, then only changes."""
+    actions = [{"id": f"action_{i}", "size_bytes": 100} for i in range(50)]
+    manager = ProgressManager("test-delta")
+    await manager.initialize("plan", actions)
+    await manager.add_log(LogLevel.INFO, "started")
+
+    snapshot = await manager.get_update()
+    assert snapshot["type"] == "snapshot"
+    assert len(snapshot["steps"]) == 50
+    assert [log["message"] for log in snapshot["logs"]] == ["started"]
+
+    await manager.update_step(7, StepStatus.ACTIVE)
+    await manager.add_log(LogLevel.INFO, "moving")
+    delta = await manager.get_update(snapshot["seq"], snapshot["stream"])
+
+    assert delta["type"] == "delta"
+    assert delta["seq"] == snapshot["seq"] + 2
+    assert list(delta["steps"]) == ["7"]
+    assert delta["steps"]["7"]["status"] == "active"
+    assert [log["message"] for log in delta["logs"]] == ["moving"]
+    assert delta["current_step"] == 8
+
+    empty = await manager.get_update(delta["seq"], delta["stream"])
+    assert empty["steps"] == {} and empty["logs"] == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_when_missed_changes_are_gone():
+    """Test that stale positions and foreign streams get a full snapshot."""
+    manager = ProgressManager("test-resync")
+    await manager.initialize("plan", _actions())
+    first = await manager.get_update()
+
+    assert (await manager.get_update(first["seq"], "other-stream"))["type"] == "snapshot"
+    for i in range(101):
+        await manager.add_log(LogLevel.INFO, f"line {i}")
+    assert (await manager.get_update(first["seq"], first["stream"]))["type"] == "snapshot"
+
+
+def test_websocket_sends_final_state_and_closes():
+    """Test that a finished execution is sent once and the socket closed."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.progress import create_progress_manager, cleanup_progress_manager
+
+    manager = create_progress_manager("test-ws-final")
+    asyncio.run(manager.initialize("plan", _actions()))
+    asyncio.run(manager.set_status(ExecutionStatus.COMPLETED))
+    try:
+        with TestClient(app).websocket_connect("/progress/test-ws-final") as ws:
+            data = ws.receive_json()
+            assert data["type"] == "snapshot"
+            assert data["status"] == "completed"
+            assert data["overall_percent"] == 100.0
+    finally:
+        cleanup_progress_manager("test-ws-final")
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_finished_managers_only():
+    """Test TTL and cap eviction, which never touches running executions."""
+    registry = ProgressRegistry(max_entries=2, ttl_seconds=60)
+    running = registry.create("running")
+    await running.initialize("plan", _actions())
+    for name in ("old", "new"):
+        await registry.create(name).set_status(ExecutionStatus.COMPLETED)
+
+    # Over the cap: the oldest finished manager goes first
+    assert "old" not in registry
+    assert registry.get("new") is not None
+    assert registry.get("running") is running
+
+    registry.evict(now=registry.get("new").finished_at + 61)
+    assert "new" not in registry
+    assert registry.get("running") is running
+    assert registry.get("unknown") is None
+    assert "unknown" not in registry
+
+
+@pytest.mark.asyncio
+async def test_resumed_execution_is_no_longer_evictable():
+    """Test that re-initializing a finished manager makes it live again."""
+    registry = ProgressRegistry(max_entries=1, ttl_seconds=60)
+    manager = registry.create("resumed")
+    await manager.set_status(ExecutionStatus.FAILED)
+    assert manager.finished_at is not None
+
+    await manager.initialize("plan", _actions())
+    assert manager.finished_at is None
+    registry.evict(now=float("inf"))
+    assert registry.get("resumed") is manager
+
+
+def test_log_buffer_drops_oldest_and_shares_snapshots():
+    """Test ring-buffer capacity, dropped seq tracking and snapshot caching."""
+    logs = LogBuffer(capacity=3)
+    for seq in range(1, 6):
+        logs.append({"seq": seq})
+
+    snapshot = logs.snapshot()
+    assert [e["seq"] for e in snapshot] == [3, 4, 5]
+    assert logs.dropped_seq == 2
+    assert logs.snapshot() is snapshot
+    assert [e["seq"] for e in logs.since(3)] == [4, 5]
+
+    logs.append({"seq": 6})
+    assert [e["seq"] for e in snapshot] == [3, 4, 5]
+    assert [e["seq"] for e in logs.snapshot()] == [4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_progress_snapshot_is_not_mutated_by_later_changes(monkeypatch):
+    """Test that get_progress results stay fixed as execution continues."""
+    monkeypatch.setattr("app.services.progress.settings.progress_log_capacity", 2)
+    manager = ProgressManager("test-immutable")
+    await manager.initialize("plan", _actions())
+    await manager.add_log(LogLevel.INFO, "first")
+    before = await manager.get_progress()
+
+    await manager.update_step(0, StepStatus.ACTIVE, bytes_processed=GB // 2)
+    for message in ("second", "third"):
+        await manager.add_log(LogLevel.INFO, message)
+    after = await manager.get_progress()
+
+    assert [log["message"] for log in before["logs"]] == ["first"]
+    assert before["steps"][0]["status"] == "pending"
+    assert [log["message"] for log in after["logs"]] == ["second", "third"]
@@ -0,0 +1,74 @@
+"""Tests for the durable progress event log."""
+
+import pytest
+from app.models import StepStatus, LogLevel, ExecutionStatus
+from app.services.progress import ProgressManager
+from app.services.progress_events import ProgressEventStore, set_progress_event_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A running event store installed for progress managers."""
+    store = ProgressEventStore(tmp_path / "events.db", batch_size=50, flush_seconds=0.05)
+    store.start()
+    set_progress_event_store(store)
+    yield store
+    set_progress_event_store(None)
+    store.close()
+
+
+async def _run_execution(execution_id, logs=3):
+    manager = ProgressManager(execution_id)
+    actions = [{"id": "action_1", "size_bytes": 100}, {"id": "action_2", "size_bytes": 300}]
+    await manager.initialize("balanced", actions)
+    await manager.update_step(0, StepStatus.ACTIVE)
+    for i in range(logs):
+        await manager.add_log(LogLevel.INFO, f"line {i}")
+    await manager.update_step(0, StepStatus.COMPLETED)
+    await manager.update_step(1, StepStatus.ACTIVE, bytes_processed=150)
+    await manager.set_status(ExecutionStatus.FAILED)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_replay_rebuilds_final_progress(store):
+    """Test that replaying events gives the state the live manager had."""
+    manager = await _run_execution("test-replay")
+    live = await manager.get_progress()
+
+    replayed = store.replay("test-replay")
+
+    assert replayed["status"] == "failed"
+    assert replayed["steps"] == live["steps"]
+    assert replayed["overall_percent"] == live["overall_percent"]
+    assert replayed["logs"] == list(live["logs"])
+    assert replayed["log_count"] == 3
+    assert store.replay("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_full_log_is_paginated_beyond_live_cap(store):
+    """Test that every log line is kept although the live log holds 100."""
+    await _run_execution("test-pages", logs=250)
+
+    messages, after = [], 0
+    while after is not None:
+        page = store.get_logs("test-pages", after=after, limit=100)
+        messages += [log["message"] for log in page["logs"]]
+        after = page["next"]
+
+    assert messages == [f"line {i}" for i in range(250)]
+    history = store.list_executions()
+    assert history[0]["execution_id"] == "test-pages"
+    assert history[0]["plan_id"] == "balanced"
+    assert history[0]["status"] == "failed"
+
+
+def test_record_never_blocks_when_writer_falls_behind(tmp_path):
+    """Test that a full queue drops events instead of waiting."""
+    store = ProgressEventStore(tmp_path / "events.db", max_pending=5)
+
+    for seq in range(10):
+        store.record("test-full", seq, "log", {"message": str(seq)})
+
+    assert store.dropped == 5
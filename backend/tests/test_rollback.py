@@ -0,0 +1,194 @@
+"""Tests for the parallel, verified rollback engine."""
+
+import asyncio
+import os
+import time
+import pytest
+from app.config import settings
+from app.services import throughput
+from app.services.executor import ExecutionEngine
+from app.services.progress import get_progress_manager
+from app.services.rollback import RollbackEngine, RollbackManager
+from app.services.verification import Verifier, save_manifest
+
+
+@pytest.fixture(autouse=True)
+def data_dirs(tmp_path, monkeypatch):
+    """Keep journals, checkpoints, hash caches and learned rates out of the working tree."""
+    monkeypatch.setattr(settings, "rollback_dir", str(tmp_path / "rollback"))
+    monkeypatch.setattr(settings, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(settings, "throughput_cache_file", str(tmp_path / "throughput.json"))
+    monkeypatch.setattr(throughput, "_throughput_model", None)
+    monkeypatch.setattr(settings, "verify_hash_cache", str(tmp_path / "hash-cache.db"))
+
+
+def _moved_tree(tmp_path):
+    """A tree moved to target with a link at source, and its manifest."""
+    source, target = tmp_path / "source", tmp_path / "target"
+    (target / "nested").mkdir(parents=True)
+    (target / "a.bin").write_bytes(os.urandom(4096))
+    (target / "nested" / "b.txt").write_bytes(b"data" * 100)
+    os.symlink(target, source, target_is_directory=True)
+    manifest = Verifier().verify_tree(target, target)
+    save_manifest(manifest, tmp_path / "manifest.json")
+    return source, target, {
+        "action_type": "MOVE", "source": str(source), "target": str(target),
+        "manifest": str(tmp_path / "manifest.json"), "action_id": "action_1"
+    }
+
+
+@pytest.mark.asyncio
+async def test_move_is_reversed_and_verified(tmp_path):
+    """Test that a moved tree comes back in place of its link and is checked."""
+    source, target, operation = _moved_tree(tmp_path)
+
+    result = await RollbackEngine("test-undo-move", [operation]).run()
+
+    assert result["status"] == "success"
+    assert result["operations_rolled_back"] == 1
+    assert result["verified_files"] == 2
+    assert not source.is_symlink()
+    assert (source / "nested" / "b.txt").read_bytes() == b"data" * 100
+    assert not target.exists()
+    progress = await get_progress_manager("test-undo-move-rollback").get_progress()
+    assert progress["status"] == "completed"
+    assert progress["steps"][0]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_corrupted_data_fails_verification(tmp_path):
+    """Test that a file changed since the move fails the rollback."""
+    _, target, operation = _moved_tree(tmp_path)
+    (target / "a.bin").write_bytes(b"changed")
+
+    result = await RollbackEngine("test-undo-corrupt", [operation]).run()
+
+    assert result["status"] == "failed"
+    assert result["failed"] == 1
+    progress = await get_progress_manager("test-undo-corrupt-rollback").get_progress()
+    assert progress["steps"][0]["status"] == "failed"
+    assert "a.bin" in progress["steps"][0]["error_message"]
+
+
+@pytest.mark.asyncio
+async def test_operations_are_undone_in_reverse_dependency_order():
+    """Test that later overlapping operations go first and independent ones overlap."""
+    operations = [
+        {"action_type": "MOVE", "source": "C:\\Data", "target": "D:\\Data"},
+        {"action_type": "MOVE", "source": "D:\\Data\\Sub", "target": "E:\\Sub"},
+        {"action_type": "MOVE", "source": "C:\\Other", "target": "F:\\Other"},
+    ]
+    engine = RollbackEngine("test-undo-order", operations)
+    assert engine.reverse_dependencies() == [{1}, set(), set()]
+
+    spans = {}
+
+    def fake_undo(idx, operation, counter):
+        start = time.monotonic()
+        time.sleep(0.05)
+        spans[idx] = (start, time.monotonic())
+        return {"files": 0, "verified": 0}
+
+    engine._undo = fake_undo
+    result = await engine.run()
+
+    assert result["operations_rolled_back"] == 3
+    assert spans[0][0] >= spans[1][1]
+    assert spans[2][0] < spans[1][1]
+
+
+@pytest.mark.asyncio
+async def test_archive_execution_rolls_back_from_journal(tmp_path):
+    """Test that an archived tree is extracted back using the execution's journal."""
+    source = tmp_path / "Old Projects"
+    (source / "a").mkdir(parents=True)
+    (source / "a" / "notes.txt").write_bytes(b"notes" * 100)
+    action = {
+        "id": "action_1", "type": "ARCHIVE", "description": "Archive", "source_path": str(source),
+        "target_path": str(tmp_path / "backups"), "size_bytes": 0
+    }
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [action]}
+    await ExecutionEngine("test-undo-archive", plan).execute()
+    assert not source.exists()
+
+    result = await RollbackManager("test-undo-archive").rollback()
+
+    assert result["status"] == "success"
+    assert result["verified_files"] == 1
+    assert (source / "a" / "notes.txt").read_bytes() == b"notes" * 100
+
+
+@pytest.mark.asyncio
+async def test_interrupted_operations_are_recovered_or_skipped(tmp_path):
+    """Test that intents without a done record are undone where they changed data."""
+    from app.services.rollback_journal import RollbackJournal
+
+    moved_source, moved_target = tmp_path / "renamed", tmp_path / "d" / "renamed"
+    moved_target.mkdir(parents=True)
+    (moved_target / "data.bin").write_bytes(b"moved" * 100)
+    untouched = tmp_path / "untouched"
+    untouched.mkdir()
+    archived = tmp_path / "archived"
+    archived.mkdir()
+
+    journal = RollbackJournal.for_execution("test-undo-interrupted")
+    journal.begin("test")
+    journal.intent("action_1", {"action_type": "MOVE", "source": str(moved_source), "target": str(moved_target)})
+    journal.intent("action_2", {"action_type": "MOVE", "source": str(untouched), "target": str(tmp_path / "d" / "u")})
+    journal.intent("action_3", {"action_type": "ARCHIVE", "source": str(archived), "archive": str(tmp_path / "a.tar.xz")})
+    journal.close()
+
+    result = await RollbackManager("test-undo-interrupted").rollback()
+
+    assert result["status"] == "success"
+    assert result["operations_rolled_back"] == 1
+    assert result["skipped"] == 2
+    assert (moved_source / "data.bin").read_bytes() == b"moved" * 100
+    assert not moved_target.exists()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_move_with_data_in_both_places_fails(tmp_path):
+    """Test that a move cut short mid-copy is reported instead of guessed at."""
+    from app.services.rollback_journal import RollbackJournal
+
+    source, target = tmp_path / "source", tmp_path / "target"
+    source.mkdir()
+    (source / "a.txt").write_bytes(b"a")
+    target.mkdir()
+    (target / "a.txt").write_bytes(b"a")
+
+    journal = RollbackJournal.for_execution("test-undo-split")
+    journal.intent("action_1", {"action_type": "MOVE", "source": str(source), "target": str(target)})
+    journal.close()
+
+    result = await RollbackManager("test-undo-split").rollback()
+
+    assert result["status"] == "failed"
+    assert (source / "a.txt").exists() and (target / "a.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_archive_rollback_restores_files_removal_deleted(tmp_path):
+    """Test that a source removal that kept some files is still undone."""
+    from app.storage.archiver import ArchiveEngine
+
+    source = tmp_path / "Old Projects"
+    (source / "a").mkdir(parents=True)
+    (source / "a" / "kept.txt").write_bytes(b"kept")
+    (source / "a" / "deleted.txt").write_bytes(b"deleted" * 50)
+    engine = ArchiveEngine(compression="gz", level=1)
+    archive = tmp_path / engine.archive_name(source, "t")
+    engine.archive(source, archive)
+    (source / "a" / "deleted.txt").unlink()
+    operation = {"action_type": "ARCHIVE", "source": str(source), "archive": str(archive)}
+
+    result = await RollbackEngine("test-undo-partial-archive", [operation]).run()
+
+    assert result["status"] == "success"
+    assert result["operations_rolled_back"] == 1
+    assert result["verified_files"] == 1
+    assert (source / "a" / "deleted.txt").read_bytes() == b"deleted" * 50
+
+    kept = await RollbackEngine("test-undo-kept-archive", [{**operation, "keep_source": True}]).run()
+    assert kept["skipped"] == 1
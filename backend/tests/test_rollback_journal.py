@@ -0,0 +1,121 @@
+"""Tests for the write-ahead rollback journal and startup recovery."""
+
+import threading
+import time
+import pytest
+from app.config import settings
+from app.services import throughput
+from app.services import rollback_journal
+from app.services.rollback_journal import RollbackJournal, read_journal, recover_unfinished
+
+
+@pytest.fixture(autouse=True)
+def rollback_dir(tmp_path, monkeypatch):
+    """Keep journals out of the working tree."""
+    monkeypatch.setattr(settings, "rollback_dir", str(tmp_path / "rollback"))
+    monkeypatch.setattr(settings, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(settings, "throughput_cache_file", str(tmp_path / "throughput.json"))
+    monkeypatch.setattr(throughput, "_throughput_model", None)
+    return tmp_path / "rollback"
+
+
+def test_journal_records_intents_and_survives_torn_tail(tmp_path):
+    """Test finished and interrupted operations, and appending after a crash."""
+    path = tmp_path / "exec.journal"
+    journal = RollbackJournal(path, flush_seconds=3600)
+    journal.begin("plan")
+    moved = journal.intent("action_1", {"action_type": "MOVE", "source": "a", "target": "b"})
+    journal.done(moved, {"action_type": "MOVE", "source": "a", "target": "b", "manifest": "m.json"})
+    journal.intent("action_2", {"action_type": "ARCHIVE", "source": "c", "archive": "c.tar.xz"})
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"t": "done", "op"')
+
+    state = read_journal(path)
+    assert state["status"] is None
+    assert [op["action_id"] for op in state["operations"]] == ["action_1"]
+    assert state["operations"][0]["manifest"] == "m.json"
+    assert [op["action_id"] for op in state["incomplete"]] == ["action_2"]
+
+    resumed = RollbackJournal(path)
+    op = resumed.intent("action_2", {"action_type": "ARCHIVE", "source": "c", "archive": "c.tar.xz"})
+    resumed.done(op, {"action_type": "ARCHIVE", "source": "c", "archive": "c.tar.xz"})
+    resumed.end("completed")
+    resumed.close()
+
+    state = read_journal(path)
+    assert op == 3
+    assert state["status"] == "completed"
+    assert [o["action_id"] for o in state["operations"]] == ["action_1", "action_2"]
+    assert state["incomplete"] == []
+
+
+def test_concurrent_intents_share_fsyncs(tmp_path, monkeypatch):
+    """Test that writers waiting on a sync are committed together."""
+    syncs = []
+    real_fsync = rollback_journal.os.fsync
+
+    def slow_fsync(fd):
+        syncs.append(fd)
+        time.sleep(0.005)
+        real_fsync(fd)
+
+    monkeypatch.setattr(rollback_journal.os, "fsync", slow_fsync)
+    journal = RollbackJournal(tmp_path / "exec.journal")
+
+    def worker(n):
+        for i in range(25):
+            journal.intent(f"action_{n}", {"file": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    journal.close()
+
+    assert len(read_journal(tmp_path / "exec.journal")["incomplete"]) == 200
+    assert len(syncs) < 100
+
+
+@pytest.mark.asyncio
+async def test_recovery_reports_only_unfinished_executions(tmp_path):
+    """Test that an execution's journal ends with its status and crashes are reported."""
+    from app.services.executor import ExecutionEngine
+
+    source = tmp_path / "Old Projects"
+    source.mkdir()
+    (source / "notes.txt").write_bytes(b"notes" * 100)
+    action = {
+        "id": "action_1", "type": "ARCHIVE", "description": "Archive", "source_path": str(source),
+        "target_path": str(tmp_path / "backups"), "size_bytes": 0
+    }
+    plan = {"id": "test", "name": "Test", "space_saved_bytes": 0, "actions": [action]}
+    await ExecutionEngine("test-journal-done", plan).execute()
+
+    crashed = RollbackJournal.for_execution("test-journal-crashed")
+    crashed.begin("test")
+    crashed.intent("action_1", {"action_type": "MOVE", "source": "x", "target": "y"})
+    crashed.close()
+
+    assert read_journal(rollback_journal.journal_path("test-journal-done"))["status"] == "completed"
+    unfinished = recover_unfinished()
+    assert [e["execution_id"] for e in unfinished] == ["test-journal-crashed"]
+    assert unfinished[0]["incomplete"][0]["source"] == "x"
+
+
+def test_durable_done_is_synced_before_returning(tmp_path):
+    """Test that a done record asked to be durable does not wait for a batch."""
+    path = tmp_path / "exec.journal"
+    journal = RollbackJournal(path, flush_seconds=3600)
+    op = journal.intent("action_1", {"action_type": "ARCHIVE", "source": "c", "archive": "c.tar.xz"})
+    journal.done(op, {"action_type": "ARCHIVE", "source": "c", "archive": "c.tar.xz"})
+    assert read_journal(path)["operations"] == []
+
+    op = journal.intent("action_2", {"action_type": "ARCHIVE", "source": "d", "archive": "d.tar.xz"})
+    journal.done(op, {"action_type": "ARCHIVE", "source": "d", "archive": "d.tar.xz"}, durable=True)
+
+    state = read_journal(path)
+    assert [o["action_id"] for o in state["operations"]] == ["action_1", "action_2"]
+    assert state["incomplete"] == []
+    journal.close()
@@ -0,0 +1,120 @@
+"""Tests for what-if plan simulation."""
+
+import time
+import numpy as np
+from app.services.simulator import PlanSimulator
+
+GB = 1024 ** 3
+
+DRIVES = [
+    {"letter": "C", "total_bytes": 500 * GB, "used_bytes": 450 * GB},
+    {"letter": "D", "total_bytes": 1000 * GB, "used_bytes": 100 * GB},
+]
+
+DOCKER_MOVE = {
+    "id": "balanced_action_1", "type": "MOVE", "source_path": "C:\\Docker",
+    "target_path": "D:\\Docker", "size_bytes": 100 * GB
+}
+DOCKER_PRUNE = {
+    "id": "balanced_action_2", "type": "PRUNE", "source_path": "C:\\Docker",
+    "size_bytes": 30 * GB, "command": "docker system prune -af --volumes"
+}
+CACHE = {"id": "balanced_action_3", "type": "CLEANUP", "source_path": "C:\\Cache", "size_bytes": 10 * GB}
+
+
+def _drive(report, letter):
+    return next(d for d in report["drives"] if d["letter"] == letter)
+
+
+def test_prune_after_move_is_not_double_counted():
+    """Test that a PRUNE after a MOVE of the same data frees the target drive."""
+    simulator = PlanSimulator(DRIVES)
+    report = simulator.simulate_plans([{"id": "balanced", "actions": [DOCKER_MOVE, DOCKER_PRUNE]}])[0]
+
+    assert _drive(report, "C")["delta_bytes"] == -100 * GB
+    assert _drive(report, "D")["delta_bytes"] == 70 * GB
+    assert report["overlaps"] == [{
+        "action_id": "balanced_action_2",
+        "overlaps_action_id": "balanced_action_1",
+        "kind": "relocated_source"
+    }]
+
+
+def test_status_and_percent_projected_per_plan():
+    """Test that each plan gets its own projected drive state."""
+    simulator = PlanSimulator(DRIVES)
+    reports = simulator.simulate_plans([
+        {"id": "conservative", "actions": [CACHE]},
+        {"id": "balanced", "actions": [CACHE, DOCKER_MOVE]},
+    ])
+
+    assert _drive(reports[0], "C")["percent_used"] == 88.0
+    assert _drive(reports[0], "C")["status"] == "critical"
+    assert _drive(reports[1], "C")["percent_used"] == 68.0
+    assert _drive(reports[1], "C")["status"] == "warning"
+    assert all(r["fits"] for r in reports)
+
+
+def test_nested_cleanup_after_removal_is_dropped():
+    """Test that removing already-removed data counts nothing."""
+    parent = {"id": "a1", "type": "CLEANUP", "source_path": "C:\\Temp", "size_bytes": 20 * GB}
+    child = {"id": "a2", "type": "CLEANUP", "source_path": "C:\\Temp\\sub", "size_bytes": 5 * GB}
+    simulator = PlanSimulator(DRIVES)
+
+    report = simulator.simulate_plans([{"id": "p", "actions": [parent, child]}])[0]
+
+    assert _drive(report, "C")["delta_bytes"] == -20 * GB
+    assert report["overlaps"][0]["kind"] == "already_removed"
+
+
+def test_nested_children_never_remove_more_than_their_parent():
+    """Test that children cleaned before their parent cap its remainder at zero."""
+    children = [
+        {"id": f"a{n}", "type": "CLEANUP", "source_path": f"C:\\Temp\\sub{n}", "size_bytes": 8 * GB}
+        for n in range(3)
+    ]
+    parent = {"id": "a9", "type": "CLEANUP", "source_path": "C:\\Temp", "size_bytes": 20 * GB}
+    simulator = PlanSimulator(DRIVES)
+
+    report = simulator.simulate_plans([{"id": "p", "actions": children + [parent]}])[0]
+
+    assert _drive(report, "C")["delta_bytes"] == -24 * GB
+
+
+def test_thousands_of_variants_simulate_quickly():
+    """Test that many selections are evaluated in one vectorized step."""
+    actions = [
+        {"id": f"a{i}", "type": "MOVE" if i % 3 else "CLEANUP", "source_path": f"C:\\Data\\{i}",
+         "target_path": "D:\\Data", "size_bytes": (i + 1) * GB}
+        for i in range(40)
+    ]
+    simulator = PlanSimulator(DRIVES)
+    simulator.build_pool(actions)
+    selections = np.random.default_rng(0).random((5000, len(actions))) > 0.5
+
+    start = time.perf_counter()
+    result = simulator.simulate_selections(selections)
+    elapsed = time.perf_counter() - start
+
+    assert result["percent_used"].shape == (5000, 2)
+    assert elapsed < 0.5
+
+
+def test_nested_deduction_depends_on_selected_children():
+    """Test that a parent loses only the bytes of the children selected with it."""
+    children = [
+        {"id": f"a{n}", "type": "CLEANUP", "source_path": f"C:\\Temp\\sub{n}", "size_bytes": 5 * GB}
+        for n in range(3)
+    ]
+    parent = {"id": "a9", "type": "CLEANUP", "source_path": "C:\\Temp", "size_bytes": 10 * GB}
+    simulator = PlanSimulator(DRIVES)
+    simulator.build_pool(children + [parent])
+
+    result = simulator.simulate_selections(np.array([
+        [False, False, True, True],
+        [True, False, False, True],
+        [False, False, False, True],
+    ]))
+
+    freed = DRIVES[0]["used_bytes"] - result["used_bytes"][:, 0]
+    assert list(freed) == [10 * GB, 10 * GB, 10 * GB]
@@ -0,0 +1,92 @@
+"""Tests for the measured throughput model."""
+
+from app.services.throughput import ThroughputModel
+
+GB = 1024 ** 3
+
+
+def _move_action(size_bytes=10 * GB, estimated_seconds=600):
+    return {
+        "type": "MOVE",
+        "source_path": "C:\\Docker",
+        "target_path": "D:\\Docker",
+        "size_bytes": size_bytes,
+        "estimated_seconds": estimated_seconds
+    }
+
+
+def test_benchmark_path_measures_rates(tmp_path):
+    """Test that the probe reports positive rates and cleans up."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    result = model.benchmark_path(tmp_path)
+
+    assert result["write_bps"] > 0
+    assert result["read_bps"] > 0
+    assert not list(tmp_path.glob(".reclaim_probe_*"))
+
+
+def test_estimate_falls_back_to_heuristic(tmp_path):
+    """Test that an unmeasured action keeps its heuristic estimate."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    assert model.estimate_seconds(_move_action()) == 600
+
+
+def test_estimate_uses_drive_benchmarks(tmp_path):
+    """Test that copy actions are bounded by source read and target write."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    model.drives = {
+        "C": {"read_bps": 500 * 1024 ** 2, "write_bps": 400 * 1024 ** 2, "measured_at": "2026-01-01T00:00:00"},
+        "D": {"read_bps": 200 * 1024 ** 2, "write_bps": 100 * 1024 ** 2, "measured_at": "2026-01-01T00:00:00"},
+    }
+
+    assert model.estimate_seconds(_move_action(size_bytes=10 * GB)) == 102
+
+
+def test_learned_rates_persist_and_win(tmp_path):
+    """Test that recorded executions drive later estimates across reloads."""
+    cache_file = tmp_path / "throughput.json"
+    model = ThroughputModel(cache_file)
+    model.record(_move_action(), bytes_processed=GB, files_processed=10, seconds=4)
+
+    reloaded = ThroughputModel(cache_file)
+    assert reloaded.estimate_seconds(_move_action(size_bytes=10 * GB)) == 40
+
+
+def test_apply_estimates_updates_plan_minutes(tmp_path):
+    """Test that plan minutes are recomputed from action estimates."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    model.record(_move_action(), bytes_processed=GB, files_processed=10, seconds=6)
+    plans = [{"actions": [_move_action(size_bytes=10 * GB)], "estimated_minutes": 10}]
+
+    model.apply_estimates(plans)
+
+    assert plans[0]["actions"][0]["estimated_seconds"] == 60
+    assert plans[0]["estimated_minutes"] == 1
+
+
+def test_file_count_limits_cleanup_estimate(tmp_path):
+    """Test that many small files are estimated from the learned file rate."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    cleanup = {"type": "CLEANUP", "source_path": "C:\\Temp", "size_bytes": GB, "estimated_seconds": 180}
+    model.record(cleanup, bytes_processed=GB, files_processed=1000, seconds=10)
+
+    assert model.estimate_seconds({**cleanup, "file_count": 1000}) == 10
+    # Same bytes spread over 100x the files: deletion is bound by file count
+    assert model.estimate_seconds({**cleanup, "file_count": 100000}) == 1000
+    assert model.estimate_seconds(cleanup) == 10
+
+
+def test_failed_probe_is_not_retried(tmp_path, monkeypatch):
+    """Test that a drive whose probe failed is skipped until the TTL expires."""
+    model = ThroughputModel(tmp_path / "throughput.json")
+    probes = []
+
+    def failing_probe(directory):
+        probes.append(directory)
+        raise OSError("no such drive")
+
+    monkeypatch.setattr(model, "benchmark_path", failing_probe)
+
+    assert model.benchmark_drive("Q") is None
+    assert not model.needs_benchmark("Q")
+    assert len(probes) == 1
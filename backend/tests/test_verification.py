@@ -0,0 +1,73 @@
+"""Tests for hash verification."""
+
+import os
+import shutil
+import pytest
+from app.services.verification import Verifier, VerificationError, save_manifest, load_manifest
+
+
+class _CountingIO:
+    """Stands in for an IOController and counts bytes read."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def enter_thread(self):
+        pass
+
+    def throttle(self, nbytes=0):
+        self.bytes += nbytes
+
+
+def _make_copy(tmp_path):
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    for i in range(20):
+        (source / ("sub" if i % 2 else ".") / f"f{i}.bin").write_bytes(os.urandom(2000 + i))
+    target = tmp_path / "target"
+    shutil.copytree(source, target)
+    return source, target
+
+
+def test_manifest_and_cache_avoid_rehashing(tmp_path):
+    """Test that a second verification of unchanged files reads nothing."""
+    source, target = _make_copy(tmp_path)
+    io = _CountingIO()
+
+    with Verifier(workers=3, cache_path=tmp_path / "cache.db", io=io) as verifier:
+        manifest = verifier.verify_tree(source, target)
+    first_read = io.bytes
+    with Verifier(workers=3, cache_path=tmp_path / "cache.db", io=io) as verifier:
+        again = verifier.verify_tree(source, target)
+
+    assert len(manifest["files"]) == 20
+    assert first_read == 2 * manifest["bytes"]
+    assert io.bytes == first_read
+    assert again["files"] == manifest["files"]
+
+
+def test_corrupted_copy_fails_even_with_same_size_and_mtime(tmp_path):
+    """Test that content differences are caught, not just size or time."""
+    source, target = _make_copy(tmp_path)
+    damaged = target / "sub" / "f3.bin"
+    st = damaged.stat()
+    data = bytearray(damaged.read_bytes())
+    data[100] ^= 0xFF
+    damaged.write_bytes(bytes(data))
+    os.utime(damaged, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    with pytest.raises(VerificationError):
+        Verifier(workers=2).verify_tree(source, target)
+
+
+def test_check_validates_restore_against_saved_manifest(tmp_path):
+    """Test that a restore is checked file by file against the manifest."""
+    source, target = _make_copy(tmp_path)
+    verifier = Verifier(workers=2)
+    save_manifest(verifier.verify_tree(source, target), tmp_path / "m" / "action.json")
+    manifest = load_manifest(tmp_path / "m" / "action.json")
+
+    verifier.check(target, manifest)
+    (target / "f0.bin").unlink()
+    with pytest.raises(VerificationError, match="missing"):
+        verifier.check(target, manifest)
@@ -1,6 +1,38 @@
 import { useState, useEffect, useCallback } from 'react'
 import { api } from '@/lib/api'
-import type { ExecutionProgress, LogEntry } from '@/types/api'
+import type { ExecutionProgress, LogEntry, ProgressMessage } from '@/types/api'
+
+const MAX_LOGS = 100
+
+function applyMessage(
+  previous: ExecutionProgress | null,
+  message: ProgressMessage
+): ExecutionProgress | null {
+  if (message.type === 'snapshot') {
+    return message
+  }
+  if (!previous) {
+    return null
+  }
+
+  const steps = previous.steps.slice()
+  for (const [index, step] of Object.entries(message.steps)) {
+    steps[Number(index)] = step
+  }
+  const logs: LogEntry[] = message.logs.length
+    ? [...previous.logs, ...message.logs].slice(-MAX_LOGS)
+    : previous.logs
+
+  return {
+    plan_id: message.plan_id,
+    overall_percent: message.overall_percent,
+    current_step: message.current_step,
+    total_steps: message.total_steps,
+    status: message.status,
+    steps,
+    logs,
+  }
+}
 
 export function useProgress(executionId: string | null) {
   const [progress, setProgress] = useState<ExecutionProgress | null>(null)
@@ -26,8 +58,8 @@ export function useProgress(executionId: string | null) {
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data) as ExecutionProgress
-          setProgress(data)
+          const message = JSON.parse(event.data) as ProgressMessage
+          setProgress((previous) => applyMessage(previous, message))
         } catch (err) {
           console.error('Failed to parse progress message:', err)
         }
@@ -38,8 +70,11 @@ export function useProgress(executionId: string | null) {
         console.error('WebSocket error:', event)
       }
 
-      ws.onclose = () => {
+      ws.onclose = (event) => {
         setIsConnected(false)
+        if (event.code === 4404) {
+          setError(new Error('Execution not found'))
+        }
       }
     } catch (err) {
       setError(err instanceof Error ? err : new Error('Failed to create WebSocket'))
@@ -65,11 +65,25 @@ export interface ExecutionProgress {
 }
 
 export interface LogEntry {
+  seq?: number
   timestamp: string
   level: 'info' | 'success' | 'warning' | 'error'
   message: string
 }
 
+export type ProgressSummary = Omit<ExecutionProgress, 'steps' | 'logs'>
+
+export type ProgressMessage =
+  | ({ type: 'snapshot'; stream: string; seq: number } & ExecutionProgress)
+  | ({
+      type: 'delta'
+      stream: string
+      seq: number
+      since: number
+      steps: Record<string, ExecutionStep>
+      logs: LogEntry[]
+    } & ProgressSummary)
+
 export interface Settings {
   use_ai: boolean
   ai_provider: 'openai' | 'anthropic' | null